@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Agent Budget - Prompt size measurement and compact agent profiles
+Estimates the tokens a session pays for each generated agent and strips
+sections that do not apply to a project's engine and mode
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from agent_common import COMMON_FILE, SharedSections, resolve_agent
+from agent_sections import AgentDocument
+
+
+# Rough average for English markdown; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+PROFILES = ("full", "compact")
+
+# Agents the resume command asks a session to load in each phase
+PHASE_AGENTS = {
+    "Market Analysis": ["market_analyst", "project_orchestrator"],
+    "Initialization": ["project_orchestrator"],
+}
+DEFAULT_PHASE_AGENTS = ["producer_agent"]
+
+# Words in section titles and code fence languages that tie content to one engine
+ENGINE_KEYWORDS = {
+    "Godot": ("godot", "gdscript", "glsl"),
+    "Unity": ("unity", "csharp"),
+    "Unreal Engine": ("unreal", "cpp")
+}
+
+MODES = ("design", "prototype", "development")
+
+FENCE_PATTERN = re.compile(r'^```(\w+)\n.*?^```[ \t]*\n?', re.MULTILINE | re.DOTALL)
+MODE_TITLE_PATTERN = re.compile(r'\b(' + '|'.join(MODES) + r') mode\b', re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimated prompt tokens for a piece of text"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def other_engine_keywords(engine: str) -> List[str]:
+    own = ENGINE_KEYWORDS.get(engine, ())
+    return [word for name, words in ENGINE_KEYWORDS.items() if name != engine
+            for word in words if word not in own]
+
+
+def compact_document(document: AgentDocument, engine: str, mode: Optional[str]) -> AgentDocument:
+    """Copy of an agent document without other engines' sections and code samples or other modes' sections"""
+    foreign = other_engine_keywords(engine)
+    title_pattern = re.compile(r'\b(' + '|'.join(foreign) + r')\b', re.IGNORECASE) if foreign else None
+    mode = (mode or "").lower()
+
+    compact = document.copy()
+    index = 0
+    while index < len(compact.sections):
+        section = compact.sections[index]
+        title = section.title
+        mode_match = MODE_TITLE_PATTERN.search(title)
+        if section.level and ((title_pattern and title_pattern.search(title)) or
+                              (mode and mode_match and mode_match.group(1).lower() != mode)):
+            # Drop the section with its subsections
+            del compact.sections[index:compact.section_end(index)]
+            continue
+        index += 1
+
+    # Code samples in other engines' languages
+    sections = []
+    for section in compact.sections:
+        if "```" in section.text:
+            text = FENCE_PATTERN.sub(lambda m: "" if m.group(1).lower() in foreign else m.group(0), section.text)
+            if text != section.text:
+                section = type(section)(section.level, section.title, text)
+        sections.append(section)
+    return AgentDocument(sections)
+
+
+class AgentBudget:
+    def __init__(self, base_path: Path = Path("projects")):
+        self.base_path = Path(base_path)
+
+    def measure_project(self, project_dir: Path) -> Dict[str, Any]:
+        """Estimated tokens per generated agent, for the whole project and per phase session"""
+        with open(project_dir / "project-config.json", 'r') as f:
+            config = json.load(f)
+        agents = {}
+        agents_path = project_dir / "agents"
+        if agents_path.exists():
+            # Measured as sessions read them, with shared bodies and sections inlined
+            common = SharedSections(agents_path).load()
+            for agent_file in sorted(agents_path.glob("*.md")):
+                if agent_file.name != COMMON_FILE:
+                    agents[agent_file.stem] = estimate_tokens(resolve_agent(agent_file, common))
+
+        phases = {}
+        for phase in list(PHASE_AGENTS) + ["Other phases"]:
+            phases[phase] = self.session_tokens(agents, phase)
+
+        current_phase = config.get('project', {}).get('phase', 'Initialization')
+        return {
+            "project": project_dir.name,
+            "profile": config.get('project', {}).get('agent_profile', 'full'),
+            "phase": current_phase,
+            "agents": agents,
+            "total": sum(agents.values()),
+            "phases": phases,
+            "session": self.session_tokens(agents, current_phase)
+        }
+
+    def session_tokens(self, agents: Dict[str, int], phase: str) -> int:
+        """Tokens of the agents a session loads in a phase"""
+        loaded = PHASE_AGENTS.get(phase, DEFAULT_PHASE_AGENTS)
+        return sum(agents.get(agent, 0) for agent in loaded)
+
+    def measure(self, project_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Measure every project (or the named ones)"""
+        reports = []
+        if not self.base_path.exists():
+            return reports
+        for project_dir in sorted(self.base_path.iterdir()):
+            if not (project_dir / "project-config.json").exists():
+                continue
+            if project_names and project_dir.name not in project_names:
+                continue
+            reports.append(self.measure_project(project_dir))
+        return reports
+
+    def over_budget(self, reports: List[Dict[str, Any]], budget: int) -> List[Dict[str, Any]]:
+        """Projects whose current phase session exceeds the token budget"""
+        return [report for report in reports if report["session"] > budget]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Base Agent Cache - Shared in-memory cache of base agent markdown
+Reads each agents/<agent>.md once per change and keeps it parsed into
+sections
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from agent_sections import AgentDocument
+
+
+class BaseAgent:
+    def __init__(self, name: str, path: Path, content: str, mtime_ns: int, size: int):
+        self.name = name
+        self.path = path
+        self.content = content
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.sha256 = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        # Parsed once; renders copy it before inserting sections
+        self.document = AgentDocument.parse(content)
+
+
+class BaseAgentCache:
+    def __init__(self, base_agents_path: Path = Path("agents")):
+        self.base_agents_path = Path(base_agents_path)
+        self._agents: Dict[str, BaseAgent] = {}
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.hits = 0
+
+    def get(self, agent_name: str) -> Optional[BaseAgent]:
+        """Return the parsed base agent, re-reading it only if its mtime or size changed"""
+        path = self.base_agents_path / f"{agent_name}.md"
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._agents.pop(agent_name, None)
+            return None
+
+        with self._lock:
+            cached = self._agents.get(agent_name)
+            if cached is not None and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+                self.hits += 1
+                return cached
+
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            self.reads += 1
+
+            if cached is not None and cached.content == content:
+                # Touched but unchanged: keep the parsed agent, refresh its stamp
+                cached.mtime_ns, cached.size = stat.st_mtime_ns, stat.st_size
+                return cached
+
+            agent = BaseAgent(agent_name, path, content, stat.st_mtime_ns, stat.st_size)
+            self._agents[agent_name] = agent
+            return agent
+
+    def clear(self):
+        """Forget all cached agents"""
+        with self._lock:
+            self._agents.clear()
+
+
+_caches: Dict[Path, BaseAgentCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_agent_cache(base_agents_path: Path = Path("agents")) -> BaseAgentCache:
+    """Process-wide base agent cache for an agents folder"""
+    key = Path(base_agents_path).resolve()
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = BaseAgentCache(base_agents_path)
+        return _caches[key]
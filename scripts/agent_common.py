@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Agent Common - Shared sections for a project's agents
+Moves sections repeated across a project's generated agents into one
+agents/_common.md and leaves a reference in each agent
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+from agent_sections import parse_sections
+
+
+COMMON_FILE = "_common.md"
+# Fleet-wide store of agent bodies shared by deduplicated projects (projects/.agent_store)
+STORE_DIR = ".agent_store"
+
+# Smaller sections cost about as much as the reference that would replace them
+MIN_SHARED_BYTES = 200
+
+COMMON_MARKER = re.compile(r'^<!-- shared:([0-9a-f]{12}) -->\n', re.MULTILINE)
+SHARED_REFERENCE = re.compile(r'^#{1,6} [^\n]*\nSee `' + re.escape(COMMON_FILE) +
+                              r'` \[shared:([0-9a-f]{12})\]\n\n', re.MULTILINE)
+STORE_REFERENCE = re.compile(r'`\.\./' + re.escape(STORE_DIR) + r'/([0-9a-f]{64}\.md)`')
+# The line of a thin agent that points at its shared body
+STORE_LINE = re.compile(r'^[^\n]*' + STORE_REFERENCE.pattern + r'[^\n]*\n?', re.MULTILINE)
+
+
+def section_id(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+
+
+def reference(text: str, shared_id: str) -> str:
+    """Header line of a shared section followed by a pointer to its text"""
+    header = text.split("\n", 1)[0]
+    return f"{header}\nSee `{COMMON_FILE}` [shared:{shared_id}]\n\n"
+
+
+def size(contents: Iterable[str]) -> int:
+    return sum(len(content.encode('utf-8')) for content in contents)
+
+
+def resolve_agent(agent_file: Path, common: Optional[Dict[str, str]] = None) -> str:
+    """A project agent's text as a session reads it: a thin agent's shared body and _common.md sections inlined"""
+    store_path = agent_file.parent.parent.parent / STORE_DIR
+
+    def body(match: re.Match) -> str:
+        try:
+            return (store_path / match.group(1)).read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return match.group(0)
+
+    text = STORE_LINE.sub(body, agent_file.read_text(encoding='utf-8'))
+    shared = SharedSections(agent_file.parent)
+    return shared.inline(text, shared.load() if common is None else common)
+
+
+class SharedSections:
+    def __init__(self, agents_path: Path):
+        self.agents_path = Path(agents_path)
+        self.common_file = self.agents_path / COMMON_FILE
+
+    def load(self) -> Dict[str, str]:
+        """Shared section texts by id from the project's _common.md"""
+        try:
+            text = self.common_file.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return {}
+        parts = COMMON_MARKER.split(text)
+        # parts: [preamble, id, text, id, text, ...]
+        return {parts[i]: parts[i + 1] for i in range(1, len(parts) - 1, 2)}
+
+    def inline(self, content: str, common: Dict[str, str]) -> str:
+        """Agent content with references replaced by the shared text (unknown ids are left as they are)"""
+        return SHARED_REFERENCE.sub(lambda m: common.get(m.group(1), m.group(0)), content)
+
+    def extract(self, contents: Dict[str, str], project_name: str) -> Tuple[Dict[str, str], Optional[str]]:
+        """Move sections found verbatim in two or more agents into a common document"""
+        documents = {filename: parse_sections(content) for filename, content in contents.items()}
+        owners: Dict[str, set] = {}
+        for filename, sections in documents.items():
+            for section in sections:
+                if section.level and len(section.text) >= MIN_SHARED_BYTES and section.text.endswith("\n"):
+                    owners.setdefault(section.text, set()).add(filename)
+        shared = {text: section_id(text) for text, files in owners.items() if len(files) > 1}
+        if not shared:
+            return dict(contents), None
+
+        extracted = {}
+        for filename, sections in documents.items():
+            extracted[filename] = "".join(reference(section.text, shared[section.text])
+                                          if section.level and section.text in shared else section.text
+                                          for section in sections)
+
+        # Ordered by first appearance so the file reads like the agents do
+        order = []
+        for sections in documents.values():
+            for section in sections:
+                if section.text in shared and section.text not in order:
+                    order.append(section.text)
+        common = [f"# Shared Agent Sections - {project_name}\n\n",
+                  "Sections that several agents of this project share. An agent line "
+                  f"`See \\`{COMMON_FILE}\\` [shared:<id>]` stands for the section under that id.\n\n"]
+        for text in order:
+            common.append(f"<!-- shared:{shared[text]} -->\n{text}")
+        return extracted, "".join(common)
+
+    def apply(self, rendered: Dict[str, str], tracked: Iterable[str], enabled: bool,
+              project_name: str) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Files to write for a project given freshly rendered agents and the other tracked agents on disk"""
+        common = self.load()
+        on_disk = {}
+        contents = {}
+        for filename in tracked:
+            agent_file = self.agents_path / filename
+            if filename in rendered or not agent_file.exists():
+                continue
+            on_disk[filename] = agent_file.read_text(encoding='utf-8')
+            contents[filename] = self.inline(on_disk[filename], common)
+        contents.update(rendered)
+
+        extracted, common_text = contents, None
+        if enabled:
+            candidate, candidate_common = self.extract(contents, project_name)
+            # Too little repetition does not pay for _common.md itself
+            if candidate_common is not None and \
+                    size(candidate.values()) + size([candidate_common]) < size(contents.values()):
+                extracted, common_text = candidate, candidate_common
+
+        files = {filename: content for filename, content in extracted.items()
+                 if filename in rendered or content != on_disk[filename]}
+        if common_text is not None:
+            files[COMMON_FILE] = common_text
+        report = {
+            "shared": len(COMMON_MARKER.findall(common_text or "")),
+            "bytes_before": size(contents.values()),
+            "bytes_after": size(extracted.values()) + size([common_text or ""]),
+            "common": common_text is not None
+        }
+        report["bytes_saved"] = report["bytes_before"] - report["bytes_after"]
+        return files, report
@@ -8,97 +8,336 @@ Project: Game Studio Sub-Agents
 License: MIT
 """
 
+import hashlib
 import json
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Mapping, Optional, Set, Tuple
+
+from agent_budget import compact_document
+from agent_common import COMMON_FILE, SharedSections
+from agent_cache import BaseAgent, BaseAgentCache, get_agent_cache
+from agent_manifest import AgentManifest, DependencyIndex, file_signature, fingerprint
+from agent_sections import AgentDocument
+from doc_writer import MIN_PARALLEL_BATCH, DocumentWriter
+from engine_registry import EngineConfigRegistry, get_registry
+from render_cache import DEFAULT_CACHE_PATH, RenderCache, get_render_cache
+
+
+# Customizations are inserted in front of this section
+CORE_SECTION = "Core Responsibilities"
+
+# Stands in for the project name in cached renders
+PROJECT_NAME_SLOT = "\x00project_name\x00"
+
+# Modules whose code shapes a rendered agent; cached renders and manifests are invalidated when any changes
+RENDERER_MODULES = ("agent_customizer.py", "agent_cache.py", "agent_sections.py", "agent_budget.py",
+                    "agent_common.py")
+
+
+def renderer_digest(scripts_path: Path) -> str:
+    """Hash of the rendering modules in a scripts folder"""
+    digests = [hashlib.sha256((scripts_path / module).read_bytes()).hexdigest() for module in RENDERER_MODULES]
+    return hashlib.sha256(json.dumps(digests).encode('utf-8')).hexdigest()
+
+
+RENDERER_DIGEST = renderer_digest(Path(__file__).resolve().parent)
 
 
 class AgentCustomizer:
     def __init__(self):
         self.base_agents_path = Path("agents")
         self.engine_configs_path = Path("engine_configs")
+        self.render_cache_path: Optional[Path] = DEFAULT_CACHE_PATH
+        # "full" or "compact"; a project's agent_profile setting takes precedence
+        self.profile = "full"
+        # Move sections repeated across a project's agents into agents/_common.md
+        self.shared_sections = False
+        self.shared_reports: Dict[str, Dict[str, Any]] = {}
+        
+    @property
+    def engine_registry(self) -> EngineConfigRegistry:
+        """Shared registry for the configured engine_configs folder"""
+        return get_registry(self.engine_configs_path)
+    
+    @property
+    def agent_cache(self) -> BaseAgentCache:
+        """Shared cache of parsed base agents"""
+        return get_agent_cache(self.base_agents_path)
+    
+    @property
+    def render_cache(self) -> Optional[RenderCache]:
+        """Shared cache of rendered agents, or None when disabled"""
+        if self.render_cache_path is None:
+            return None
+        return get_render_cache(self.render_cache_path)
         
     def customize_agents_for_project(self, project_path: Path, project_config: Dict[str, Any]):
         """Create customized agents for a specific project"""
+        self.customize_many([(project_path, project_config)], jobs=1)
+        
+    def customize_many(self, projects: List[Tuple[Path, Dict[str, Any]]], jobs: Optional[int] = None,
+                       only: Optional[Set[Tuple[Path, str]]] = None) -> int:
+        """Customize agents for many projects on a worker pool, optionally only the given (agents folder, filename) outputs"""
+        tasks = []
+        configs: Dict[Path, Dict[str, Any]] = {}
+        for project_path, project_config in projects:
+            project_agents_path = project_path / "agents"
+            project_tasks = self.project_tasks(project_path, project_config, verbose=only is None)
+            if only is not None:
+                project_tasks = [task for task in project_tasks if (project_agents_path, task[0].name) in only]
+            tasks.extend(project_tasks)
+            configs[project_agents_path] = project_config
+        
+        # Results come back in task order, so output does not depend on scheduling
+        writer = DocumentWriter(max_workers=jobs)
+        with writer.generator("agents"):
+            if len(tasks) < MIN_PARALLEL_BATCH or writer.max_workers <= 1:
+                rendered = [self._render_task(task) for task in tasks]
+            else:
+                with ThreadPoolExecutor(max_workers=writer.max_workers) as pool:
+                    rendered = list(pool.map(self._render_task, tasks))
+            contents: Dict[Path, Dict[str, str]] = {}
+            for task, content in zip(tasks, rendered):
+                contents.setdefault(task[0].parent, {})[task[0].name] = content
+            self.shared_reports = self.share_sections(contents, configs, only)
+            for agents_path, files in contents.items():
+                for filename, content in files.items():
+                    writer.add(agents_path / filename, content)
+        written = writer.flush()
+        for agents_path in configs:
+            if agents_path.parent.name in self.shared_reports and COMMON_FILE not in contents.get(agents_path, {}):
+                (agents_path / COMMON_FILE).unlink(missing_ok=True)
+        
+        self.update_manifests(tasks, replace=only is None)
+        if only is None:
+            for project_agents_path in configs:
+                print(f"Project agents created in: {project_agents_path}")
+                report = self.shared_reports.get(project_agents_path.parent.name)
+                if report and report['common']:
+                    print(f"📎 {report['shared']} shared sections moved to {COMMON_FILE} "
+                          f"({report['bytes_saved']} bytes saved)")
+        return written
+    
+    def share_sections(self, contents: Dict[Path, Dict[str, str]], configs: Dict[Path, Dict[str, Any]],
+                       only: Optional[Set[Tuple[Path, str]]]) -> Dict[str, Dict[str, Any]]:
+        """Extract (or inline again) shared sections of each project's agents, updating contents in place"""
+        reports = {}
+        for agents_path, project_config in configs.items():
+            shared = SharedSections(agents_path)
+            enabled = self.shares_sections(project_config)
+            if not enabled and not shared.common_file.exists():
+                continue
+            rendered = contents.get(agents_path, {})
+            # A partial refresh has to account for the agents it did not render
+            tracked = rendered if only is None else AgentManifest.load(agents_path).files
+            project_name = project_config.get('project', {}).get('name', agents_path.parent.name)
+            contents[agents_path], reports[agents_path.parent.name] = shared.apply(rendered, tracked, enabled,
+                                                                                   project_name)
+        return reports
+    
+    def project_tasks(self, project_path: Path, project_config: Dict[str, Any], verbose: bool = True) -> List[tuple]:
+        """Render tasks (output path, base agent, agent name, engine config, project config) for a project"""
         engine = project_config.get('project', {}).get('engine', 'Godot')
         engine_version = project_config.get('project', {}).get('engine_version', 'latest')
-        platform = project_config.get('project', {}).get('platform', 'PC')
-        genre = project_config.get('project', {}).get('genre', 'Action')
         
         # Create agents folder in project
         project_agents_path = project_path / "agents"
         project_agents_path.mkdir(exist_ok=True)
         
-        # Load engine configuration and add version
-        engine_config = self.load_engine_config(engine)
-        engine_config['version'] = engine_version  # Add the actual version from project
+        # Load engine configuration resolved for the project's version (shared between projects)
+        engine_config = self.load_engine_config(engine, engine_version)
         
         # Get active agents from project config
         active_agents = project_config.get('team', {}).get('active_agents', [])
         
-        print(f"Customizing {len(active_agents)} agents for {engine} v{engine_version} development...")
+        if verbose:
+            print(f"Customizing {len(active_agents)} agents for {engine} v{engine_version} development...")
         
+        tasks = []
+        agent_cache = self.agent_cache
         for agent_name in active_agents:
-            self.customize_agent(agent_name, project_agents_path, engine_config, project_config)
+            base_agent = agent_cache.get(agent_name)
+            if base_agent is None:
+                print(f"Warning: Base agent {agent_name} not found")
+                continue
+            tasks.append((project_agents_path / f"{agent_name}.md", base_agent, agent_name,
+                          engine_config, project_config))
         
-        # Create project-specific orchestrator
-        self.create_project_orchestrator(project_agents_path, project_config, engine_config)
+        # Project-specific orchestrator
+        tasks.append((project_agents_path / "project_orchestrator.md", None, None,
+                      engine_config, project_config))
+        return tasks
+    
+    def _render_task(self, task: Tuple[Path, Optional[BaseAgent], Optional[str], Mapping[str, Any], Dict[str, Any]]) -> str:
+        _, base_agent, agent_name, engine_config, project_config = task
+        if base_agent is None:
+            return self.render_project_orchestrator(project_config, engine_config)
+        return self.render_cached(base_agent, agent_name, engine_config, project_config)
+    
+    def project_inputs(self, project_config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Hashed inputs shared by a project's agents ("agent") and its orchestrator ("orchestrator")"""
+        project = project_config.get('project', {})
+        engine = project.get('engine', 'Godot')
+        engine_version = project.get('engine_version', 'latest')
+        common = {
+            "engine": engine,
+            "engine_version": engine_version,
+            "engine_config": self.engine_registry.digest(engine, engine_version),
+            "renderer": RENDERER_DIGEST
+        }
+        agent_fields = {key: project.get(key) for key in ('name', 'engine_version', 'platform', 'genre', 'mode')}
+        agent_fields['profile'] = self.agent_profile(project_config)
+        agent_fields['shared_sections'] = self.shares_sections(project_config)
+        orchestrator_fields = {key: project.get(key) for key in ('name', 'engine_version', 'platform', 'phase')}
+        orchestrator_fields['active_agents'] = project_config.get('team', {}).get('active_agents', [])
+        return {
+            "agent": dict(common, fields=fingerprint(agent_fields)),
+            "orchestrator": dict(common, fields=fingerprint(orchestrator_fields))
+        }
+    
+    def task_inputs(self, task: tuple, project_inputs: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Hashes of everything a render task's output depends on"""
+        _, base_agent, agent_name, _, project_config = task
+        shared = project_inputs or self.project_inputs(project_config)
+        if base_agent is None:
+            return dict(shared["orchestrator"], base_agent=None, base=None)
+        return dict(shared["agent"], base_agent=agent_name, base=base_agent.sha256)
+    
+    def update_manifests(self, tasks: List[tuple], replace: bool = True):
+        """Record the inputs of rendered tasks in each project's agents manifest, hashing shared inputs once per project"""
+        manifests: Dict[Path, Tuple[AgentManifest, Dict[str, Dict[str, Any]]]] = {}
+        for task in tasks:
+            agents_path = task[0].parent
+            if agents_path not in manifests:
+                manifest = AgentManifest(agents_path) if replace else AgentManifest.load(agents_path)
+                manifests[agents_path] = (manifest, self.project_inputs(task[4]))
+            manifest, project_inputs = manifests[agents_path]
+            manifest.record(task[0].name, self.task_inputs(task, project_inputs))
+        for manifest, _ in manifests.values():
+            manifest.config = file_signature(manifest.agents_path.parent / "project-config.json")
+            manifest.save()
+    
+    def record_config(self, project_path: Path):
+        """Mark a project's manifest as up to date with its current project-config.json"""
+        manifest = AgentManifest.load(project_path / "agents")
+        manifest.config = file_signature(project_path / "project-config.json")
+        manifest.save()
+    
+    def refresh(self, base_path: Path = Path("projects"), jobs: Optional[int] = None,
+                index: Optional[DependencyIndex] = None) -> Dict[str, Any]:
+        """Regenerate only the project agents whose inputs changed, across every project"""
+        index = index or DependencyIndex.build(base_path)
         
-        print(f"Project agents created in: {project_agents_path}")
+        def base_digest(agent_name: str) -> Optional[str]:
+            base_agent = self.agent_cache.get(agent_name)
+            return base_agent.sha256 if base_agent is not None else None
         
-    def load_engine_config(self, engine: str) -> Dict[str, Any]:
-        """Load engine-specific configuration"""
-        # Handle engine name mapping
-        engine_map = {
-            "Unreal Engine": "unreal",
-            "Unity": "unity", 
-            "Godot": "godot"
-        }
-        engine_filename = engine_map.get(engine, engine.lower().replace(" ", ""))
-        config_file = self.engine_configs_path / f"{engine_filename}_config.json"
+        # Inputs shared between projects come from the reverse index
+        stale = index.stale(base_digest, self.engine_registry.digest, RENDERER_DIGEST)
+        stale_projects = {agents_path.parent for agents_path, _ in stale}
         
-        if config_file.exists():
+        batch = []
+        checked = 0
+        configs_checked = 0
+        for project_dir in sorted(base_path.iterdir()) if base_path.exists() else []:
+            config_file = project_dir / "project-config.json"
+            if not config_file.exists():
+                continue
+            checked += 1
+            manifest = index.manifests.get(project_dir / "agents")
+            config_changed = manifest is None or manifest.config != file_signature(config_file)
+            if not config_changed and project_dir not in stale_projects:
+                continue
+            
             with open(config_file, 'r') as f:
-                return json.load(f)
-        else:
-            print(f"Warning: No config found for {engine}, using defaults")
-            return {"engine": engine, "best_practices": {}, "agent_specializations": {}}
+                project_config = json.load(f)
+            if config_changed:
+                # Project fields (name, platform, phase, team...) are only checked for edited configs
+                configs_checked += 1
+                manifest = manifest or AgentManifest(project_dir / "agents")
+                project_inputs = self.project_inputs(project_config)
+                outdated = False
+                for task in self.project_tasks(project_dir, project_config, verbose=False):
+                    if manifest.is_stale(task[0].name, self.task_inputs(task, project_inputs)):
+                        stale.add((task[0].parent, task[0].name))
+                        outdated = True
+                if not outdated:
+                    # Nothing to render, so only the config signature needs recording
+                    self.record_config(project_dir)
+            batch.append((project_dir, project_config))
+        
+        written = self.customize_many(batch, jobs=jobs, only=stale) if stale else 0
+        return {
+            "projects": checked,
+            "configs_checked": configs_checked,
+            "stale_projects": len({agents_path.parent for agents_path, _ in stale}),
+            "written": written
+        }
+        
+    def load_engine_config(self, engine: str, engine_version: Optional[str] = None) -> Mapping[str, Any]:
+        """Load engine-specific configuration (read-only, shared between projects)"""
+        return self.engine_registry.resolve(engine, engine_version)
     
     def customize_agent(self, agent_name: str, project_agents_path: Path, 
-                       engine_config: Dict[str, Any], project_config: Dict[str, Any]):
+                       engine_config: Mapping[str, Any], project_config: Dict[str, Any]):
         """Customize a single agent for the project"""
-        base_agent_file = self.base_agents_path / f"{agent_name}.md"
         project_agent_file = project_agents_path / f"{agent_name}.md"
         
-        if not base_agent_file.exists():
+        # Base agent is read and split once, then shared between projects
+        base_agent = self.agent_cache.get(agent_name)
+        if base_agent is None:
             print(f"Warning: Base agent {agent_name} not found")
             return
         
-        # Read base agent
-        with open(base_agent_file, 'r', encoding='utf-8') as f:
-            agent_content = f.read()
-        
         # Customize based on engine and project
-        customized_content = self.apply_customizations(
-            agent_content, agent_name, engine_config, project_config
-        )
+        customized_content = self.render_cached(base_agent, agent_name, engine_config, project_config)
         
         # Write customized agent
         with open(project_agent_file, 'w', encoding='utf-8') as f:
             f.write(customized_content)
     
+    def render_cached(self, base_agent: BaseAgent, agent_name: str,
+                      engine_config: Mapping[str, Any], project_config: Dict[str, Any]) -> str:
+        """Render an agent, reusing a cached render of the same inputs from another project"""
+        cache = self.render_cache
+        if cache is None:
+            return self.render_agent(base_agent.document, agent_name, engine_config, project_config)
+        
+        project = project_config.get('project', {})
+        fields = {
+            "engine_version": project.get('engine_version', engine_config.get('version', 'latest')),
+            "platform": project.get('platform', 'PC'),
+            "genre": project.get('genre', 'Action'),
+            "profile": self.agent_profile(project_config),
+            "mode": project.get('mode')
+        }
+        key = cache.fingerprint(RENDERER_DIGEST, base_agent.sha256, agent_name, engine_config, fields)
+        segments = cache.get(key)
+        if segments is None:
+            # Render once with a placeholder so only the project name varies between projects
+            template_config = dict(project_config, project=dict(project, name=PROJECT_NAME_SLOT))
+            rendered = self.render_agent(base_agent.document, agent_name, engine_config, template_config)
+            segments = rendered.split(PROJECT_NAME_SLOT)
+            cache.put(key, segments)
+        return project.get('name', 'Game Project').join(segments)
+    
     def apply_customizations(self, content: str, agent_name: str, 
-                           engine_config: Dict[str, Any], project_config: Dict[str, Any]) -> str:
+                           engine_config: Mapping[str, Any], project_config: Dict[str, Any]) -> str:
         """Apply engine and project specific customizations to agent content"""
+        return self.render_agent(AgentDocument.parse(content), agent_name, engine_config, project_config)
+    
+    def render_project_header(self, agent_name: str, engine_config: Mapping[str, Any],
+                              project_config: Dict[str, Any]) -> str:
+        """Render the project header inserted into every customized agent"""
         engine = engine_config.get('engine', 'Godot')
         engine_version = project_config.get('project', {}).get('engine_version', engine_config.get('version', 'latest'))
         platform = project_config.get('project', {}).get('platform', 'PC')
         genre = project_config.get('project', {}).get('genre', 'Action')
         project_name = project_config.get('project', {}).get('name', 'Game Project')
         
-        # Add project header with version
-        project_header = f"""# {agent_name.replace('_', ' ').title()} - {project_name}
+        return f"""# {agent_name.replace('_', ' ').title()} - {project_name}
 
 ## Project Configuration
 - **Engine**: {engine} v{engine_version}
@@ -109,75 +348,111 @@ class AgentCustomizer:
 ---
 
 """
+    
+    def render_agent(self, document: AgentDocument, agent_name: str,
+                     engine_config: Mapping[str, Any], project_config: Dict[str, Any],
+                     project_header: Optional[str] = None) -> str:
+        """Render an agent from its parsed base document in a single serialization pass"""
+        platform = project_config.get('project', {}).get('platform', 'PC')
+        
+        # Add project header with version
+        if project_header is None:
+            project_header = self.render_project_header(agent_name, engine_config, project_config)
         
         # Engine-specific customizations
         engine_section = self.create_engine_section(agent_name, engine_config, platform)
         
-        # Insert customizations
-        if "## Core Responsibilities" in content:
-            content = content.replace(
-                "## Core Responsibilities",
-                f"{project_header}## Engine-Specific Guidelines\n{engine_section}\n\n## Core Responsibilities"
-            )
-        else:
-            content = f"{project_header}{engine_section}\n\n{content}"
+        if self.agent_profile(project_config) == "compact":
+            # Drop what does not apply to this engine and mode before adding project content
+            document = compact_document(document, engine_config.get('engine', 'Godot'),
+                                        project_config.get('project', {}).get('mode'))
+        
+        core = document.find(CORE_SECTION)
+        if core is None:
+            return f"{project_header}{engine_section}\n\n{document.serialize()}"
+        
+        # Insert customizations in front of the core responsibilities
+        insertion = [project_header, "## Engine-Specific Guidelines\n", engine_section, "\n\n"]
+        agent_specific = self.agent_specific_section(agent_name, engine_config, project_config)
+        if agent_specific is not None:
+            insertion += [agent_specific, "\n"]
         
-        # Apply agent-specific customizations
+        document = document.copy()
+        document.insert_before(core, "".join(insertion))
+        return document.serialize()
+    
+    def agent_profile(self, project_config: Dict[str, Any]) -> str:
+        """Output profile for a project: its agent_profile setting or the customizer default"""
+        return project_config.get('project', {}).get('agent_profile', self.profile)
+    
+    def shares_sections(self, project_config: Dict[str, Any]) -> bool:
+        """Whether a project's agents reference a shared _common.md (its shared_sections setting or the default)"""
+        return bool(project_config.get('project', {}).get('shared_sections', self.shared_sections))
+    
+    def agent_specific_section(self, agent_name: str, engine_config: Mapping[str, Any],
+                               project_config: Dict[str, Any]) -> Optional[str]:
+        """Agent-specific section inserted before the core responsibilities, if the agent has one"""
         if agent_name == "mechanics_developer":
-            content = self.customize_mechanics_developer(content, engine_config)
+            return self.mechanics_developer_section(engine_config)
         elif agent_name == "game_feel_developer":
-            content = self.customize_game_feel_developer(content, engine_config)
+            return self.game_feel_developer_section(engine_config)
         elif agent_name == "technical_artist":
-            content = self.customize_technical_artist(content, engine_config)
+            return self.technical_artist_section(engine_config)
         elif agent_name == "ui_ux_agent":
-            content = self.customize_ui_ux_agent(content, engine_config)
+            return self.ui_ux_agent_section(engine_config)
         elif agent_name == "sr_game_artist":
-            content = self.customize_sr_game_artist(content, engine_config, project_config)
+            return self.sr_game_artist_section(engine_config, project_config)
         elif agent_name == "qa_agent":
-            content = self.customize_qa_agent(content, engine_config, project_config)
-        
-        return content
+            return self.qa_agent_section(engine_config, project_config)
+        return None
     
-    def create_engine_section(self, agent_name: str, engine_config: Dict[str, Any], platform: str) -> str:
+    def patch_engine_section(self, content: str, agent_name: str, engine_config: Mapping[str, Any],
+                             project_config: Dict[str, Any]) -> Optional[str]:
+        """Re-render only the engine best practices section of a customized agent (None if it has none)"""
+        document = AgentDocument.parse(content)
+        index = document.find(f"{engine_config.get('engine', 'Godot')} Best Practices", level=3)
+        if index is None:
+            return None
+        platform = project_config.get('project', {}).get('platform', 'PC')
+        section = [self.create_engine_section(agent_name, engine_config, platform), "\n\n"]
+        if self.agent_specific_section(agent_name, engine_config, project_config) is not None:
+            section.append("\n")
+        document.replace_section(index, "".join(section))
+        return document.serialize()
+    
+    def create_engine_section(self, agent_name: str, engine_config: Mapping[str, Any], platform: str) -> str:
         """Create engine-specific guidelines section"""
         engine = engine_config.get('engine', 'Godot')
         engine_version = engine_config.get('version', 'Latest')
         
-        section = f"""### {engine} Best Practices
-
-**Engine Version**: {engine_version}
-**Target Platform**: {platform}
-
-"""
+        lines = [
+            f"### {engine} Best Practices\n",
+            "\n",
+            f"**Engine Version**: {engine_version}\n",
+            f"**Target Platform**: {platform}\n",
+            "\n"
+        ]
         
         # Add agent-specific engine guidelines
         specializations = engine_config.get('agent_specializations', {}).get(agent_name, {})
         
         if specializations:
-            section += f"""**Your {engine} Focus Areas:**
-"""
-            for area in specializations.get('focus', []):
-                section += f"- {area}\n"
+            lines.append(f"**Your {engine} Focus Areas:**\n")
+            lines.extend(f"- {area}\n" for area in specializations.get('focus', []))
             
-            section += f"""
-**Recommended Tools:**
-"""
-            for tool in specializations.get('tools', []):
-                section += f"- {tool}\n"
+            lines.append("\n**Recommended Tools:**\n")
+            lines.extend(f"- {tool}\n" for tool in specializations.get('tools', []))
         
         # Add naming conventions
         naming = engine_config.get('best_practices', {}).get('naming_conventions', {})
         if naming:
-            section += f"""
-**{engine} Naming Conventions:**
-"""
-            for item, convention in naming.items():
-                section += f"- {item.title()}: {convention}\n"
+            lines.append(f"\n**{engine} Naming Conventions:**\n")
+            lines.extend(f"- {item.title()}: {convention}\n" for item, convention in naming.items())
         
-        return section
+        return "".join(lines)
     
-    def customize_mechanics_developer(self, content: str, engine_config: Dict[str, Any]) -> str:
-        """Add mechanics developer specific customizations"""
+    def mechanics_developer_section(self, engine_config: Mapping[str, Any]) -> str:
+        """Mechanics developer implementation section"""
         engine = engine_config.get('engine', 'Godot')
         
         engine_specific = f"""
@@ -277,14 +552,10 @@ public:
 ```
 """
         
-        # Insert before the first major section
-        if "## Core Responsibilities" in content:
-            content = content.replace("## Core Responsibilities", f"{engine_specific}\n## Core Responsibilities")
-        
-        return content
+        return engine_specific
     
-    def customize_game_feel_developer(self, content: str, engine_config: Dict[str, Any]) -> str:
-        """Add game feel developer specific customizations"""
+    def game_feel_developer_section(self, engine_config: Mapping[str, Any]) -> str:
+        """Game feel developer toolkit section"""
         engine = engine_config.get('engine', 'Godot')
         
         engine_specific = f"""
@@ -373,13 +644,10 @@ void AGameFeelController::TriggerCameraShake(float Intensity, float Duration)
 ```
 """
         
-        if "## Core Responsibilities" in content:
-            content = content.replace("## Core Responsibilities", f"{engine_specific}\n## Core Responsibilities")
-        
-        return content
+        return engine_specific
     
-    def customize_technical_artist(self, content: str, engine_config: Dict[str, Any]) -> str:
-        """Add technical artist specific customizations"""
+    def technical_artist_section(self, engine_config: Mapping[str, Any]) -> str:
+        """Technical artist pipeline section"""
         engine = engine_config.get('engine', 'Godot')
         
         engine_specific = f"""
@@ -453,13 +721,10 @@ void fragment() {
 - Profile with **Shader Complexity** view mode
 """
         
-        if "## Core Responsibilities" in content:
-            content = content.replace("## Core Responsibilities", f"{engine_specific}\n## Core Responsibilities")
-        
-        return content
+        return engine_specific
     
-    def customize_ui_ux_agent(self, content: str, engine_config: Dict[str, Any]) -> str:
-        """Add UI/UX agent specific customizations"""
+    def ui_ux_agent_section(self, engine_config: Mapping[str, Any]) -> str:
+        """UI/UX agent development section"""
         engine = engine_config.get('engine', 'Godot')
         
         engine_specific = f"""
@@ -548,13 +813,10 @@ public class ResponsivePanel : MonoBehaviour
 - Optimize with **Widget pooling** for lists
 """
         
-        if "## Core Responsibilities" in content:
-            content = content.replace("## Core Responsibilities", f"{engine_specific}\n## Core Responsibilities")
-        
-        return content
+        return engine_specific
     
-    def customize_sr_game_artist(self, content: str, engine_config: Dict[str, Any], project_config: Dict[str, Any]) -> str:
-        """Add senior game artist specific customizations"""
+    def sr_game_artist_section(self, engine_config: Mapping[str, Any], project_config: Dict[str, Any]) -> str:
+        """Senior game artist pipeline section"""
         engine = engine_config.get('engine', 'Godot')
         platform = project_config.get('project', {}).get('platform', 'PC')
         
@@ -626,13 +888,10 @@ public class ResponsivePanel : MonoBehaviour
 - Use **Lumen** for dynamic global illumination
 """
         
-        if "## Core Responsibilities" in content:
-            content = content.replace("## Core Responsibilities", f"{engine_specific}\n## Core Responsibilities")
-        
-        return content
+        return engine_specific
     
-    def customize_qa_agent(self, content: str, engine_config: Dict[str, Any], project_config: Dict[str, Any]) -> str:
-        """Add QA agent specific customizations"""
+    def qa_agent_section(self, engine_config: Mapping[str, Any], project_config: Dict[str, Any]) -> str:
+        """QA agent testing framework section"""
         engine = engine_config.get('engine', 'Godot')
         platform = project_config.get('project', {}).get('platform', 'PC')
         
@@ -774,13 +1033,15 @@ protected:
         
         engine_specific += platform_testing
         
-        if "## Core Responsibilities" in content:
-            content = content.replace("## Core Responsibilities", f"{engine_specific}\n## Core Responsibilities")
-        
-        return content
+        return engine_specific
     
-    def create_project_orchestrator(self, project_agents_path: Path, project_config: Dict[str, Any], engine_config: Dict[str, Any]):
+    def create_project_orchestrator(self, project_agents_path: Path, project_config: Dict[str, Any], engine_config: Mapping[str, Any]):
         """Create a project-specific orchestrator"""
+        with open(project_agents_path / "project_orchestrator.md", 'w', encoding='utf-8') as f:
+            f.write(self.render_project_orchestrator(project_config, engine_config))
+    
+    def render_project_orchestrator(self, project_config: Dict[str, Any], engine_config: Mapping[str, Any]) -> str:
+        """Render the project-specific orchestrator"""
         project_name = project_config.get('project', {}).get('name', 'Game Project')
         engine = engine_config.get('engine', 'Godot')
         engine_version = project_config.get('project', {}).get('engine_version', engine_config.get('version', 'latest'))
@@ -850,8 +1111,7 @@ claude "Read agents/producer_agent.md and transition to [next-phase]"
 4. Use producer agent for coordination
 """
         
-        with open(project_agents_path / "project_orchestrator.md", 'w', encoding='utf-8') as f:
-            f.write(orchestrator_content)
+        return orchestrator_content
     
     def generate_agent_list(self, project_config: Dict[str, Any]) -> str:
         """Generate formatted list of active agents"""
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Agent Dedup - Shared storage for generated project agents
+Stores the engine and role guidance of generated agents once as
+content-addressed blobs and leaves a thin per-project header in agents/
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set
+
+from agent_common import STORE_DIR, STORE_REFERENCE
+from agent_customizer import AgentCustomizer
+from agent_manifest import AgentManifest, MANIFEST_FILE
+
+
+class AgentDeduplicator:
+    def __init__(self, customizer: Optional[AgentCustomizer] = None, base_path: Path = Path("projects")):
+        self.customizer = customizer or AgentCustomizer()
+        self.base_path = Path(base_path)
+        self.store_path = self.base_path / STORE_DIR
+
+    def thin_content(self, project_header: str, blob_name: str) -> str:
+        """Per-project agent file pointing at the shared body"""
+        return (f"{project_header}**Shared instructions**: the engine and role guidance for this agent is "
+                f"shared with every project on the same engine version and platform. "
+                f"Read `../{STORE_DIR}/{blob_name}` and follow it as part of this agent.\n")
+
+    def blob_name(self, body: str) -> str:
+        """Content-addressed name of a shared body"""
+        return f"{hashlib.sha256(body.encode('utf-8')).hexdigest()}.md"
+
+    def store_blob(self, body: str) -> str:
+        """Store a body once under its content hash and return the blob name"""
+        blob_name = self.blob_name(body)
+        blob_file = self.store_path / blob_name
+        if not blob_file.exists():
+            self.store_path.mkdir(parents=True, exist_ok=True)
+            with open(blob_file, 'wb') as f:
+                f.write(body.encode('utf-8'))
+        return blob_name
+
+    def project_dirs(self) -> List[Path]:
+        if not self.base_path.exists():
+            return []
+        return [project_dir for project_dir in sorted(self.base_path.iterdir())
+                if (project_dir / "project-config.json").exists()
+                and (project_dir / "agents" / MANIFEST_FILE).exists()]
+
+    def disk_usage(self) -> Dict[str, int]:
+        """Logical bytes, allocated bytes and file count of agent folders and the store"""
+        files = [path for project_dir in self.project_dirs() for path in (project_dir / "agents").glob("*.md")]
+        if self.store_path.exists():
+            files += list(self.store_path.glob("*.md"))
+        stats = [path.stat() for path in files]
+        return {
+            "files": len(stats),
+            "bytes": sum(stat.st_size for stat in stats),
+            "allocated": sum(getattr(stat, 'st_blocks', 0) * 512 for stat in stats)
+        }
+
+    def referenced_blobs(self) -> Set[str]:
+        """Blob names referenced by any thin agent in the fleet"""
+        referenced = set()
+        for project_dir in self.project_dirs():
+            for agent_file in (project_dir / "agents").glob("*.md"):
+                referenced.update(STORE_REFERENCE.findall(agent_file.read_text(encoding='utf-8')))
+        return referenced
+
+    def collect_garbage(self, referenced: Optional[Set[str]] = None) -> int:
+        """Remove blobs no thin agent points at any more"""
+        referenced = self.referenced_blobs() if referenced is None else referenced
+        removed = 0
+        if self.store_path.exists():
+            for blob_file in self.store_path.glob("*.md"):
+                if blob_file.name not in referenced:
+                    blob_file.unlink()
+                    removed += 1
+        return removed
+
+    def dedup(self) -> Dict[str, Any]:
+        """Replace unmodified generated agents with thin headers over shared blobs
+
+        An agent is only thinned when its body is shared with another project, or when the thin
+        header and blob together take fewer allocated bytes than the full file; thin agents whose
+        blob no other project uses any more are written out in full again.
+        """
+        before = self.disk_usage()
+        report = {"thinned": 0, "already_thin": 0, "restored": 0, "unshared": 0, "skipped": 0}
+
+        # blob name -> [(project dir, agent file, full content, thin content, body, currently thin)]
+        candidates: Dict[str, List[tuple]] = {}
+        for project_dir in self.project_dirs():
+            with open(project_dir / "project-config.json", 'r') as f:
+                project_config = json.load(f)
+            manifest = AgentManifest.load(project_dir / "agents")
+
+            for filename, inputs in sorted(manifest.files.items()):
+                agent_name = inputs.get('base_agent')
+                agent_file = project_dir / "agents" / filename
+                base_agent = self.customizer.agent_cache.get(agent_name) if agent_name else None
+                # Orchestrators are project-specific throughout; stale agents need a refresh first
+                if base_agent is None or base_agent.sha256 != inputs.get('base') or not agent_file.exists():
+                    continue
+
+                engine_config = self.customizer.load_engine_config(inputs['engine'], inputs['engine_version'])
+                header = self.customizer.render_project_header(agent_name, engine_config, project_config)
+                body = self.customizer.render_agent(base_agent.document, agent_name, engine_config,
+                                                    project_config, project_header="")
+                blob_name = self.blob_name(body)
+                thin = self.thin_content(header, blob_name)
+                full = self.customizer.render_cached(base_agent, agent_name, engine_config, project_config)
+
+                content = agent_file.read_text(encoding='utf-8')
+                if content != thin and content != full:
+                    # Hand-edited or stale agents are left as they are
+                    report["skipped"] += 1
+                    continue
+                candidates.setdefault(blob_name, []).append(
+                    (project_dir, agent_file, full, thin, body, content == thin))
+
+        for blob_name, agents in candidates.items():
+            shared = len({agent[0] for agent in agents}) >= 2
+            for project_dir, agent_file, full, thin, body, is_thin in agents:
+                if not shared and not self.thinning_saves(agent_file, full, thin, body):
+                    if is_thin:
+                        agent_file.write_text(full, encoding='utf-8')
+                        report["restored"] += 1
+                    else:
+                        report["unshared"] += 1
+                elif is_thin:
+                    report["already_thin"] += 1
+                else:
+                    self.store_blob(body)
+                    agent_file.write_text(thin, encoding='utf-8')
+                    report["thinned"] += 1
+
+        referenced = self.referenced_blobs()
+        removed = self.collect_garbage(referenced)
+
+        after = self.disk_usage()
+        report.update({
+            "blobs": len(referenced),
+            "blobs_removed": removed,
+            "before": before,
+            "after": after,
+            "bytes_saved": before["bytes"] - after["bytes"],
+            "allocated_saved": before["allocated"] - after["allocated"]
+        })
+        return report
+
+    def thinning_saves(self, agent_file: Path, full: str, thin: str, body: str) -> bool:
+        """Whether a thin header plus an unshared blob allocate fewer bytes than the full agent"""
+        block = getattr(agent_file.stat(), 'st_blksize', 4096) or 4096
+
+        def allocated(text: str) -> int:
+            return -(-len(text.encode('utf-8')) // block) * block
+
+        return allocated(thin) + allocated(body) < allocated(full)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Agent Limiter - Admission control for agent invocations
+Caps concurrent calls per backend, rate-limits them with token buckets,
+enforces per-project token budgets from project-config.json and admits
+waiting calls by priority lane
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import heapq
+import itertools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+from agent_budget import estimate_tokens
+from agent_common import resolve_agent
+from usage_meter import UsageMeter
+
+
+# Lanes in admission order; agents not listed use the normal lane
+LANES = ("high", "normal", "background")
+AGENT_LANES = {
+    "producer_agent": "high",
+    "qa_agent": "high",
+    "master_orchestrator": "high",
+    "project_orchestrator": "high",
+    "market_analyst": "background"
+}
+
+# Per-backend limits: concurrent calls, calls per minute and prompt tokens per minute (None: unlimited).
+# "burst" calls may start back to back (default: a second's worth)
+BACKEND_LIMITS = {
+    "stub": {"concurrency": 8, "calls_per_minute": None, "tokens_per_minute": None},
+    "command": {"concurrency": 4, "calls_per_minute": 50, "tokens_per_minute": 400000}
+}
+DEFAULT_LIMITS = {"concurrency": 4, "calls_per_minute": None, "tokens_per_minute": None}
+
+
+class BudgetExceeded(Exception):
+    """A call would take a project past its token budget"""
+
+
+def agent_lane(agent_name: str) -> str:
+    return AGENT_LANES.get(agent_name, "normal")
+
+
+def project_budget(config: Dict[str, Any]) -> Optional[int]:
+    """Token budget of a project ("limits": {"token_budget": N} in project-config.json)"""
+    budget = config.get('limits', {}).get('token_budget')
+    return int(budget) if budget is not None else None
+
+
+def recorded_spend(project_path: Path) -> int:
+    """Tokens billed to a project by earlier runs, from its usage records (cache hits cost nothing)"""
+    columns, _ = UsageMeter(project_path).columns()
+    return sum(tokens_in + tokens_out for tokens_in, tokens_out, cached
+               in zip(columns.tokens_in, columns.tokens_out, columns.cached) if not cached)
+
+
+class TokenBucket:
+    """Refills at rate per second up to capacity; callers take what they need or learn how long to wait"""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.level = capacity
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available (amounts above capacity wait for a full bucket)"""
+        self._refill()
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / self.rate)
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+
+class AgentLimiter:
+    def __init__(self, limits: Optional[Dict[str, Dict[str, Any]]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.limits = limits if limits is not None else BACKEND_LIMITS
+        self.clock = clock
+        self.condition = threading.Condition()
+        self.running: Dict[str, int] = {}
+        self.buckets: Dict[str, List[TokenBucket]] = {}
+        # backend -> heap of (lane rank, arrival)
+        self.queues: Dict[str, List[tuple]] = {}
+        self.budgets: Dict[str, int] = {}
+        # Tokens charged to each project (reserved while a call runs, settled when it ends)
+        self.spent: Dict[str, int] = {}
+        self.arrivals = itertools.count()
+        # lane -> [admitted calls, total wait, longest wait]
+        self.waits: Dict[str, List[float]] = {lane: [0, 0.0, 0.0] for lane in LANES}
+        self.max_queue: Dict[str, int] = {}
+
+    def backend_limits(self, backend: str) -> Dict[str, Any]:
+        return self.limits.get(backend, DEFAULT_LIMITS)
+
+    def set_budget(self, project: str, tokens: Optional[int]):
+        if tokens is None:
+            self.budgets.pop(project, None)
+        else:
+            self.budgets[project] = tokens
+
+    def load_budget(self, project: str, project_path: Path):
+        """Take a project's token budget from its project-config.json and what earlier runs already spent"""
+        with open(Path(project_path) / "project-config.json", 'r') as f:
+            self.set_budget(project, project_budget(json.load(f)))
+        with self.condition:
+            self.spent[project] = recorded_spend(project_path)
+
+    def _buckets(self, backend: str) -> List[TokenBucket]:
+        """(calls, tokens) buckets of a backend, either None when unlimited"""
+        if backend not in self.buckets:
+            limits = self.backend_limits(backend)
+            calls, tokens = limits.get('calls_per_minute'), limits.get('tokens_per_minute')
+            burst = limits.get('burst') or max(1.0, (calls or 0) / 60.0)
+            self.buckets[backend] = [
+                TokenBucket(calls / 60.0, burst, self.clock) if calls else None,
+                TokenBucket(tokens / 60.0, float(tokens), self.clock) if tokens else None
+            ]
+        return self.buckets[backend]
+
+    def _rate_wait(self, backend: str, tokens: int) -> float:
+        calls, token_bucket = self._buckets(backend)
+        return max(calls.wait_time(1) if calls else 0.0, token_bucket.wait_time(tokens) if token_bucket else 0.0)
+
+    @contextmanager
+    def slot(self, backend: str, project: str, agent_name: str, tokens: int) -> Iterator[Dict[str, Any]]:
+        """Hold an admitted call for the duration of the block; the yielded ticket can report actual tokens"""
+        ticket = self.acquire(backend, project, agent_name, tokens)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def acquire(self, backend: str, project: str, agent_name: str, tokens: int) -> Dict[str, Any]:
+        """Block until the call may run: first in its backend's queue by lane, under the cap and rate limits"""
+        lane = agent_lane(agent_name)
+        with self.condition:
+            budget = self.budgets.get(project)
+            if budget is not None and self.spent.get(project, 0) + tokens > budget:
+                raise BudgetExceeded(f"{project}: {agent_name} needs ~{tokens} tokens, "
+                                     f"{budget - self.spent.get(project, 0)} of {budget} left")
+            self.spent[project] = self.spent.get(project, 0) + tokens
+            ticket = {"backend": backend, "project": project, "agent": agent_name, "lane": lane,
+                      "tokens": tokens, "used": None, "queued": self.clock()}
+            queue = self.queues.setdefault(backend, [])
+            entry = (LANES.index(lane), next(self.arrivals))
+            heapq.heappush(queue, entry)
+            self.max_queue[backend] = max(self.max_queue.get(backend, 0), len(queue))
+            concurrency = self.backend_limits(backend)['concurrency']
+            try:
+                while True:
+                    timeout = None
+                    if queue[0] == entry and self.running.get(backend, 0) < concurrency:
+                        timeout = self._rate_wait(backend, tokens)
+                        if timeout <= 0:
+                            break
+                    self.condition.wait(timeout)
+            except BaseException:
+                queue.remove(entry)
+                heapq.heapify(queue)
+                self.spent[project] -= tokens
+                self.condition.notify_all()
+                raise
+            heapq.heappop(queue)
+            for bucket, amount in zip(self._buckets(backend), (1, tokens)):
+                if bucket:
+                    bucket.take(amount)
+            self.running[backend] = self.running.get(backend, 0) + 1
+
+            waited = self.clock() - ticket['queued']
+            stats = self.waits[lane]
+            stats[0] += 1
+            stats[1] += waited
+            stats[2] = max(stats[2], waited)
+            ticket['waited'] = waited
+            # The next caller in line may be admissible too
+            self.condition.notify_all()
+            return ticket
+
+    def release(self, ticket: Dict[str, Any]):
+        """Free the call's slot and settle its project's spend with the tokens actually used, if known"""
+        with self.condition:
+            self.running[ticket['backend']] -= 1
+            if ticket['used'] is not None:
+                self.spent[ticket['project']] += ticket['used'] - ticket['tokens']
+            self.condition.notify_all()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depths per backend, wait times per lane and token spend per project"""
+        with self.condition:
+            return {
+                "queues": {backend: {"depth": len(queue), "max_depth": self.max_queue.get(backend, 0),
+                                     "running": self.running.get(backend, 0)}
+                           for backend, queue in self.queues.items()},
+                "waits": {lane: {"calls": int(stats[0]), "mean": stats[1] / stats[0] if stats[0] else 0.0,
+                                 "max": stats[2]}
+                          for lane, stats in self.waits.items()},
+                "spent": dict(self.spent),
+                "budgets": dict(self.budgets)
+            }
+
+
+class LimitedBackend:
+    """Wraps an orchestration backend so every task goes through a shared limiter"""
+
+    def __init__(self, backend, limiter: AgentLimiter, name: str):
+        self.backend = backend
+        self.limiter = limiter
+        self.name = name
+
+    def estimate(self, task: Dict[str, Any], project_path: Path) -> int:
+        """Prompt tokens of a task: the agent it is run with, resolved as the session reads it"""
+        try:
+            return estimate_tokens(resolve_agent(project_path / "agents" / f"{task['agent']}.md"))
+        except FileNotFoundError:
+            return 0
+
+    def run(self, task: Dict[str, Any], project_path: Path, project_config: Dict[str, Any]) -> str:
+        tokens = self.estimate(task, project_path)
+        with self.limiter.slot(self.name, project_path.name, task['agent'], tokens) as ticket:
+            output = self.backend.run(task, project_path, project_config)
+            # Settle the project's spend with the response's tokens as well
+            ticket['used'] = ticket['tokens'] + estimate_tokens(output)
+            return output
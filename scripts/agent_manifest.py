@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Agent Manifest - Dependency tracking for generated project agents
+Records the inputs every generated agent was rendered from and indexes
+them across the fleet so only stale agents need regenerating
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+from engine_registry import thaw
+
+
+MANIFEST_FILE = ".manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_signature(path: Path) -> Optional[List[int]]:
+    """[mtime_ns, size] of a file, or None when it is missing"""
+    try:
+        stat = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def fingerprint(value: Any) -> str:
+    """Stable hash of a JSON-compatible (or frozen) value"""
+    payload = json.dumps(thaw(value), sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AgentManifest:
+    def __init__(self, agents_path: Path):
+        self.agents_path = Path(agents_path)
+        self.manifest_file = self.agents_path / MANIFEST_FILE
+        self.files: Dict[str, Dict[str, Any]] = {}
+        # Signature of the project-config.json the recorded inputs were taken from
+        self.config: Optional[List[int]] = None
+
+    @classmethod
+    def load(cls, agents_path: Path) -> "AgentManifest":
+        """Load a project's manifest; a missing or outdated manifest is empty"""
+        manifest = cls(agents_path)
+        try:
+            with open(manifest.manifest_file, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return manifest
+        if data.get('version') == MANIFEST_VERSION:
+            manifest.files = data.get('files', {})
+            manifest.config = data.get('config')
+        return manifest
+
+    def save(self) -> bool:
+        """Write the manifest unless the file already holds the same content; True if written"""
+        text = json.dumps({"version": MANIFEST_VERSION, "files": self.files, "config": self.config},
+                          sort_keys=True, separators=(',', ':'))
+        try:
+            with open(self.manifest_file, 'r') as f:
+                if f.read() == text:
+                    return False
+        except FileNotFoundError:
+            pass
+        with open(self.manifest_file, 'w') as f:
+            f.write(text)
+        return True
+
+    def record(self, filename: str, inputs: Dict[str, Any]):
+        """Record the inputs a generated file was rendered from"""
+        self.files[filename] = dict(inputs)
+
+    def is_stale(self, filename: str, inputs: Dict[str, Any]) -> bool:
+        """True if a file is missing, untracked or was rendered from different inputs"""
+        return self.files.get(filename) != inputs or not (self.agents_path / filename).exists()
+
+
+class DependencyIndex:
+    """Reverse index from inputs (base agents, engine configs, renderer) to generated files"""
+
+    def __init__(self):
+        # input key -> recorded hash -> [(agents_path, filename)]
+        self.by_base: Dict[str, Dict[str, List[Tuple[Path, str]]]] = {}
+        self.by_engine: Dict[Tuple[str, str], Dict[str, List[Tuple[Path, str]]]] = {}
+        self.by_renderer: Dict[str, List[Tuple[Path, str]]] = {}
+        self.manifests: Dict[Path, AgentManifest] = {}
+
+    @classmethod
+    def build(cls, base_path: Path) -> "DependencyIndex":
+        """Index the manifests of every project under base_path"""
+        index = cls()
+        if base_path.exists():
+            for project_dir in sorted(base_path.iterdir()):
+                agents_path = project_dir / "agents"
+                if (agents_path / MANIFEST_FILE).exists():
+                    index.add(AgentManifest.load(agents_path))
+        return index
+
+    def add(self, manifest: AgentManifest):
+        self.manifests[manifest.agents_path] = manifest
+        for filename, inputs in manifest.files.items():
+            output = (manifest.agents_path, filename)
+            if inputs.get('base_agent'):
+                self.by_base.setdefault(inputs['base_agent'], {}).setdefault(inputs['base'], []).append(output)
+            engine_key = (inputs['engine'], inputs['engine_version'])
+            self.by_engine.setdefault(engine_key, {}).setdefault(inputs['engine_config'], []).append(output)
+            self.by_renderer.setdefault(inputs['renderer'], []).append(output)
+
+    def dependents_of_agent(self, agent_name: str) -> List[Tuple[Path, str]]:
+        """Generated files rendered from a base agent"""
+        return [output for outputs in self.by_base.get(agent_name, {}).values() for output in outputs]
+
+    def dependents_of_engine(self, engine: str) -> List[Tuple[Path, str]]:
+        """Generated files rendered from any version of an engine config"""
+        return [output for (name, _), digests in self.by_engine.items() if name == engine
+                for outputs in digests.values() for output in outputs]
+
+    def stale(self, base_digest: Callable[[str], Optional[str]],
+              config_digest: Callable[[str, str], str], renderer: str) -> Set[Tuple[Path, str]]:
+        """Generated files whose base agent, engine config or renderer changed since they were rendered"""
+        stale: Set[Tuple[Path, str]] = set()
+        # One hash per distinct input, not per generated file
+        for agent_name, recorded in self.by_base.items():
+            current = base_digest(agent_name)
+            for digest, outputs in recorded.items():
+                if digest != current:
+                    stale.update(outputs)
+        for (engine, engine_version), recorded in self.by_engine.items():
+            current = config_digest(engine, engine_version)
+            for digest, outputs in recorded.items():
+                if digest != current:
+                    stale.update(outputs)
+        for digest, outputs in self.by_renderer.items():
+            if digest != renderer:
+                stale.update(outputs)
+        return stale
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Agent Sections - Lightweight section model for agent markdown
+Parses agent files into header-delimited sections once so content can be
+inserted or replaced by section and serialized in a single pass
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import re
+from typing import List, Optional, Union
+
+
+HEADER_PATTERN = re.compile(r'(#{1,6}) (.*?)\s*$')
+FENCE_PREFIX = "```"
+
+
+class Section:
+    """A header line and the text up to the next header (level 0 is the text before the first header)"""
+    __slots__ = ("level", "title", "text")
+
+    def __init__(self, level: int, title: str, text: str):
+        self.level = level
+        self.title = title
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"Section({self.level}, {self.title!r}, {len(self.text)} chars)"
+
+
+def parse_sections(text: str) -> List[Section]:
+    """Split markdown into sections in one pass, ignoring '#' lines inside code fences"""
+    sections: List[Section] = []
+    level, title, start = 0, "", 0
+    in_fence = False
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        if line.startswith(FENCE_PREFIX):
+            in_fence = not in_fence
+        elif not in_fence and line.startswith("#"):
+            match = HEADER_PATTERN.match(line)
+            if match:
+                if offset > start or sections or level:
+                    sections.append(Section(level, title, text[start:offset]))
+                level, title, start = len(match.group(1)), match.group(2), offset
+        offset += len(line)
+    if offset > start or level:
+        sections.append(Section(level, title, text[start:offset]))
+    return sections
+
+
+class AgentDocument:
+    def __init__(self, sections: Optional[List[Section]] = None):
+        self.sections: List[Section] = sections or []
+
+    @classmethod
+    def parse(cls, text: str) -> "AgentDocument":
+        return cls(parse_sections(text))
+
+    def copy(self) -> "AgentDocument":
+        """Copy that can be edited without touching this document (sections are shared, not copied)"""
+        return AgentDocument(list(self.sections))
+
+    def find(self, title: str, level: Optional[int] = None) -> Optional[int]:
+        """Index of the first section with the given title (and level), or None"""
+        for index, section in enumerate(self.sections):
+            if section.title == title and (level is None or section.level == level) and section.level:
+                return index
+        return None
+
+    def section_end(self, index: int) -> int:
+        """Index after the last subsection of the section at index"""
+        level = self.sections[index].level
+        end = index + 1
+        while end < len(self.sections) and self.sections[end].level > level:
+            end += 1
+        return end
+
+    def _resolve(self, target: Union[int, str]) -> int:
+        index = self.find(target) if isinstance(target, str) else target
+        if index is None:
+            raise KeyError(f"Section not found: {target}")
+        return index
+
+    def insert_before(self, target: Union[int, str], text: str):
+        """Insert markdown in front of a section"""
+        index = self._resolve(target)
+        self.sections[index:index] = parse_sections(text)
+
+    def insert_after(self, target: Union[int, str], text: str):
+        """Insert markdown after a section and its subsections"""
+        end = self.section_end(self._resolve(target))
+        self.sections[end:end] = parse_sections(text)
+
+    def replace_section(self, target: Union[int, str], text: str):
+        """Replace a section and its subsections with markdown"""
+        index = self._resolve(target)
+        self.sections[index:self.section_end(index)] = parse_sections(text)
+
+    def section_text(self, target: Union[int, str]) -> str:
+        """Text of a section including its subsections"""
+        index = self._resolve(target)
+        return "".join(section.text for section in self.sections[index:self.section_end(index)])
+
+    def serialize(self) -> str:
+        return "".join(section.text for section in self.sections)
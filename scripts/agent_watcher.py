@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Agent Watcher - Watch mode for the agent customizer
+Polls base agents and engine configs and, once a burst of edits settles,
+regenerates the project agents that depend on them
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Set
+
+from agent_customizer import AgentCustomizer
+from agent_manifest import DependencyIndex
+from engine_registry import ENGINE_FILENAMES
+
+
+DEFAULT_DEBOUNCE = 0.5
+DEFAULT_INTERVAL = 0.25
+
+
+class AgentWatcher:
+    def __init__(self, customizer: Optional[AgentCustomizer] = None, base_path: Path = Path("projects"),
+                 debounce: float = DEFAULT_DEBOUNCE, interval: float = DEFAULT_INTERVAL,
+                 jobs: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        self.customizer = customizer or AgentCustomizer()
+        self.base_path = Path(base_path)
+        self.debounce = debounce
+        self.interval = interval
+        self.jobs = jobs
+        self.clock = clock
+        self.engine_names = {f"{prefix}_config.json": name for name, prefix in ENGINE_FILENAMES.items()}
+        self.mtimes = self.snapshot()
+        self.pending: Set[Path] = set()
+        self.last_change: Optional[float] = None
+
+    def watched_files(self) -> List[Path]:
+        return (sorted(self.customizer.base_agents_path.glob("*.md")) +
+                sorted(self.customizer.engine_configs_path.glob("*.json")))
+
+    def snapshot(self) -> Dict[Path, int]:
+        """mtime of every watched file"""
+        mtimes = {}
+        for path in self.watched_files():
+            try:
+                mtimes[path] = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                pass
+        return mtimes
+
+    def poll(self) -> Set[Path]:
+        """Collect files added, changed or removed since the last poll"""
+        current = self.snapshot()
+        changed = {path for path in current.keys() | self.mtimes.keys()
+                   if current.get(path) != self.mtimes.get(path)}
+        self.mtimes = current
+        if changed:
+            self.pending |= changed
+            self.last_change = self.clock()
+        return changed
+
+    def due(self) -> bool:
+        """True once pending edits have been quiet for the debounce window"""
+        return bool(self.pending) and self.clock() - self.last_change >= self.debounce
+
+    def dependents(self, index: DependencyIndex, changed: Set[Path]) -> Dict[str, int]:
+        """Number of generated files depending on each changed input"""
+        counts = {}
+        for path in sorted(changed):
+            if path.suffix == ".md":
+                counts[path.name] = len(index.dependents_of_agent(path.stem))
+            else:
+                engine = self.engine_names.get(path.name, path.stem.replace("_config", ""))
+                counts[path.name] = len(index.dependents_of_engine(engine))
+        return counts
+
+    def flush(self) -> Dict[str, Any]:
+        """Regenerate dependents of every pending edit in one pass"""
+        changed, self.pending = self.pending, set()
+        index = DependencyIndex.build(self.base_path)
+        report = self.customizer.refresh(self.base_path, jobs=self.jobs, index=index)
+        report["changed"] = self.dependents(index, changed)
+        return report
+
+    def step(self) -> Optional[Dict[str, Any]]:
+        """Poll once and flush if a burst of edits has settled"""
+        self.poll()
+        if self.due():
+            return self.flush()
+        return None
+
+    def print_report(self, report: Dict[str, Any]):
+        for name, count in report["changed"].items():
+            print(f"✏️  {name} changed ({count} dependent files)")
+        print(f"🔄 Regenerated {report['written']} agent files in {report['stale_projects']} projects")
+
+    def run(self, max_seconds: Optional[float] = None):
+        """Watch until interrupted (or for max_seconds)"""
+        print(f"👀 Watching {self.customizer.base_agents_path}/*.md and "
+              f"{self.customizer.engine_configs_path}/*.json (Ctrl+C to stop)")
+        started = self.clock()
+        try:
+            while max_seconds is None or self.clock() - started < max_seconds:
+                try:
+                    report = self.step()
+                except Exception as e:
+                    # e.g. an engine config saved half-way through an edit; the next save retries
+                    print(f"❌ Refresh failed: {e}")
+                    report = None
+                if report is not None:
+                    self.print_report(report)
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
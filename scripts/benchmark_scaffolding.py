@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Scaffolding Benchmark - Times project creation steps per engine
+Reports p50/p95 timings and bytes written on tmpfs and on disk, and fails
+when timings regress past this machine's baselines, compared as multiples
+of a calibration step timed alongside every iteration
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, Any, List, Callable
+
+from agent_customizer import AgentCustomizer
+from init_project import ProjectInitializer
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+# Timings only compare on the machine that recorded them, so baselines stay local (.cache/ is git-ignored)
+BASELINES_FILE = REPO_ROOT / ".cache" / "benchmark_baselines.json"
+
+# (folder structure name, project config engine name)
+ENGINES = {
+    "Godot": "Godot",
+    "Unity": "Unity",
+    "Unreal": "Unreal Engine"
+}
+ENGINE_VERSIONS = {
+    "Godot": "4.4.1",
+    "Unity": "2023.2",
+    "Unreal Engine": "5.3"
+}
+STEPS = [
+    "create_project_structure",
+    "create_initial_files",
+    "create_engine_files",
+    "customize_agents_for_project"
+]
+
+# Regressions smaller than this are treated as timer noise
+NOISE_FLOOR_MS = 2.0
+# Calibration step: folders and small files created and removed, scaffolding without the templates
+CALIBRATION_FOLDERS = 24
+CALIBRATION_FILES = 12
+CALIBRATION_BYTES = 4096
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def file_snapshot(path: Path) -> Dict[str, Any]:
+    """Map every file below path to its (size, mtime_ns)"""
+    snapshot = {}
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            snapshot[os.path.join(root, name)] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def bytes_written(before: Dict[str, Any], after: Dict[str, Any]) -> int:
+    """Size of files created or rewritten between two snapshots"""
+    return sum(size for name, (size, mtime) in after.items()
+               if before.get(name, (None, None))[1] != mtime)
+
+
+def build_benchmark_config(project_name: str, engine: str) -> Dict[str, Any]:
+    """Project config used for every benchmark iteration"""
+    initializer = ProjectInitializer()
+    return {
+        "project": {
+            "name": project_name,
+            "concept": "A benchmark game about timing things",
+            "genre": "Action",
+            "platform": "PC",
+            "audience": "Core",
+            "timeline": "Medium",
+            "engine": engine,
+            "engine_version": ENGINE_VERSIONS[engine],
+            "mode": "development",
+            "competitors": "Hades, Dead Cells, Celeste, Hollow Knight",
+            "unique_selling_point": "Deterministic benchmarks",
+            "version": "1.0.0",
+            "created": "2026-01-01T00:00:00",
+            "phase": "Market Analysis",
+            "status": "active"
+        },
+        "development_rules": ["Follow engine best practices", "Write clean, maintainable code"],
+        "team": {
+            "active_agents": initializer.configure_agents({"mode": "development"}),
+            "lead_agent": "producer_agent",
+            "orchestrator": "master_orchestrator"
+        },
+        "milestones": initializer.calculate_milestones("Medium", "development"),
+        "metrics": {
+            "velocity_target": "10 tasks/week",
+            "bug_threshold": "5 critical, 20 minor",
+            "performance_target": "60 FPS, < 3s load"
+        }
+    }
+
+
+def calibration_step(root: Path):
+    """Fixed filesystem work that step timings are measured against"""
+    directory = root / "calibration"
+    for number in range(CALIBRATION_FOLDERS):
+        (directory / f"folder_{number % 4}" / f"sub_{number}").mkdir(parents=True)
+    payload = "x" * CALIBRATION_BYTES
+    for number in range(CALIBRATION_FILES):
+        with open(directory / f"folder_{number % 4}" / f"file_{number}.md", 'w', encoding='utf-8') as f:
+            f.write(payload)
+    shutil.rmtree(directory)
+
+
+class ScaffoldingBenchmark:
+    def __init__(self, iterations: int = 10):
+        self.iterations = iterations
+        self.customizer = AgentCustomizer()
+        self.customizer.base_agents_path = REPO_ROOT / "agents"
+        self.customizer.engine_configs_path = REPO_ROOT / "engine_configs"
+        # Every iteration renders from scratch; warm render cache hits would hide rendering regressions
+        self.customizer.render_cache_path = None
+
+    def time_step(self, step: Callable[[], Any]) -> float:
+        """Run a step with its console output suppressed and return elapsed ms"""
+        with redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            step()
+            return (time.perf_counter() - started) * 1000.0
+
+    def run_engine(self, root: Path, structure_engine: str) -> Dict[str, Dict[str, float]]:
+        """Benchmark every scaffolding step for one engine below root"""
+        engine = ENGINES[structure_engine]
+        initializer = ProjectInitializer()
+        initializer.base_path = root / "projects"
+        timings: Dict[str, List[float]] = {step: [] for step in STEPS}
+        # Each timing over the calibration step of its own iteration, so load that comes and goes cancels out
+        ratios: Dict[str, List[float]] = {step: [] for step in STEPS}
+        written: Dict[str, List[int]] = {step: [] for step in STEPS}
+
+        # The first iteration warms file and import caches and is not recorded
+        for iteration in range(self.iterations + 1):
+            project_name = f"Bench {structure_engine} {iteration}"
+            config = build_benchmark_config(project_name, engine)
+            project_path = initializer.base_path / project_name.lower().replace(" ", "-")
+
+            steps = [
+                ("create_project_structure",
+                 lambda: initializer.create_project_structure(project_name, structure_engine)),
+                ("create_initial_files",
+                 lambda: initializer.create_initial_files(project_path, config)),
+                ("create_engine_files",
+                 lambda: initializer.create_engine_files(project_path, engine, project_name,
+                                                         config['project']['engine_version'])),
+                ("customize_agents_for_project",
+                 lambda: self.customizer.customize_agents_for_project(project_path, config))
+            ]
+            calibration = self.time_step(lambda: calibration_step(root))
+            for step_name, step in steps:
+                before = file_snapshot(project_path)
+                elapsed = self.time_step(step)
+                if iteration > 0:
+                    timings[step_name].append(elapsed)
+                    ratios[step_name].append(elapsed / calibration)
+                    written[step_name].append(bytes_written(before, file_snapshot(project_path)))
+
+            shutil.rmtree(project_path)
+
+        return {
+            step: {
+                "p50_ms": round(percentile(timings[step], 50), 3),
+                "p95_ms": round(percentile(timings[step], 95), 3),
+                "p50_x": round(percentile(ratios[step], 50), 3),
+                "bytes": max(written[step])
+            }
+            for step in STEPS
+        }
+
+    def run(self, targets: Dict[str, Path]) -> Dict[str, Dict[str, Dict[str, Dict[str, float]]]]:
+        """Benchmark all engines on every filesystem target"""
+        results = {}
+        for label, directory in targets.items():
+            with tempfile.TemporaryDirectory(prefix="gamestudio-bench-", dir=directory) as temp_dir:
+                results[label] = {
+                    structure_engine: self.run_engine(Path(temp_dir), structure_engine)
+                    for structure_engine in ENGINES
+                }
+        return results
+
+
+def find_targets(disk_dir: Path) -> Dict[str, Path]:
+    """Return the tmpfs and real disk directories to benchmark on"""
+    targets = {}
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        targets["tmpfs"] = shm
+    else:
+        print("Note: /dev/shm not available, skipping tmpfs run")
+    targets["disk"] = disk_dir
+    return targets
+
+
+def print_report(results: Dict[str, Any]):
+    """Print p50/p95 timings and bytes written per filesystem, engine and step"""
+    for label, engines in results.items():
+        print(f"\n[{label}]")
+        print(f"  {'engine':<8} {'step':<30} {'p50 ms':>9} {'p95 ms':>9} {'p50 x':>7} {'bytes':>10}")
+        for engine, steps in engines.items():
+            for step, values in steps.items():
+                print(f"  {engine:<8} {step:<30} {values['p50_ms']:>9.2f} "
+                      f"{values['p95_ms']:>9.2f} {values['p50_x']:>7.2f} {values['bytes']:>10}")
+
+
+def compare_to_baselines(results: Dict[str, Any], baselines: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return a message for every step whose p50, in calibration steps, regressed past its baseline"""
+    regressions = []
+    for label, engines in results.items():
+        for engine, steps in engines.items():
+            for step, values in steps.items():
+                baseline = baselines.get(label, {}).get(engine, {}).get(step)
+                if not baseline or 'p50_x' not in baseline:
+                    continue
+                limit = baseline['p50_x'] * (1.0 + tolerance)
+                # The same slowdown in this run's milliseconds, to ignore regressions below timer noise
+                slower_ms = values['p50_ms'] * (1.0 - baseline['p50_x'] / values['p50_x']) if values['p50_x'] else 0.0
+                if values['p50_x'] > limit and slower_ms > NOISE_FLOOR_MS:
+                    regressions.append(
+                        f"{label}/{engine}/{step} p50: {values['p50_x']:.2f}x calibration "
+                        f"> {limit:.2f}x (baseline {baseline['p50_x']:.2f}x, {values['p50_ms']:.2f} ms now)"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark project scaffolding per engine")
+    parser.add_argument("--iterations", type=int, default=10, help="Runs per engine and filesystem")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed slowdown over baseline (0.5 = 50%%)")
+    parser.add_argument("--disk-dir", type=Path, default=REPO_ROOT,
+                        help="Directory on a real disk to benchmark in")
+    parser.add_argument("--baselines", type=Path, default=BASELINES_FILE,
+                        help="This machine's baselines JSON file")
+    parser.add_argument("--update-baselines", action="store_true",
+                        help="Store these results as this machine's baselines")
+    args = parser.parse_args()
+
+    print("SCAFFOLDING BENCHMARK")
+    print("=" * 50)
+    results = ScaffoldingBenchmark(args.iterations).run(find_targets(args.disk_dir))
+    print_report(results)
+
+    if args.update_baselines:
+        args.baselines.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baselines, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaselines written to {args.baselines}")
+        return True
+
+    if not args.baselines.exists():
+        print(f"\nNo baselines found at {args.baselines}; run with --update-baselines to create them")
+        return True
+
+    with open(args.baselines, 'r') as f:
+        baselines = json.load(f)
+
+    regressions = compare_to_baselines(results, baselines, args.tolerance)
+    if regressions:
+        print(f"\nFAIL: {len(regressions)} timing(s) regressed past baseline:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return False
+
+    print("\nPASS: All timings within baseline tolerance")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Context Pack - Precomputed per-phase session bundles
+Bundles a project agent, the project config slice and the current phase's
+documents into one ordered file, rebuilt only when an input changes
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from agent_budget import DEFAULT_PHASE_AGENTS, PHASE_AGENTS, estimate_tokens
+from agent_common import COMMON_FILE, resolve_agent
+
+
+# Inside the project, where its .gitignore already skips .cache/
+PACK_DIR = Path(".cache") / "context"
+INDEX_FILE = "index.json"
+# Bump when the pack layout changes so old packs are rebuilt
+PACK_FORMAT = 1
+
+# Config sections every pack carries, plus the ones each phase needs
+BASE_CONFIG_KEYS = ["project", "development_rules"]
+PHASE_CONFIG_KEYS = {
+    "Market Analysis": ["risks"],
+    "Initialization": ["team", "milestones"],
+    "Design": ["milestones", "risks"],
+    "Development": ["milestones", "metrics", "analytics_framework"],
+    "Polish": ["milestones", "metrics"],
+    "Launch": ["milestones", "metrics", "analytics_framework"]
+}
+AGENT_CONFIG_KEYS = {
+    "producer_agent": ["team", "milestones", "metrics", "risks"],
+    "project_orchestrator": ["team", "milestones"],
+    "data_scientist": ["analytics_framework", "metrics"],
+    "qa_agent": ["metrics"]
+}
+# Bookkeeping fields that change on every resume without changing the session's context
+VOLATILE_PROJECT_KEYS = ("status", "last_resumed")
+
+# Project documents each phase works from, in bundle order
+PHASE_DOCUMENTS = {
+    "Market Analysis": ["resources/market-research/market_overview.md", "resources/market-research/*.md"],
+    "Initialization": ["documentation/design/gdd.md", "documentation/production/timeline.md"],
+    "Design": ["documentation/design/gdd.md", "documentation/design/**/*.md", "documentation/art/**/*.md"],
+    "Development": ["documentation/design/gdd.md", "documentation/technical/**/*.md",
+                    "documentation/production/timeline.md"],
+    "Polish": ["documentation/technical/performance/*.md", "qa/**/*.md"],
+    "Launch": ["documentation/production/**/*.md", "qa/**/*.md"]
+}
+DEFAULT_DOCUMENTS = ["documentation/production/timeline.md"]
+
+
+def slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def default_agent(phase: str) -> str:
+    """Agent the resume command suggests first for a phase"""
+    return PHASE_AGENTS.get(phase, DEFAULT_PHASE_AGENTS)[0]
+
+
+class ContextPacker:
+    def __init__(self, project_path: Path):
+        self.project_path = Path(project_path)
+        self.pack_path = self.project_path / PACK_DIR
+        self.index_file = self.pack_path / INDEX_FILE
+
+    def pack_file(self, phase: str, agent_name: str) -> Path:
+        return self.pack_path / f"{slug(phase)}--{agent_name}.md"
+
+    def load_config(self) -> Dict[str, Any]:
+        with open(self.project_path / "project-config.json", 'r') as f:
+            return json.load(f)
+
+    def config_slice(self, config: Dict[str, Any], phase: str, agent_name: str) -> Dict[str, Any]:
+        """The parts of project-config.json a session in this phase and role needs"""
+        keys = BASE_CONFIG_KEYS + PHASE_CONFIG_KEYS.get(phase, []) + AGENT_CONFIG_KEYS.get(agent_name, [])
+        sliced = {key: config[key] for key in dict.fromkeys(keys) if key in config}
+        if "project" in sliced:
+            sliced["project"] = {key: value for key, value in sliced["project"].items()
+                                 if key not in VOLATILE_PROJECT_KEYS}
+        return sliced
+
+    def documents(self, phase: str) -> List[Path]:
+        """The phase's documents, in pattern order without repeats"""
+        found = {}
+        for pattern in PHASE_DOCUMENTS.get(phase, DEFAULT_DOCUMENTS):
+            for path in sorted(self.project_path.glob(pattern)):
+                if path.is_file():
+                    found.setdefault(path, None)
+        return list(found)
+
+    def inputs(self, phase: str, agent_name: str) -> List[Path]:
+        """Every file a pack is built from"""
+        agents_path = self.project_path / "agents"
+        files = [agents_path / f"{agent_name}.md", self.project_path / "project-config.json"]
+        if (agents_path / COMMON_FILE).exists():
+            files.append(agents_path / COMMON_FILE)
+        return files + self.documents(phase)
+
+    def parts(self, phase: str, agent_name: str, config: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Ordered (heading, text) parts of a pack: agent, config slice, documents"""
+        agent_file = self.project_path / "agents" / f"{agent_name}.md"
+        if not agent_file.exists():
+            raise FileNotFoundError(f"Project agent not found: {agent_file}")
+        # Shared bodies are content-addressed, so the agent file's signature covers them too
+        agent_text = resolve_agent(agent_file)
+        config_text = json.dumps(self.config_slice(config, phase, agent_name), indent=2)
+
+        parts = [(f"Agent: agents/{agent_name}.md", agent_text),
+                 ("Project Configuration", f"```json\n{config_text}\n```\n")]
+        for document in self.documents(phase):
+            relative = document.relative_to(self.project_path).as_posix()
+            parts.append((f"Document: {relative}", document.read_text(encoding='utf-8')))
+        return parts
+
+    def render(self, phase: str, agent_name: str, config: Dict[str, Any], parts: List[Tuple[str, str]]) -> str:
+        name = config.get('project', {}).get('name', self.project_path.name)
+        contents = [f"# Context Pack - {name} / {phase} / {agent_name}\n\n",
+                    "Everything this session needs, in reading order: the agent, the project configuration "
+                    "for this phase and the phase's documents. Read this file instead of the files it lists.\n\n"]
+        contents += [f"- {heading}\n" for heading, _ in parts]
+        for heading, text in parts:
+            contents.append(f"\n---\n\n<!-- {heading} -->\n\n{text}")
+            if not text.endswith("\n"):
+                contents.append("\n")
+        return "".join(contents)
+
+    def load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_file, 'r') as f:
+                index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return index if index.get('format') == PACK_FORMAT else {}
+
+    def save_index(self, index: Dict[str, Any]):
+        index['format'] = PACK_FORMAT
+        self.write_atomic(self.index_file, json.dumps(index, indent=2, sort_keys=True))
+
+    def write_atomic(self, path: Path, text: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_file, path)
+
+    def signatures(self, files: List[Path]) -> Dict[str, List[int]]:
+        """(mtime, size) of each input; matching signatures skip reading the inputs"""
+        signatures = {}
+        for path in files:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signatures[path.relative_to(self.project_path).as_posix()] = [stat.st_mtime_ns, stat.st_size]
+        return signatures
+
+    def build(self, phase: Optional[str] = None, agent_name: Optional[str] = None) -> Dict[str, Any]:
+        """Return an up-to-date pack for a phase and agent, rebuilding it only if its inputs changed"""
+        config = self.load_config()
+        phase = phase or config.get('project', {}).get('phase', 'Initialization')
+        agent_name = agent_name or default_agent(phase)
+        pack_file = self.pack_file(phase, agent_name)
+        index = self.load_index()
+        entry = index.get('packs', {}).get(pack_file.name)
+        signatures = self.signatures(self.inputs(phase, agent_name))
+        report = {"phase": phase, "agent": agent_name, "path": pack_file, "status": "cached"}
+
+        if entry and entry['inputs'] == signatures and pack_file.exists():
+            report["tokens"] = entry['tokens']
+            return report
+
+        # Something was touched: hash what the pack is made of before rewriting it
+        parts = self.parts(phase, agent_name, config)
+        digest = hashlib.sha256(json.dumps([PACK_FORMAT, phase, agent_name, parts]).encode('utf-8')).hexdigest()
+        if not (entry and entry['digest'] == digest and pack_file.exists()):
+            text = self.render(phase, agent_name, config, parts)
+            self.write_atomic(pack_file, text)
+            entry = {"digest": digest, "tokens": estimate_tokens(text)}
+            report["status"] = "built"
+        entry['inputs'] = signatures
+        index.setdefault('packs', {})[pack_file.name] = entry
+        self.save_index(index)
+        report["tokens"] = entry['tokens']
+        return report
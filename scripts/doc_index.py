@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Doc Index - Local full-text search over project documentation
+Keeps a BM25 inverted index of every project's markdown up to date
+incrementally and answers ranked queries with snippets
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+
+DEFAULT_INDEX_PATH = Path(".cache") / "doc_index.json"
+INDEX_VERSION = 1
+
+# Folders of each project that are searched
+SEARCH_FOLDERS = ("documentation", "resources/market-research", "qa")
+
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or that the this to was were will with
+""".split())
+SNIPPET_CHARS = 160
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower())
+            if len(token) > 1 and token not in STOPWORDS]
+
+
+def scan_documents(base_path: Path, folders: Tuple[str, ...] = SEARCH_FOLDERS
+                   ) -> Tuple[Dict[str, Tuple[int, int]], Dict[str, int]]:
+    """(mtime, size) of the markdown in every project's folders, keyed by path relative to base_path,
+    and the mtime of every directory whose entries decide which files those are"""
+    found: Dict[str, Tuple[int, int]] = {}
+    dirs: Dict[str, int] = {}
+    if not base_path.exists():
+        return found, dirs
+    # Plain string paths: this runs over every document of the fleet
+    base = str(base_path)
+    dirs[""] = os.stat(base).st_mtime_ns
+    for project in sorted(os.listdir(base)):
+        project_dir = os.path.join(base, project)
+        if not os.path.isdir(project_dir):
+            continue
+        # Adding project-config.json (or a top-level folder) touches the project folder
+        dirs[project] = os.stat(project_dir).st_mtime_ns
+        if not os.path.exists(os.path.join(project_dir, "project-config.json")):
+            continue
+        for folder in folders:
+            # A missing folder appearing later touches the deepest existing folder above it
+            parts = folder.split("/")
+            for depth in range(1, len(parts)):
+                ancestor = "/".join([project] + parts[:depth])
+                try:
+                    dirs[ancestor] = os.stat(os.path.join(base, ancestor)).st_mtime_ns
+                except FileNotFoundError:
+                    break
+            for root, _, filenames in os.walk(os.path.join(project_dir, folder)):
+                prefix = root[len(base) + 1:].replace(os.sep, "/")
+                dirs[prefix] = os.stat(root).st_mtime_ns
+                for filename in filenames:
+                    if filename.endswith(".md"):
+                        stat = os.stat(os.path.join(root, filename))
+                        found[f"{prefix}/{filename}"] = (stat.st_mtime_ns, stat.st_size)
+    return found, dirs
+
+
+class DocumentIndex:
+    def __init__(self, base_path: Path = Path("projects"), index_path: Optional[Path] = DEFAULT_INDEX_PATH):
+        self.base_path = Path(base_path)
+        self.index_path = Path(index_path) if index_path is not None else None
+        # doc id -> [path relative to base_path, mtime_ns, size, length in tokens]
+        self.docs: Dict[int, List[Any]] = {}
+        self.paths: Dict[str, int] = {}
+        # term -> {doc id: term frequency}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.total_length = 0
+        self.next_id = 0
+        # directory relative to base_path -> mtime_ns at the last full scan (None: never scanned)
+        self.dirs: Optional[Dict[str, int]] = None
+        self.loaded = False
+
+    def load(self):
+        """Read the saved index once; a missing or outdated index starts empty"""
+        self.loaded = True
+        if self.index_path is None:
+            return
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION or data.get('base_path') != self.base_path.as_posix():
+            return
+        self.next_id = data['next_id']
+        self.dirs = data.get('dirs')
+        for doc_id, path, mtime_ns, size, length in data['docs']:
+            self.docs[doc_id] = [path, mtime_ns, size, length]
+            self.paths[path] = doc_id
+            self.total_length += length
+        for term, flat in data['postings'].items():
+            self.postings[term] = dict(zip(flat[::2], flat[1::2]))
+
+    def save(self):
+        if self.index_path is None:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "base_path": self.base_path.as_posix(),
+            "next_id": self.next_id,
+            "dirs": self.dirs,
+            "docs": [[doc_id] + entry for doc_id, entry in self.docs.items()],
+            # Flat [id, tf, id, tf, ...] lists keep the file small and fast to parse
+            "postings": {term: [value for item in docs.items() for value in item]
+                         for term, docs in self.postings.items()}
+        }
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(temp_file, self.index_path)
+
+    def scan(self) -> Tuple[Dict[str, Tuple[int, int]], bool]:
+        """(mtime, size) of every searchable markdown file, keyed by path relative to base_path,
+        and whether the folders were walked
+
+        While no directory changed its mtime the set of files is the one already indexed, so only
+        those are stat'ed (to catch edits in place) instead of walking every project again.
+        """
+        base = str(self.base_path)
+        if self.dirs:
+            try:
+                unchanged = all(os.stat(os.path.join(base, relative)).st_mtime_ns == mtime_ns
+                                for relative, mtime_ns in self.dirs.items())
+            except FileNotFoundError:
+                unchanged = False
+            if unchanged:
+                found = {}
+                for relative in self.paths:
+                    try:
+                        stat = os.stat(os.path.join(base, relative))
+                    except FileNotFoundError:
+                        continue
+                    found[relative] = (stat.st_mtime_ns, stat.st_size)
+                return found, False
+        found, self.dirs = scan_documents(self.base_path)
+        return found, True
+
+    def _add(self, relative: str, mtime_ns: int, size: int):
+        text = (self.base_path / relative).read_text(encoding='utf-8', errors='replace')
+        tokens = tokenize(text)
+        doc_id = self.next_id
+        self.next_id += 1
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for term, count in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+        self.docs[doc_id] = [relative, mtime_ns, size, len(tokens)]
+        self.paths[relative] = doc_id
+        self.total_length += len(tokens)
+
+    def _remove(self, doc_ids: set):
+        """Drop documents from the doc table and, in one pass, from every posting list"""
+        for doc_id in doc_ids:
+            relative, _, _, length = self.docs.pop(doc_id)
+            del self.paths[relative]
+            self.total_length -= length
+        for term in list(self.postings):
+            docs = self.postings[term]
+            if not doc_ids.isdisjoint(docs):
+                for doc_id in doc_ids & docs.keys():
+                    del docs[doc_id]
+                if not docs:
+                    del self.postings[term]
+
+    def update(self) -> Dict[str, int]:
+        """Re-index only files that were added, removed or whose mtime or size changed"""
+        if not self.loaded:
+            self.load()
+        dirs = self.dirs
+        found, walked = self.scan()
+        changed = [relative for relative, signature in found.items()
+                   if relative not in self.paths or tuple(self.docs[self.paths[relative]][1:3]) != signature]
+        removed = [relative for relative in self.paths if relative not in found]
+
+        stale = {self.paths[relative] for relative in changed + removed if relative in self.paths}
+        if stale:
+            self._remove(stale)
+        for relative in sorted(changed):
+            self._add(relative, *found[relative])
+        if changed or removed or self.dirs != dirs:
+            self.save()
+        return {"documents": len(self.docs), "indexed": len(changed), "removed": len(removed), "walked": walked}
+
+    def matches(self, relative: str, project: Optional[str], folder: Optional[str]) -> bool:
+        """Whether a document lies in the project and folder filters"""
+        project_name, _, inner = relative.partition("/")
+        if project and project_name != project:
+            return False
+        return not folder or inner == folder or inner.startswith(folder.rstrip("/") + "/")
+
+    def search(self, query: str, project: Optional[str] = None, folder: Optional[str] = None,
+               limit: int = 10) -> List[Dict[str, Any]]:
+        """Top documents for a query by BM25, with a snippet from each"""
+        if not self.loaded:
+            self.load()
+        terms = list(dict.fromkeys(tokenize(query)))
+        count = len(self.docs)
+        if not terms or not count:
+            return []
+        average_length = self.total_length / count
+
+        allowed: Dict[int, bool] = {}
+        scores: Dict[int, float] = {}
+        for term in terms:
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, frequency in docs.items():
+                if project or folder:
+                    ok = allowed.get(doc_id)
+                    if ok is None:
+                        ok = allowed[doc_id] = self.matches(self.docs[doc_id][0], project, folder)
+                    if not ok:
+                        continue
+                length = self.docs[doc_id][3]
+                norm = frequency * (K1 + 1) / (frequency + K1 * (1 - B + B * length / average_length))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+
+        results = []
+        for doc_id, score in heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0])):
+            relative = self.docs[doc_id][0]
+            project_name, _, inner = relative.partition("/")
+            results.append({
+                "path": relative,
+                "project": project_name,
+                "file": inner,
+                "score": round(score, 4),
+                "snippet": self.snippet(relative, terms)
+            })
+        return results
+
+    def snippet(self, relative: str, terms: List[str]) -> str:
+        """The line with the most query terms, trimmed around the first hit"""
+        try:
+            text = (self.base_path / relative).read_text(encoding='utf-8', errors='replace')
+        except FileNotFoundError:
+            return ""
+        best, best_hits = "", 0
+        wanted = set(terms)
+        for line in text.splitlines():
+            hits = len(wanted.intersection(tokenize(line)))
+            if hits > best_hits:
+                best, best_hits = line.strip(), hits
+        if len(best) <= SNIPPET_CHARS:
+            return best
+        lowered = best.lower()
+        first = min((lowered.find(term) for term in terms if term in lowered), default=0)
+        start = max(0, first - SNIPPET_CHARS // 3)
+        clipped = best[start:start + SNIPPET_CHARS]
+        return ("…" if start else "") + clipped + ("…" if start + SNIPPET_CHARS < len(best) else "")
+
+    def timed_search(self, query: str, **filters) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Load, update and search, returning the results with the update report and each stage's milliseconds"""
+        started = time.perf_counter()
+        if not self.loaded:
+            self.load()
+        loaded = time.perf_counter()
+        report = self.update()
+        updated = time.perf_counter()
+        results = self.search(query, **filters)
+        finished = time.perf_counter()
+        report.update(load_ms=(loaded - started) * 1000, update_ms=(updated - loaded) * 1000,
+                      search_ms=(finished - updated) * 1000, total_ms=(finished - started) * 1000)
+        return results, report
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Document Writer - Batched rendering and concurrent writes for project docs
+Collects rendered documents per generator and writes them in one pass
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Below this many documents, thread start-up costs more than it saves
+MIN_PARALLEL_BATCH = 8
+
+
+class DocumentWriter:
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 4)
+        self.pending: List[Tuple[Path, str, str]] = []
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.current_generator = "documents"
+
+    def _generator_stats(self, name: str) -> Dict[str, Any]:
+        return self.stats.setdefault(name, {
+            "files": 0,
+            "bytes": 0,
+            "render_seconds": 0.0,
+            "write_seconds": 0.0
+        })
+
+    @contextmanager
+    def generator(self, name: str):
+        """Time the rendering done inside the block and tag queued docs with name"""
+        previous = self.current_generator
+        self.current_generator = name
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self._generator_stats(name)["render_seconds"] += time.perf_counter() - started
+            self.current_generator = previous
+
+    def add(self, path: Path, content: str, generator: Optional[str] = None):
+        """Queue a rendered document for writing"""
+        self.pending.append((Path(path), content, generator or self.current_generator))
+
+    def _write(self, item: Tuple[Path, str, str]) -> Tuple[str, int, float]:
+        path, content, generator = item
+        started = time.perf_counter()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return generator, len(content.encode('utf-8')), time.perf_counter() - started
+
+    def flush(self) -> int:
+        """Write all queued documents concurrently and return the number written"""
+        if not self.pending:
+            return 0
+        pending, self.pending = self.pending, []
+
+        for parent in {path.parent for path, _, _ in pending}:
+            parent.mkdir(parents=True, exist_ok=True)
+
+        if len(pending) < MIN_PARALLEL_BATCH or self.max_workers <= 1:
+            results = [self._write(item) for item in pending]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                results = list(pool.map(self._write, pending))
+
+        for generator, size, seconds in results:
+            stats = self._generator_stats(generator)
+            stats["files"] += 1
+            stats["bytes"] += size
+            stats["write_seconds"] += seconds
+        return len(results)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return a copy of the per-generator timing stats"""
+        return {name: dict(values) for name, values in self.stats.items()}
+
+    def print_stats(self):
+        """Print per-generator timing stats"""
+        for name, values in self.stats.items():
+            print(f"  - {name}: {values['files']} files, {values['bytes']} bytes, "
+                  f"render {values['render_seconds'] * 1000:.1f} ms, "
+                  f"write {values['write_seconds'] * 1000:.1f} ms")
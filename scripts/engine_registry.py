@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Engine Config Registry - Process-wide cache of engine configurations
+Parses and validates each engine config once and hands out immutable,
+version-resolved views
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
+
+
+REQUIRED_FIELDS = ["engine", "best_practices", "agent_specializations"]
+
+# Engine names used in project configs -> config file prefix
+ENGINE_FILENAMES = {
+    "Unreal Engine": "unreal",
+    "Unity": "unity",
+    "Godot": "godot"
+}
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only copy: dicts become mapping proxies and lists become tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable (and JSON serializable) copy of a frozen value"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge override into a copy of base; nested dicts merge, everything else replaces"""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def version_matches(version: str, pattern: str) -> bool:
+    """Match "3", "3.x" or "3.5" against versions such as "3.5.3"; exact matches always apply"""
+    prefix = pattern[:-2] if pattern.endswith(".x") else pattern
+    return version == prefix or version.startswith(prefix + ".") or version.startswith(prefix + " ")
+
+
+class EngineConfigRegistry:
+    def __init__(self, engine_configs_path: Path = Path("engine_configs")):
+        self.engine_configs_path = Path(engine_configs_path)
+        self._configs: Dict[str, Tuple[Optional[int], Dict[str, Any]]] = {}
+        self._resolved: Dict[Tuple[str, str], Tuple[Optional[int], Mapping[str, Any]]] = {}
+        self._digests: Dict[int, Tuple[Mapping[str, Any], str]] = {}
+        self._lock = threading.Lock()
+        self.parse_count = 0
+
+    def config_file(self, engine: str) -> Path:
+        """Path of the config file for an engine name"""
+        engine_filename = ENGINE_FILENAMES.get(engine, engine.lower().replace(" ", ""))
+        return self.engine_configs_path / f"{engine_filename}_config.json"
+
+    def validate(self, config: Dict[str, Any], config_file: Path):
+        """Raise ValueError if a config is missing required fields"""
+        missing = [field for field in REQUIRED_FIELDS if field not in config]
+        if missing:
+            raise ValueError(f"{config_file} missing required fields: {', '.join(missing)}")
+        if not isinstance(config.get('version_overrides', {}), dict):
+            raise ValueError(f"{config_file} version_overrides must be an object")
+
+    def _mtime(self, config_file: Path) -> Optional[int]:
+        try:
+            return config_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load(self, engine: str) -> Tuple[Optional[int], Dict[str, Any]]:
+        """Return (mtime, parsed config), re-parsing only when the file changed"""
+        config_file = self.config_file(engine)
+        mtime = self._mtime(config_file)
+        cached = self._configs.get(engine)
+        if cached is not None and cached[0] == mtime:
+            return cached
+
+        if mtime is None:
+            print(f"Warning: No config found for {engine}, using defaults")
+            config = {"engine": engine, "best_practices": {}, "agent_specializations": {}}
+        else:
+            with open(config_file, 'r') as f:
+                config = json.load(f)
+            self.validate(config, config_file)
+            self.parse_count += 1
+
+        self._configs[engine] = (mtime, config)
+        return self._configs[engine]
+
+    def resolve(self, engine: str, version: Optional[str] = None) -> Mapping[str, Any]:
+        """Immutable config for an engine version with version overrides applied"""
+        with self._lock:
+            mtime, config = self._load(engine)
+            version = version or config.get('version', 'latest')
+            key = (engine, version)
+            cached = self._resolved.get(key)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+            resolved = {k: v for k, v in config.items() if k != 'version_overrides'}
+            overrides = config.get('version_overrides', {})
+            # Less specific patterns first so "3.5" wins over "3"
+            for pattern in sorted(overrides, key=len):
+                if version_matches(version, pattern):
+                    resolved = deep_merge(resolved, overrides[pattern])
+            resolved['version'] = version
+
+            view = freeze(resolved)
+            self._resolved[key] = (mtime, view)
+            return view
+
+    def digest(self, engine: str, version: Optional[str] = None) -> str:
+        """Stable hash of a resolved config, computed once per resolved view"""
+        view = self.resolve(engine, version)
+        with self._lock:
+            cached = self._digests.get(id(view))
+            if cached is not None and cached[0] is view:
+                return cached[1]
+            payload = json.dumps(thaw(view), sort_keys=True)
+            digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+            self._digests[id(view)] = (view, digest)
+            return digest
+
+    def clear(self):
+        """Forget all cached configs"""
+        with self._lock:
+            self._configs.clear()
+            self._resolved.clear()
+            self._digests.clear()
+
+
+_registries: Dict[Path, EngineConfigRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(engine_configs_path: Path = Path("engine_configs")) -> EngineConfigRegistry:
+    """Process-wide registry for an engine_configs folder"""
+    key = Path(engine_configs_path).resolve()
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = EngineConfigRegistry(engine_configs_path)
+        return _registries[key]
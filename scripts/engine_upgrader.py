@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Engine Upgrader - In-place engine version upgrades
+Patches only the version-dependent engine files, agents and docs of a
+project and re-renders only agents whose engine guidance changes with
+the version, instead of re-scaffolding it
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from agent_common import STORE_REFERENCE
+from agent_customizer import AgentCustomizer
+from init_project import ProjectInitializer
+
+
+class EngineUpgrader:
+    def __init__(self):
+        self.initializer = ProjectInitializer()
+        self.customizer = AgentCustomizer()
+
+    def engine_matches(self, project_engine: str, engine: str) -> bool:
+        """Compare engine names, treating 'Unreal' and 'Unreal Engine' as the same engine"""
+        return project_engine.lower().replace(" engine", "") == engine.lower().replace(" engine", "")
+
+    def patch_file(self, path: Path, patterns: List[tuple]) -> bool:
+        """Apply (regex, replacement) patterns to a file; write and return True only if it changed"""
+        if not path.exists():
+            return False
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        patched = content
+        for pattern, replacement in patterns:
+            patched = re.sub(pattern, replacement, patched, flags=re.MULTILINE)
+        if patched == content:
+            return False
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(patched)
+        return True
+
+    def patch_engine_files(self, project_path: Path, config: Dict[str, Any], new_version: str) -> List[Path]:
+        """Patch the engine project files that carry the engine version"""
+        engine = config['project']['engine']
+        source_path = self.initializer.get_source_path(project_path, config['project']['name'])
+        changed = []
+
+        if engine == "Godot":
+            project_godot = source_path / "project.godot"
+            features = self.initializer.get_godot_features(new_version)
+            if self.patch_file(project_godot, [(r'^config/features=.*$', lambda _: f"config/features={features}")]):
+                changed.append(project_godot)
+        elif engine == "Unity":
+            version_file = source_path / "ProjectSettings" / "ProjectVersion.txt"
+            content = self.initializer.get_unity_version_file(new_version)
+            if not version_file.exists():
+                version_file.parent.mkdir(parents=True, exist_ok=True)
+                version_file.write_text(content, encoding='utf-8')
+                changed.append(version_file)
+            elif self.patch_file(version_file, [(r'^m_EditorVersion: .*$', lambda _: content.rstrip("\n"))]):
+                changed.append(version_file)
+        elif engine == "Unreal Engine":
+            for uproject_file in sorted(source_path.glob("*.uproject")):
+                if self.patch_file(uproject_file, [(r'("EngineAssociation":\s*)"[^"]*"',
+                                                    lambda m: f'{m.group(1)}"{new_version}"')]):
+                    changed.append(uproject_file)
+        return changed
+
+    def version_sensitive_agents(self, engine: str, old_version: str, new_version: str,
+                                 agent_names: List[str]) -> List[str]:
+        """Agents whose engine section content (not just the version line) differs between versions"""
+        old_config = self.customizer.load_engine_config(engine, old_version)
+        new_config = self.customizer.load_engine_config(engine, new_version)
+        if old_config.get('best_practices') != new_config.get('best_practices'):
+            # Naming conventions are part of every agent's engine section
+            return list(agent_names)
+        old_specializations = old_config.get('agent_specializations', {})
+        new_specializations = new_config.get('agent_specializations', {})
+        return [name for name in agent_names if old_specializations.get(name) != new_specializations.get(name)]
+
+    def regenerate_agents(self, project_path: Path, config: Dict[str, Any], agent_names: List[str]) -> List[Path]:
+        """Re-render the engine section of agents for the config's (already updated) engine version"""
+        agents_path = project_path / "agents"
+        engine_config = self.customizer.load_engine_config(config['project']['engine'],
+                                                           config['project']['engine_version'])
+        changed = []
+        for agent_name in agent_names:
+            agent_file = agents_path / f"{agent_name}.md"
+            before = agent_file.read_text(encoding='utf-8') if agent_file.exists() else None
+            patched = None
+            if before is not None:
+                # Patch just the engine section so the rest of the file is left as it is
+                patched = self.customizer.patch_engine_section(before, agent_name, engine_config, config)
+            if patched is not None:
+                if patched != before:
+                    agent_file.write_text(patched, encoding='utf-8')
+            else:
+                self.customizer.customize_agent(agent_name, agents_path, engine_config, config)
+            if agent_file.exists() and agent_file.read_text(encoding='utf-8') != before:
+                changed.append(agent_file)
+        return changed
+    
+    def thin_agents(self, project_path: Path) -> List[str]:
+        """Agents deduplicated into a thin header over a shared body of the current version"""
+        agents_path = project_path / "agents"
+        if not agents_path.exists():
+            return []
+        return [agent_file.stem for agent_file in sorted(agents_path.glob("*.md"))
+                if STORE_REFERENCE.search(agent_file.read_text(encoding='utf-8'))]
+
+    def patch_agents(self, project_path: Path, engine: str, old_version: str, new_version: str) -> List[Path]:
+        """Patch the version lines of generated agents; agents without them and thin agents are left untouched"""
+        old = re.escape(old_version)
+        patterns = [
+            # Project header of every customized agent and the project orchestrator
+            (rf'^(- \*\*Engine\*\*: {re.escape(engine)} v){old}$', lambda m: f"{m.group(1)}{new_version}"),
+            # Engine section written by create_engine_section
+            (rf'^(\*\*Engine Version\*\*: ){old}$', lambda m: f"{m.group(1)}{new_version}")
+        ]
+        changed = []
+        agents_path = project_path / "agents"
+        if agents_path.exists():
+            thin = self.thin_agents(project_path)
+            for agent_file in sorted(agents_path.glob("*.md")):
+                if agent_file.stem not in thin and self.patch_file(agent_file, patterns):
+                    changed.append(agent_file)
+        return changed
+
+    def patch_docs(self, project_path: Path, engine: str, old_version: str, new_version: str) -> List[Path]:
+        """Patch the engine line of the generated game design document"""
+        gdd_file = project_path / "documentation" / "design" / "gdd.md"
+        pattern = rf'^(\*\*Engine\*\*: {re.escape(engine)} v){re.escape(old_version)}$'
+        if self.patch_file(gdd_file, [(pattern, lambda m: f"{m.group(1)}{new_version}")]):
+            return [gdd_file]
+        return []
+
+    def upgrade_project(self, project_path: Path, new_version: str) -> Optional[Dict[str, Any]]:
+        """Upgrade one project's engine version in place and report what changed"""
+        config_file = project_path / "project-config.json"
+        if not config_file.exists():
+            return None
+
+        with open(config_file, 'r') as f:
+            config = json.load(f)
+
+        engine = config['project'].get('engine', 'Godot')
+        old_version = config['project'].get('engine_version', 'latest')
+        report = {
+            "project": project_path.name,
+            "engine": engine,
+            "from": old_version,
+            "to": new_version,
+            "files": []
+        }
+        if engine == "TBD" or old_version == new_version:
+            return report
+
+        active_agents = config.get('team', {}).get('active_agents', [])
+        regenerate = self.version_sensitive_agents(engine, old_version, new_version, active_agents)
+        # A thin agent's shared body is of the old version, so it is written out in full for the new one
+        # (the next dedup thins it again against a blob of the new version)
+        regenerate += [name for name in self.thin_agents(project_path)
+                       if name in active_agents and name not in regenerate]
+
+        changed = self.patch_engine_files(project_path, config, new_version)
+        changed += self.patch_agents(project_path, engine, old_version, new_version)
+        changed += self.patch_docs(project_path, engine, old_version, new_version)
+
+        config['project']['engine_version'] = new_version
+        with open(config_file, 'w') as f:
+            json.dump(config, f, indent=2)
+        changed.append(config_file)
+
+        # Agents whose engine guidance changes with the version get their engine section re-rendered
+        changed += [path for path in self.regenerate_agents(project_path, config, regenerate) if path not in changed]
+
+        # Upgraded agents are now rendered from the new version; agents left alone keep their entries
+        touched = {path.name for path in changed if path.parent == project_path / "agents"}
+        tasks = self.customizer.project_tasks(project_path, config, verbose=False)
+        self.customizer.update_manifests([task for task in tasks if task[0].name in touched], replace=False)
+        self.customizer.record_config(project_path)
+
+        report["files"] = [str(path.relative_to(project_path)) for path in changed]
+        return report
+
+    def upgrade_fleet(self, base_path: Path, engine: str, new_version: str) -> List[Dict[str, Any]]:
+        """Upgrade every project under base_path that uses the given engine"""
+        reports = []
+        for project_dir in sorted(base_path.iterdir()):
+            config_file = project_dir / "project-config.json"
+            if not config_file.exists():
+                continue
+            with open(config_file, 'r') as f:
+                project_engine = json.load(f).get('project', {}).get('engine', '')
+            if self.engine_matches(project_engine, engine):
+                reports.append(self.upgrade_project(project_dir, new_version))
+        return reports
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Fleet Generator - Creates synthetic project fleets for load testing
+Builds seeded, reproducible projects through the normal initializer and
+customizer code paths
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import argparse
+import io
+import random
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+from agent_customizer import AgentCustomizer
+from doc_writer import DocumentWriter
+from init_project import ProjectInitializer
+
+
+ENGINE_VERSIONS = {
+    "Godot": ["4.4.1", "4.3", "4.2", "3.5.3"],
+    "Unity": ["2023.2", "2022.3", "2021.3"],
+    "Unreal Engine": ["5.3", "5.2", "5.1", "4.27"]
+}
+PLATFORMS = ["PC", "Mobile", "Console", "Web", "VR/AR"]
+AUDIENCES = ["Casual", "Core", "Hardcore", "Kids"]
+MODES = ["design", "development", "prototype"]
+TIMELINES = ["Rapid", "Short", "Medium", "Long"]
+GENRES = ["Action", "Strategy", "Puzzle", "RPG", "Simulation", "Adventure", "Casual"]
+PHASES = ["Market Analysis", "Design", "Development", "Polish", "Launch"]
+STATUSES = ["active"] * 6 + ["paused", "frozen", "completed"]
+COMPETITORS = [
+    "Hades", "Dead Cells", "Celeste", "Hollow Knight", "Stardew Valley", "Slay the Spire",
+    "Terraria", "Into the Breach", "Portal 2", "Monument Valley", "Factorio", "Civilization VI",
+    "Vampire Survivors", "Balatro", "Cult of the Lamb", "Among Us"
+]
+NAME_WORDS = [
+    "Crystal", "Shadow", "Neon", "Iron", "Solar", "Hollow", "Pixel", "Frost", "Ember", "Echo",
+    "Quest", "Forge", "Drift", "Legends", "Tactics", "Garden", "Rift", "Arena", "Voyage", "Tower"
+]
+TELEMETRY_EVENTS = [
+    ("session_start", "Player starts a session", ["platform", "build_version"]),
+    ("session_end", "Player ends a session", ["duration_seconds"]),
+    ("level_complete", "Player finishes a level", ["level_id", "time_seconds", "deaths"]),
+    ("level_fail", "Player fails a level", ["level_id", "cause"]),
+    ("purchase", "In-game purchase completed", ["item_id", "price", "currency"]),
+    ("tutorial_step", "Tutorial step reached", ["step_id"]),
+    ("settings_changed", "Player changes settings", ["setting", "value"]),
+    ("crash", "Client crash reported", ["stack_hash", "device"])
+]
+DOC_FOLDERS = [
+    "documentation/design/systems",
+    "documentation/design/mechanics",
+    "documentation/technical/architecture",
+    "documentation/production/reports",
+    "resources/market-research",
+    "qa/test-plans",
+    "qa/bug-reports"
+]
+LOREM_WORDS = (
+    "player combat loop progression economy balance level enemy reward upgrade skill "
+    "camera input latency frame budget memory texture shader build release milestone "
+    "feedback playtest retention session design system feature scope risk mitigation"
+).split()
+
+
+class FleetGenerator:
+    def __init__(self, seed: int = 0, base_path: Path = Path("projects"),
+                 docs_per_project: int = 5, doc_size_kb: int = 2):
+        self.seed = seed
+        self.base_path = Path(base_path)
+        self.docs_per_project = docs_per_project
+        self.doc_size_kb = doc_size_kb
+        self.initializer = ProjectInitializer()
+        self.initializer.base_path = self.base_path
+        self.customizer = AgentCustomizer()
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def build_config(self, rng: random.Random, index: int) -> Dict[str, Any]:
+        """Build a realistic, seeded project config"""
+        engine = rng.choice(list(ENGINE_VERSIONS))
+        mode = rng.choice(MODES)
+        timeline = rng.choice(TIMELINES)
+        name = f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)} {index:04d}"
+        created = datetime(2026, 1, 1) + timedelta(days=rng.randrange(365), seconds=rng.randrange(86400))
+        milestones = self.initializer.milestone_scheduler.schedule(timeline, mode, created.date())
+        events = rng.sample(TELEMETRY_EVENTS, rng.randint(2, len(TELEMETRY_EVENTS)))
+
+        return {
+            "project": {
+                "name": name,
+                "concept": f"A {rng.choice(GENRES).lower()} game about {' '.join(rng.sample(LOREM_WORDS, 3))}",
+                "genre": rng.choice(GENRES),
+                "platform": rng.choice(PLATFORMS),
+                "audience": rng.choice(AUDIENCES),
+                "timeline": timeline,
+                "engine": engine,
+                "engine_version": rng.choice(ENGINE_VERSIONS[engine]),
+                "mode": mode,
+                "competitors": ", ".join(rng.sample(COMPETITORS, rng.randint(1, 5))),
+                "unique_selling_point": f"Unique {' '.join(rng.sample(LOREM_WORDS, 2))}",
+                "version": "1.0.0",
+                "created": created.isoformat(),
+                "phase": rng.choice(PHASES),
+                "status": rng.choice(STATUSES)
+            },
+            "development_rules": rng.sample([
+                "Follow engine best practices",
+                "Write clean, maintainable code",
+                "Use SOLID principles for all class designs",
+                "Implement object pooling for all projectiles",
+                "Performance: maintain 60 FPS on target hardware",
+                "Memory: stay under 2GB RAM usage"
+            ], rng.randint(1, 4)),
+            "analytics_framework": {
+                "data_scientist": "data_scientist",
+                "telemetry_events": [
+                    {"event_name": event, "description": description, "parameters": list(parameters)}
+                    for event, description, parameters in events
+                ]
+            },
+            "team": {
+                "active_agents": self.initializer.configure_agents({"mode": mode}),
+                "lead_agent": "producer_agent",
+                "orchestrator": "master_orchestrator"
+            },
+            "milestones": milestones,
+            "metrics": {
+                "velocity_target": f"{rng.randint(5, 20)} tasks/week",
+                "bug_threshold": "5 critical, 20 minor",
+                "performance_target": "60 FPS, < 3s load"
+            },
+            "risks": [
+                {
+                    "risk": "Scope creep",
+                    "probability": rng.choice(["Low", "Medium", "High"]),
+                    "impact": "High",
+                    "mitigation": "Strict feature freeze after design phase"
+                }
+            ]
+        }
+
+    def render_doc(self, rng: random.Random, title: str) -> str:
+        """Render a synthetic markdown document of roughly doc_size_kb"""
+        target = self.doc_size_kb * 1024
+        parts = [f"# {title}\n"]
+        size = len(parts[0])
+        section = 1
+        while size < target:
+            words = " ".join(rng.choice(LOREM_WORDS) for _ in range(rng.randint(40, 90)))
+            block = f"\n## Section {section}\n{words.capitalize()}.\n"
+            if section % 3 == 0:
+                block += "- **Owner**: [To be assigned]\n- **Status**: [X%]\n"
+            parts.append(block)
+            size += len(block)
+            section += 1
+        return "".join(parts)
+
+    def generate_project(self, rng: random.Random, index: int,
+                         writer: DocumentWriter) -> Tuple[Path, Dict[str, Any]]:
+        """Create one synthetic project through the initializer code paths"""
+        config = self.build_config(rng, index)
+        project_path = self.initializer.create_project_structure(config['project']['name'],
+                                                                 config['project']['engine'])
+        self.initializer.create_initial_files(project_path, config, writer)
+
+        with writer.generator("synthetic_docs"):
+            for doc_index in range(self.docs_per_project):
+                folder = rng.choice(DOC_FOLDERS)
+                title = f"{config['project']['name']} Notes {doc_index + 1}"
+                writer.add(project_path / folder / f"notes_{doc_index + 1:03d}.md", self.render_doc(rng, title))
+
+        # Agents are written directly by the customizer, so docs must exist first
+        writer.flush()
+        self.customizer.customize_agents_for_project(project_path, config)
+        return project_path, config
+
+    def generate(self, count: int) -> List[Tuple[Path, Dict[str, Any]]]:
+        """Create count projects; the same seed always yields the same fleet"""
+        rng = random.Random(self.seed)
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        writer = DocumentWriter()
+        projects = []
+        with redirect_stdout(io.StringIO()):
+            for index in range(count):
+                projects.append(self.generate_project(rng, index, writer))
+        self.stats = writer.get_stats()
+        return projects
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic project fleet for load testing")
+    parser.add_argument("--count", type=int, default=50, help="Number of projects to create")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (same seed, same fleet)")
+    parser.add_argument("--base-path", type=Path, default=Path("projects"), help="Where to create projects")
+    parser.add_argument("--docs-per-project", type=int, default=5, help="Synthetic docs per project")
+    parser.add_argument("--doc-size-kb", type=int, default=2, help="Approximate size of each synthetic doc")
+    args = parser.parse_args()
+
+    generator = FleetGenerator(args.seed, args.base_path, args.docs_per_project, args.doc_size_kb)
+    started = time.perf_counter()
+    projects = generator.generate(args.count)
+    elapsed = time.perf_counter() - started
+
+    engines: Dict[str, int] = {}
+    for _, config in projects:
+        engines[config['project']['engine']] = engines.get(config['project']['engine'], 0) + 1
+
+    print(f"Generated {len(projects)} projects in {args.base_path} ({elapsed:.2f}s, seed {args.seed})")
+    for engine, count in sorted(engines.items()):
+        print(f"  - {engine}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Handoff Store - Structured agent handoffs with indexed queries
+Keeps the handoffs of templates/handoff_template.md as JSON records in each
+project, indexes them by agent, phase, approval and status, and renders the
+markdown view on demand
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+HANDOFF_DIR = "handoffs"
+# Derived from the records, so it lives in the project's ignored .cache/
+INDEX_FILE = Path(".cache") / "handoff_index.json"
+INDEX_VERSION = 2
+
+APPROVALS = ("pending", "approved", "needs_revision", "rejected")
+STATUSES = ("open", "accepted", "closed")
+# Record fields the index can filter on by equality
+INDEXED_FIELDS = ("from_agent", "to_agent", "phase", "approval", "status")
+
+APPROVAL_LABELS = {
+    "approved": "**APPROVED** - Ready for next phase",
+    "needs_revision": "**NEEDS REVISION** - Changes required (see notes below)",
+    "rejected": "**REJECTED** - Major issues, return to previous agent"
+}
+
+
+def parse_deliverable(text: str) -> Dict[str, Any]:
+    """'Name: description @ location' (description and location optional) as a deliverable"""
+    text, _, location = text.partition("@")
+    name, _, description = text.partition(":")
+    return {"name": name.strip(), "description": description.strip(), "location": location.strip(), "done": False}
+
+
+class HandoffStore:
+    def __init__(self, base_path: Path = Path("projects")):
+        self.base_path = Path(base_path)
+
+    def handoff_path(self, project: str) -> Path:
+        return self.base_path / project / HANDOFF_DIR
+
+    def index_file(self, project: str) -> Path:
+        return self.base_path / project / INDEX_FILE
+
+    def projects(self) -> List[str]:
+        if not self.base_path.exists():
+            return []
+        return sorted(entry.name for entry in os.scandir(self.base_path)
+                      if entry.is_dir() and os.path.exists(os.path.join(entry.path, "project-config.json")))
+
+    def load_config(self, project: str) -> Dict[str, Any]:
+        with open(self.base_path / project / "project-config.json", 'r') as f:
+            return json.load(f)
+
+    def _write_json(self, path: Path, data: Dict[str, Any], **options):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(data, f, **options)
+        os.replace(temp_file, path)
+
+    def record_ids(self, project: str) -> List[str]:
+        try:
+            names = os.listdir(self.handoff_path(project))
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.startswith("HO-") and name.endswith(".json"))
+
+    def record_signatures(self, project: str) -> Dict[str, List[int]]:
+        """[mtime_ns, size] of each record file by handoff id"""
+        try:
+            entries = list(os.scandir(self.handoff_path(project)))
+        except FileNotFoundError:
+            return {}
+        signatures = {}
+        for entry in entries:
+            if entry.name.startswith("HO-") and entry.name.endswith(".json"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                signatures[entry.name[:-5]] = [stat.st_mtime_ns, stat.st_size]
+        return signatures
+
+    def get(self, project: str, handoff_id: str) -> Dict[str, Any]:
+        with open(self.handoff_path(project) / f"{handoff_id}.json", 'r') as f:
+            return json.load(f)
+
+    def index(self, project: str) -> Dict[str, Any]:
+        """A project's index: one row per handoff plus ids by each indexed field's value"""
+        index_file = self.index_file(project)
+        try:
+            with open(index_file, 'r') as f:
+                index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            index = {}
+        if index.get('version') != INDEX_VERSION:
+            index = {"version": INDEX_VERSION, "rows": {}, "files": {},
+                     "by": {field: {} for field in INDEXED_FIELDS}}
+        # Records added, edited or removed behind the store's back (e.g. by git) are re-indexed
+        signatures = self.record_signatures(project)
+        if index['files'] == signatures:
+            return index
+        for handoff_id in set(index['files']) - set(signatures):
+            self._unindex(index, handoff_id)
+        for handoff_id, signature in sorted(signatures.items()):
+            if index['files'].get(handoff_id) != signature:
+                try:
+                    self._index_record(index, self.get(project, handoff_id), signature)
+                except FileNotFoundError:
+                    self._unindex(index, handoff_id)
+        if index['rows'] or self.handoff_path(project).exists():
+            self._write_json(index_file, index, separators=(',', ':'))
+        return index
+
+    def rebuild_index(self, project: str) -> Dict[str, Any]:
+        try:
+            self.index_file(project).unlink()
+        except FileNotFoundError:
+            pass
+        return self.index(project)
+
+    def _unindex(self, index: Dict[str, Any], handoff_id: str):
+        previous = index['rows'].pop(handoff_id, None)
+        index['files'].pop(handoff_id, None)
+        if previous:
+            for field in INDEXED_FIELDS:
+                ids = index['by'][field].get(previous[field], [])
+                if handoff_id in ids:
+                    ids.remove(handoff_id)
+
+    def _index_record(self, index: Dict[str, Any], record: Dict[str, Any], signature: List[int]):
+        handoff_id = record['id']
+        self._unindex(index, handoff_id)
+        index['rows'][handoff_id] = {field: record[field] for field in INDEXED_FIELDS + ("created", "updated")}
+        index['files'][handoff_id] = signature
+        for field in INDEXED_FIELDS:
+            index['by'][field].setdefault(record[field], []).append(handoff_id)
+
+    def save(self, record: Dict[str, Any], exclusive: bool = False) -> Dict[str, Any]:
+        """Write a record and update its project's index (exclusive: FileExistsError if the id is taken)"""
+        project = record['project']
+        index = self.index(project)
+        record_file = self.handoff_path(project) / f"{record['id']}.json"
+        if exclusive:
+            # Linking the finished file claims the id atomically, so concurrent creates cannot share it
+            temp_file = record_file.with_name(f"{record_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            record_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_file, 'w') as f:
+                json.dump(record, f, indent=2)
+            try:
+                os.link(temp_file, record_file)
+            finally:
+                os.unlink(temp_file)
+        else:
+            self._write_json(record_file, record, indent=2)
+        stat = record_file.stat()
+        self._index_record(index, record, [stat.st_mtime_ns, stat.st_size])
+        self._write_json(self.index_file(project), index, separators=(',', ':'))
+        return record
+
+    def create(self, project: str, from_agent: str, to_agent: str, phase: Optional[str] = None,
+               deliverables: Optional[List[Dict[str, Any]]] = None, requirements: Optional[List[str]] = None,
+               notes: str = "", now: Optional[datetime] = None) -> Dict[str, Any]:
+        """New open handoff pending producer approval; both agents must be on the project's team"""
+        config = self.load_config(project)
+        active = config.get('team', {}).get('active_agents', [])
+        for agent in (from_agent, to_agent):
+            if agent not in active:
+                raise ValueError(f"{agent} is not an active agent of {project}")
+        ids = self.record_ids(project)
+        number = int(ids[-1][3:]) + 1 if ids else 1
+        timestamp = (now or datetime.now()).isoformat(timespec='seconds')
+        record = {
+            "id": None,
+            "project": project,
+            "from_agent": from_agent,
+            "to_agent": to_agent,
+            "phase": phase or config.get('project', {}).get('phase', 'unknown'),
+            "approval": "pending",
+            "status": "open",
+            "deliverables": deliverables or [],
+            "requirements": requirements or [],
+            "notes": notes,
+            "created": timestamp,
+            "updated": timestamp
+        }
+        while True:
+            record['id'] = f"HO-{number:04d}"
+            try:
+                return self.save(record, exclusive=True)
+            except FileExistsError:
+                # Another create took this id first
+                number += 1
+
+    def update(self, project: str, handoff_id: str, approval: Optional[str] = None, status: Optional[str] = None,
+               now: Optional[datetime] = None) -> Dict[str, Any]:
+        record = self.get(project, handoff_id)
+        if approval is not None:
+            if approval not in APPROVALS:
+                raise ValueError(f"Unknown approval '{approval}' (one of {', '.join(APPROVALS)})")
+            record['approval'] = approval
+        if status is not None:
+            if status not in STATUSES:
+                raise ValueError(f"Unknown status '{status}' (one of {', '.join(STATUSES)})")
+            record['status'] = status
+        record['updated'] = (now or datetime.now()).isoformat(timespec='seconds')
+        return self.save(record)
+
+    def query(self, projects: Optional[List[str]] = None, older_than_days: Optional[float] = None,
+              now: Optional[datetime] = None, **filters) -> List[Dict[str, Any]]:
+        """Index rows matching every filter (field=value for INDEXED_FIELDS), oldest first"""
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot filter handoffs by {', '.join(sorted(unknown))}")
+        filters = {field: value for field, value in filters.items() if value is not None}
+        cutoff = None
+        if older_than_days is not None:
+            cutoff = ((now or datetime.now()) - timedelta(days=older_than_days)).isoformat(timespec='seconds')
+
+        rows = []
+        for project in projects or self.projects():
+            if not self.index_file(project).exists() and not self.record_ids(project):
+                continue
+            index = self.index(project)
+            ids = None
+            for field, value in filters.items():
+                matching = set(index['by'][field].get(value, []))
+                ids = matching if ids is None else ids & matching
+            for handoff_id in sorted(index['rows'] if ids is None else ids):
+                row = index['rows'][handoff_id]
+                if cutoff is None or row['created'] < cutoff:
+                    rows.append(dict(row, id=handoff_id, project=project))
+        return sorted(rows, key=lambda row: (row['created'], row['project'], row['id']))
+
+    def render(self, record: Dict[str, Any]) -> str:
+        """Markdown view of a handoff in the layout of templates/handoff_template.md"""
+        try:
+            config = self.load_config(record['project'])
+        except FileNotFoundError:
+            config = {}
+        project = config.get('project', {})
+        lines = [
+            f"# Agent Handoff {record['id']}",
+            "*Game Studio Sub-Agents v1.0 Coordination Protocol*",
+            "",
+            "## Handoff Information",
+            f"**From Agent**: {record['from_agent']}  ",
+            f"**To Agent**: {record['to_agent']}  ",
+            f"**Date**: {record['created'][:10]}  ",
+            f"**Project**: {project.get('name', record['project'])}  ",
+            f"**Engine**: {project.get('engine', 'unknown')}  ",
+            f"**Phase**: {record['phase']}  ",
+            f"**Status**: {record['status'].capitalize()}",
+            "",
+            "## Deliverables Transferred"
+        ]
+        for deliverable in record['deliverables']:
+            line = f"- [{'x' if deliverable.get('done') else ' '}] **{deliverable['name']}**"
+            if deliverable.get('description'):
+                line += f": {deliverable['description']}"
+            if deliverable.get('location'):
+                line += f" - {deliverable['location']}"
+            lines.append(line)
+        if not record['deliverables']:
+            lines.append("*None listed*")
+        lines += ["", "## Quality Validation", "### Producer Approval Status"]
+        for approval, label in APPROVAL_LABELS.items():
+            lines.append(f"- [{'x' if record['approval'] == approval else ' '}] {label}")
+        if record['approval'] == "pending":
+            lines.append("*Awaiting producer review*")
+        if record['requirements']:
+            lines += ["", "## Key Requirements for Next Agent", "### Must Implement"]
+            lines += [f"{number}. {requirement}" for number, requirement in enumerate(record['requirements'], 1)]
+        if record['notes']:
+            lines += ["", "## Context and Background", record['notes']]
+        return "\n".join(lines) + "\n"
@@ -11,15 +11,18 @@ License: MIT
 import os
 import json
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from agent_customizer import AgentCustomizer
+from milestone_scheduler import MilestoneScheduler
+from doc_writer import DocumentWriter
 
 
 class ProjectInitializer:
     def __init__(self):
         self.base_path = Path("projects")
         self.project_config = {}
+        self.milestone_scheduler = MilestoneScheduler()
         
     def create_project_structure(self, project_name, engine="Godot"):
         """Create the complete project folder structure"""
@@ -31,7 +34,7 @@ class ProjectInitializer:
         # Engine-specific directory structure
         if engine == "Unity":
             directories = self.get_unity_structure(project_name)
-        elif engine == "Unreal":
+        elif engine in ("Unreal", "Unreal Engine"):
             directories = self.get_unreal_structure(project_name)
         else:  # Godot default
             directories = self.get_godot_structure(project_name)
@@ -125,21 +128,23 @@ class ProjectInitializer:
             f"{folder_name}/Config"
         ]
     
-    def create_market_analysis_docs(self, project_path, config):
+    def create_market_analysis_docs(self, project_path, config, writer=None):
         """Create market analysis documentation for competitor research"""
+        owns_writer = writer is None
+        writer = writer or DocumentWriter()
         market_research_path = project_path / "resources" / "market-research"
-        market_research_path.mkdir(exist_ok=True, parents=True)
+        analysis_date = config['project'].get('created', '')[:10] or datetime.now().strftime('%Y-%m-%d')
         
-        # Create competitor analysis template
-        competitors = config['project'].get('competitors', '').split(',')
-        for competitor in competitors:
-            if competitor.strip():
-                competitor_file = market_research_path / f"competitor_{competitor.strip().lower().replace(' ', '_')}.md"
-                competitor_content = f"""# Competitor Analysis: {competitor.strip()}
+        with writer.generator("market_research"):
+            # Create competitor analysis template
+            competitors = [c.strip() for c in config['project'].get('competitors', '').split(',') if c.strip()]
+            for competitor in competitors:
+                competitor_file = market_research_path / f"competitor_{competitor.lower().replace(' ', '_')}.md"
+                competitor_content = f"""# Competitor Analysis: {competitor}
 
 ## Overview
-**Game Name**: {competitor.strip()}
-**Analysis Date**: {datetime.now().strftime('%Y-%m-%d')}
+**Game Name**: {competitor}
+**Analysis Date**: {analysis_date}
 **Analyst**: Market Analyst Agent
 
 ## Market Position
@@ -190,12 +195,11 @@ class ProjectInitializer:
 - [Opportunity 2]
 - [Opportunity 3]
 """
-                with open(competitor_file, 'w') as f:
-                    f.write(competitor_content)
+                writer.add(competitor_file, competitor_content)
         
-        # Create market overview document
-        market_overview_file = market_research_path / "market_overview.md"
-        market_overview_content = f"""# Market Overview: {config['project']['genre']} Games
+            # Create market overview document
+            market_overview_file = market_research_path / "market_overview.md"
+            market_overview_content = f"""# Market Overview: {config['project']['genre']} Games
 
 ## Project Context
 **Our Game**: {config['project']['name']}
@@ -254,23 +258,28 @@ class ProjectInitializer:
 - [ ] Set realistic performance targets
 - [ ] Plan go-to-market strategy
 """
-        with open(market_overview_file, 'w') as f:
-            f.write(market_overview_content)
+            writer.add(market_overview_file, market_overview_content)
+        
+        if owns_writer:
+            writer.flush()
     
-    def create_initial_files(self, project_path, config):
+    def create_initial_files(self, project_path, config, writer=None):
         """Create initial project files"""
+        owns_writer = writer is None
+        writer = writer or DocumentWriter()
         
         # Project configuration
-        config_file = project_path / "project-config.json"
-        with open(config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        with writer.generator("project_config"):
+            config_file = project_path / "project-config.json"
+            writer.add(config_file, json.dumps(config, indent=2))
         
         # Create market analysis documents for producer
-        self.create_market_analysis_docs(project_path, config)
+        self.create_market_analysis_docs(project_path, config, writer)
         
         # Game Design Document template
-        gdd_file = project_path / "documentation/design/gdd.md"
-        gdd_content = f"""# {config['project']['name']} - Game Design Document
+        with writer.generator("gdd"):
+            gdd_file = project_path / "documentation/design/gdd.md"
+            gdd_content = f"""# {config['project']['name']} - Game Design Document
 
 ## Overview
 **Concept**: {config['project']['concept']}
@@ -313,13 +322,13 @@ class ProjectInitializer:
 - [Metric 2]
 - [Metric 3]
 """
-        with open(gdd_file, 'w') as f:
-            f.write(gdd_content)
+            writer.add(gdd_file, gdd_content)
         
         # README for project folder
-        folder_name = f"source/project-{config['project']['name'].lower().replace(' ', '-')}"
-        readme_file = project_path / folder_name / "README.md"
-        readme_content = f"""# {config['project']['name']} - Source Code
+        with writer.generator("readme"):
+            folder_name = f"source/project-{config['project']['name'].lower().replace(' ', '-')}"
+            readme_file = project_path / folder_name / "README.md"
+            readme_content = f"""# {config['project']['name']} - Source Code
 
 ## Engine: {config['project']['engine']}
 
@@ -345,35 +354,35 @@ class ProjectInitializer:
 ## Current Phase
 {config['project'].get('phase', 'Initialization')}
 """
-        with open(readme_file, 'w') as f:
-            f.write(readme_content)
+            writer.add(readme_file, readme_content)
         
         # Timeline
-        timeline_file = project_path / "documentation/production/timeline.md"
-        timeline_content = f"""# {config['project']['name']} - Production Timeline
+        with writer.generator("timeline"):
+            timeline_file = project_path / "documentation/production/timeline.md"
+            timeline_content = f"""# {config['project']['name']} - Production Timeline
 
 ## Project Timeline: {config['project']['timeline']}
 
 ## Milestones
 """
-        for milestone in config['milestones']:
-            timeline_content += f"""
+            for milestone in config['milestones']:
+                timeline_content += f"""
 ### {milestone['name']} - {milestone['target_date']}
 **Deliverables**:
 """
-            for deliverable in milestone['deliverables']:
-                timeline_content += f"- {deliverable}\n"
+                for deliverable in milestone['deliverables']:
+                    timeline_content += f"- {deliverable}\n"
             
-            timeline_content += "\n**Success Criteria**:\n"
-            for criteria in milestone['success_criteria']:
-                timeline_content += f"- {criteria}\n"
+                timeline_content += "\n**Success Criteria**:\n"
+                for criteria in milestone['success_criteria']:
+                    timeline_content += f"- {criteria}\n"
         
-        with open(timeline_file, 'w') as f:
-            f.write(timeline_content)
+            writer.add(timeline_file, timeline_content)
             
         # Create .gitignore
-        gitignore_file = project_path / ".gitignore"
-        gitignore_content = """# Builds
+        with writer.generator("gitignore"):
+            gitignore_file = project_path / ".gitignore"
+            gitignore_content = """# Builds
 builds/
 *.exe
 *.app
@@ -405,35 +414,34 @@ Build/
 *.log
 logs/
 """
-        with open(gitignore_file, 'w') as f:
-            f.write(gitignore_content)
+            writer.add(gitignore_file, gitignore_content)
         
         # Create engine-specific files with project name and version
         engine = config['project']['engine']
         engine_version = config['project'].get('engine_version', 'latest')
         project_name = config['project']['name']
-        self.create_engine_files(project_path, engine, project_name, engine_version)
+        self.create_engine_files(project_path, engine, project_name, engine_version, writer)
+        
+        if owns_writer:
+            writer.flush()
     
-    def create_engine_files(self, project_path, engine, project_name=None, engine_version=None):
+    def create_engine_files(self, project_path, engine, project_name=None, engine_version=None, writer=None):
         """Create engine-specific configuration files"""
+        owns_writer = writer is None
+        writer = writer or DocumentWriter()
+        
         # Create project folder under source with proper name
-        if project_name:
-            source_path = project_path / "source" / f"project-{project_name.lower().replace(' ', '-')}"
-        else:
-            source_path = project_path / "source" / f"project-{project_path.name}"
+        source_path = self.get_source_path(project_path, project_name)
         source_path.mkdir(exist_ok=True, parents=True)
         
-        if engine == "Godot":
-            # Create project.godot file
-            project_godot = source_path / "project.godot"
-            # Use appropriate version settings
-            version_string = engine_version if engine_version else "4.4"
-            if version_string.startswith("3."):
-                features_string = f'PackedStringArray("{version_string}", "GLES3")'
-            else:
-                features_string = f'PackedStringArray("{version_string}", "Forward Plus")'
+        with writer.generator("engine_files"):
+            if engine == "Godot":
+                # Create project.godot file
+                project_godot = source_path / "project.godot"
+                # Use appropriate version settings
+                features_string = self.get_godot_features(engine_version)
             
-            project_content = f"""[application]
+                project_content = f"""[application]
 
 config/name="{project_name if project_name else project_path.name}"
 config/features={features_string}
@@ -443,19 +451,22 @@ config/icon="res://icon.svg"
 
 renderer/rendering_method="forward_plus"
 """
-            with open(project_godot, 'w') as f:
-                f.write(project_content)
+                writer.add(project_godot, project_content)
                 
-        elif engine == "Unity":
-            # Create basic Unity project structure with project name
-            unity_project_path = source_path
-            project_settings = unity_project_path / "ProjectSettings" / "ProjectSettings.asset"
-            project_settings.parent.mkdir(exist_ok=True, parents=True)
+            elif engine == "Unity":
+                # Create basic Unity project structure with project name
+                unity_project_path = source_path
+                project_settings = unity_project_path / "ProjectSettings" / "ProjectSettings.asset"
+                project_settings.parent.mkdir(exist_ok=True, parents=True)
+            
+                packages_manifest = source_path / "Packages" / "manifest.json"
+                packages_manifest.parent.mkdir(exist_ok=True, parents=True)
             
-            packages_manifest = source_path / "Packages" / "manifest.json"
-            packages_manifest.parent.mkdir(exist_ok=True, parents=True)
+                # Record the editor version the project targets
+                if engine_version:
+                    writer.add(project_settings.parent / "ProjectVersion.txt", self.get_unity_version_file(engine_version))
             
-            manifest_content = """{
+                manifest_content = """{
   "dependencies": {
     "com.unity.collab-proxy": "2.0.5",
     "com.unity.feature.development": "1.0.1",
@@ -501,16 +512,15 @@ renderer/rendering_method="forward_plus"
     "com.unity.modules.xr": "1.0.0"
   }
 }"""
-            with open(packages_manifest, 'w') as f:
-                f.write(manifest_content)
+                writer.add(packages_manifest, manifest_content)
                 
-        elif engine == "Unreal Engine":
-            # Create .uproject file with proper project name
-            project_file_name = project_name.replace(" ", "") if project_name else project_path.name
-            uproject_file = source_path / f"{project_file_name}.uproject"
-            uproject_content = f"""{{
+            elif engine == "Unreal Engine":
+                # Create .uproject file with proper project name
+                project_file_name = project_name.replace(" ", "") if project_name else project_path.name
+                uproject_file = source_path / f"{project_file_name}.uproject"
+                uproject_content = f"""{{
 	"FileVersion": 3,
-	"EngineAssociation": "5.3",
+	"EngineAssociation": "{engine_version if engine_version else '5.3'}",
 	"Category": "",
 	"Description": "",
 	"Modules": [
@@ -530,8 +540,27 @@ renderer/rendering_method="forward_plus"
 		}}
 	]
 }}"""
-            with open(uproject_file, 'w') as f:
-                f.write(uproject_content)
+                writer.add(uproject_file, uproject_content)
+        
+        if owns_writer:
+            writer.flush()
+    
+    def get_source_path(self, project_path, project_name=None):
+        """Engine project folder under source/"""
+        if project_name:
+            return project_path / "source" / f"project-{project_name.lower().replace(' ', '-')}"
+        return project_path / "source" / f"project-{project_path.name}"
+    
+    def get_godot_features(self, engine_version=None):
+        """Godot config/features value for an engine version"""
+        version_string = engine_version if engine_version else "4.4"
+        if version_string.startswith("3."):
+            return f'PackedStringArray("{version_string}", "GLES3")'
+        return f'PackedStringArray("{version_string}", "Forward Plus")'
+    
+    def get_unity_version_file(self, engine_version):
+        """Content of Unity's ProjectSettings/ProjectVersion.txt"""
+        return f"m_EditorVersion: {engine_version}\n"
     
     def configure_agents(self, project_details):
         """Determine which agents to activate based on project needs"""
@@ -569,82 +598,7 @@ renderer/rendering_method="forward_plus"
     
     def calculate_milestones(self, timeline, mode):
         """Generate milestone schedule based on timeline and mode"""
-        milestones = []
-        today = datetime.now()
-        
-        if mode == 'design':
-            if timeline == 'Rapid':
-                milestones = [
-                    {
-                        "name": "Concept Complete",
-                        "target_date": (today + timedelta(days=2)).strftime("%Y-%m-%d"),
-                        "deliverables": ["Core concept", "Design pillars", "Target audience analysis"],
-                        "success_criteria": ["Concept validated", "Scope defined"]
-                    },
-                    {
-                        "name": "Design Documentation",
-                        "target_date": (today + timedelta(days=5)).strftime("%Y-%m-%d"),
-                        "deliverables": ["Complete GDD", "Art style guide", "Technical assessment"],
-                        "success_criteria": ["All systems documented", "Feasibility confirmed"]
-                    }
-                ]
-            elif timeline == 'Short':
-                weeks = 3
-                milestones = [
-                    {
-                        "name": "Concept Phase",
-                        "target_date": (today + timedelta(weeks=1)).strftime("%Y-%m-%d"),
-                        "deliverables": ["Game concept", "Market research", "Competitive analysis"],
-                        "success_criteria": ["Unique value proposition", "Target audience defined"]
-                    },
-                    {
-                        "name": "Systems Design",
-                        "target_date": (today + timedelta(weeks=2)).strftime("%Y-%m-%d"),
-                        "deliverables": ["Core systems", "Gameplay mechanics", "Progression design"],
-                        "success_criteria": ["All systems mapped", "Dependencies identified"]
-                    },
-                    {
-                        "name": "Complete Documentation",
-                        "target_date": (today + timedelta(weeks=3)).strftime("%Y-%m-%d"),
-                        "deliverables": ["Full GDD", "Art bible", "Technical specifications"],
-                        "success_criteria": ["Ready for development", "All questions answered"]
-                    }
-                ]
-        
-        elif mode == 'development':
-            if timeline == 'Short':
-                milestones = [
-                    {
-                        "name": "Prototype",
-                        "target_date": (today + timedelta(weeks=1)).strftime("%Y-%m-%d"),
-                        "deliverables": ["Core mechanic", "Basic controls", "Placeholder art"],
-                        "success_criteria": ["Playable prototype", "Core loop validated"]
-                    },
-                    {
-                        "name": "Alpha",
-                        "target_date": (today + timedelta(weeks=2)).strftime("%Y-%m-%d"),
-                        "deliverables": ["All features", "Programmer art", "Basic UI"],
-                        "success_criteria": ["Feature complete", "Internally playable"]
-                    },
-                    {
-                        "name": "Beta",
-                        "target_date": (today + timedelta(weeks=3)).strftime("%Y-%m-%d"),
-                        "deliverables": ["Polished gameplay", "Final art", "Sound integrated"],
-                        "success_criteria": ["No critical bugs", "Performance targets met"]
-                    },
-                    {
-                        "name": "Release",
-                        "target_date": (today + timedelta(weeks=4)).strftime("%Y-%m-%d"),
-                        "deliverables": ["Final build", "Marketing materials", "Distribution ready"],
-                        "success_criteria": ["Ship ready", "All platforms tested"]
-                    }
-                ]
-            elif timeline == 'Medium':
-                months = 2
-                # Add more detailed milestones for medium timeline
-                pass
-        
-        return milestones
+        return self.milestone_scheduler.schedule(timeline, mode)
     
     def initialize_project(self):
         """Main initialization flow"""
@@ -824,7 +778,10 @@ renderer/rendering_method="forward_plus"
         
         # Create initial files
         print("Creating initial documentation...")
-        self.create_initial_files(project_path, config)
+        doc_writer = DocumentWriter()
+        self.create_initial_files(project_path, config, doc_writer)
+        doc_writer.flush()
+        doc_writer.print_stats()
         
         # Create customized agents for this project
         print("Creating project-specific agents...")
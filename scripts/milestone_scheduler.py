@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Milestone Scheduler - Data-driven milestone generation
+Builds milestone schedules from phase-duration tables and reschedules
+many projects at once
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure Python path gives identical dates
+    np = None
+
+
+DATE_FORMAT = "%Y-%m-%d"
+
+# Phase-duration tables: mode -> timeline -> ordered milestones.
+# "days" is the duration of the milestone once its dependencies are met.
+# A milestone without "depends_on" follows the previous entry in the list.
+PHASE_TABLES: Dict[str, Dict[str, List[Dict[str, Any]]]] = {
+    "design": {
+        "Rapid": [
+            {"name": "Concept Complete", "days": 2,
+             "deliverables": ["Core concept", "Design pillars", "Target audience analysis"],
+             "success_criteria": ["Concept validated", "Scope defined"]},
+            {"name": "Design Documentation", "days": 3,
+             "deliverables": ["Complete GDD", "Art style guide", "Technical assessment"],
+             "success_criteria": ["All systems documented", "Feasibility confirmed"]},
+        ],
+        "Short": [
+            {"name": "Concept Phase", "days": 7,
+             "deliverables": ["Game concept", "Market research", "Competitive analysis"],
+             "success_criteria": ["Unique value proposition", "Target audience defined"]},
+            {"name": "Systems Design", "days": 7,
+             "deliverables": ["Core systems", "Gameplay mechanics", "Progression design"],
+             "success_criteria": ["All systems mapped", "Dependencies identified"]},
+            {"name": "Complete Documentation", "days": 7,
+             "deliverables": ["Full GDD", "Art bible", "Technical specifications"],
+             "success_criteria": ["Ready for development", "All questions answered"]},
+        ],
+        "Medium": [
+            {"name": "Concept Phase", "days": 14,
+             "deliverables": ["Game concept", "Market research", "Competitive analysis"],
+             "success_criteria": ["Unique value proposition", "Target audience defined"]},
+            {"name": "Systems Design", "days": 21,
+             "deliverables": ["Core systems", "Gameplay mechanics", "Progression design"],
+             "success_criteria": ["All systems mapped", "Dependencies identified"]},
+            {"name": "Art Direction", "days": 21, "depends_on": ["Concept Phase"],
+             "deliverables": ["Mood boards", "Style frames", "Art style guide"],
+             "success_criteria": ["Visual identity approved", "Style consistent with pillars"]},
+            {"name": "Complete Documentation", "days": 14,
+             "depends_on": ["Systems Design", "Art Direction"],
+             "deliverables": ["Full GDD", "Art bible", "Technical specifications"],
+             "success_criteria": ["Ready for development", "All questions answered"]},
+        ],
+        "Long": [
+            {"name": "Concept Phase", "days": 21,
+             "deliverables": ["Game concept", "Market research", "Competitive analysis"],
+             "success_criteria": ["Unique value proposition", "Target audience defined"]},
+            {"name": "Market Validation", "days": 14,
+             "deliverables": ["Audience surveys", "Competitor deep dives", "Go/No-Go report"],
+             "success_criteria": ["Market opportunity confirmed", "Positioning agreed"]},
+            {"name": "Systems Design", "days": 28,
+             "deliverables": ["Core systems", "Gameplay mechanics", "Progression design"],
+             "success_criteria": ["All systems mapped", "Dependencies identified"]},
+            {"name": "Art Direction", "days": 28, "depends_on": ["Market Validation"],
+             "deliverables": ["Mood boards", "Style frames", "Art style guide"],
+             "success_criteria": ["Visual identity approved", "Style consistent with pillars"]},
+            {"name": "Content Design", "days": 21, "depends_on": ["Systems Design"],
+             "deliverables": ["Level outlines", "Economy tables", "Narrative beats"],
+             "success_criteria": ["Content scoped", "Balancing targets set"]},
+            {"name": "Complete Documentation", "days": 14,
+             "depends_on": ["Content Design", "Art Direction"],
+             "deliverables": ["Full GDD", "Art bible", "Technical specifications"],
+             "success_criteria": ["Ready for development", "All questions answered"]},
+        ],
+    },
+    "prototype": {
+        "Rapid": [
+            {"name": "Core Mechanic", "days": 3,
+             "deliverables": ["Core mechanic", "Basic controls", "Placeholder art"],
+             "success_criteria": ["Mechanic testable", "Controls responsive"]},
+            {"name": "Playable Prototype", "days": 3,
+             "deliverables": ["Playable build", "Test notes"],
+             "success_criteria": ["Core loop validated", "Go/No-Go decision"]},
+        ],
+        "Short": [
+            {"name": "Core Mechanic", "days": 7,
+             "deliverables": ["Core mechanic", "Basic controls", "Placeholder art"],
+             "success_criteria": ["Mechanic testable", "Controls responsive"]},
+            {"name": "Playable Prototype", "days": 7,
+             "deliverables": ["Playable build", "Core loop", "Debug tools"],
+             "success_criteria": ["Core loop validated", "Stable build"]},
+            {"name": "Playtest Review", "days": 7,
+             "deliverables": ["Playtest sessions", "Feedback report", "Iteration plan"],
+             "success_criteria": ["Fun factor confirmed", "Go/No-Go decision"]},
+        ],
+        "Medium": [
+            {"name": "Core Mechanic", "days": 14,
+             "deliverables": ["Core mechanic", "Basic controls", "Placeholder art"],
+             "success_criteria": ["Mechanic testable", "Controls responsive"]},
+            {"name": "Playable Prototype", "days": 21,
+             "deliverables": ["Playable build", "Core loop", "Debug tools"],
+             "success_criteria": ["Core loop validated", "Stable build"]},
+            {"name": "Playtest Review", "days": 14,
+             "deliverables": ["Playtest sessions", "Telemetry review", "Feedback report"],
+             "success_criteria": ["Fun factor confirmed", "Key metrics captured"]},
+            {"name": "Iterated Prototype", "days": 14,
+             "deliverables": ["Tuned mechanics", "Iteration report"],
+             "success_criteria": ["Feedback addressed", "Go/No-Go decision"]},
+        ],
+        "Long": [
+            {"name": "Core Mechanic", "days": 21,
+             "deliverables": ["Core mechanic", "Basic controls", "Placeholder art"],
+             "success_criteria": ["Mechanic testable", "Controls responsive"]},
+            {"name": "Playable Prototype", "days": 28,
+             "deliverables": ["Playable build", "Core loop", "Debug tools"],
+             "success_criteria": ["Core loop validated", "Stable build"]},
+            {"name": "Playtest Review", "days": 21,
+             "deliverables": ["Playtest sessions", "Telemetry review", "Feedback report"],
+             "success_criteria": ["Fun factor confirmed", "Key metrics captured"]},
+            {"name": "Iterated Prototype", "days": 21,
+             "deliverables": ["Tuned mechanics", "Iteration report"],
+             "success_criteria": ["Feedback addressed", "Stable build"]},
+            {"name": "Vertical Slice", "days": 28,
+             "deliverables": ["Representative level", "Target-quality art sample"],
+             "success_criteria": ["Production quality bar set", "Go/No-Go decision"]},
+        ],
+    },
+    "development": {
+        "Rapid": [
+            {"name": "Prototype", "days": 2,
+             "deliverables": ["Core mechanic", "Basic controls", "Placeholder art"],
+             "success_criteria": ["Playable prototype", "Core loop validated"]},
+            {"name": "Release", "days": 5,
+             "deliverables": ["Final build", "Distribution ready"],
+             "success_criteria": ["Ship ready", "No critical bugs"]},
+        ],
+        "Short": [
+            {"name": "Prototype", "days": 7,
+             "deliverables": ["Core mechanic", "Basic controls", "Placeholder art"],
+             "success_criteria": ["Playable prototype", "Core loop validated"]},
+            {"name": "Alpha", "days": 7,
+             "deliverables": ["All features", "Programmer art", "Basic UI"],
+             "success_criteria": ["Feature complete", "Internally playable"]},
+            {"name": "Beta", "days": 7,
+             "deliverables": ["Polished gameplay", "Final art", "Sound integrated"],
+             "success_criteria": ["No critical bugs", "Performance targets met"]},
+            {"name": "Release", "days": 7,
+             "deliverables": ["Final build", "Marketing materials", "Distribution ready"],
+             "success_criteria": ["Ship ready", "All platforms tested"]},
+        ],
+        "Medium": [
+            {"name": "Prototype", "days": 14,
+             "deliverables": ["Core mechanic", "Basic controls", "Placeholder art"],
+             "success_criteria": ["Playable prototype", "Core loop validated"]},
+            {"name": "Vertical Slice", "days": 14,
+             "deliverables": ["Representative level", "Target-quality art sample"],
+             "success_criteria": ["Production quality bar set", "Pipeline validated"]},
+            {"name": "Alpha", "days": 21,
+             "deliverables": ["All features", "Programmer art", "Basic UI"],
+             "success_criteria": ["Feature complete", "Internally playable"]},
+            {"name": "Beta", "days": 21,
+             "deliverables": ["Polished gameplay", "Final art", "Sound integrated"],
+             "success_criteria": ["No critical bugs", "Performance targets met"]},
+            {"name": "Release", "days": 14,
+             "deliverables": ["Final build", "Marketing materials", "Distribution ready"],
+             "success_criteria": ["Ship ready", "All platforms tested"]},
+        ],
+        "Long": [
+            {"name": "Prototype", "days": 21,
+             "deliverables": ["Core mechanic", "Basic controls", "Placeholder art"],
+             "success_criteria": ["Playable prototype", "Core loop validated"]},
+            {"name": "Vertical Slice", "days": 28,
+             "deliverables": ["Representative level", "Target-quality art sample"],
+             "success_criteria": ["Production quality bar set", "Pipeline validated"]},
+            {"name": "Art Bible", "days": 21, "depends_on": ["Prototype"],
+             "deliverables": ["Art bible", "Asset specifications", "Style guide"],
+             "success_criteria": ["Art direction locked", "Asset budgets defined"]},
+            {"name": "Alpha", "days": 42, "depends_on": ["Vertical Slice", "Art Bible"],
+             "deliverables": ["All features", "First-pass art", "Basic UI"],
+             "success_criteria": ["Feature complete", "Internally playable"]},
+            {"name": "Beta", "days": 42,
+             "deliverables": ["Polished gameplay", "Final art", "Sound integrated"],
+             "success_criteria": ["No critical bugs", "Performance targets met"]},
+            {"name": "Release", "days": 28,
+             "deliverables": ["Final build", "Marketing materials", "Distribution ready"],
+             "success_criteria": ["Ship ready", "All platforms tested"]},
+        ],
+    },
+}
+
+
+class MilestoneScheduler:
+    def __init__(self, phase_tables: Optional[Dict[str, Dict[str, List[Dict[str, Any]]]]] = None):
+        self.phase_tables = phase_tables if phase_tables is not None else PHASE_TABLES
+        self._offset_cache: Dict[Tuple[str, str], List[int]] = {}
+
+    def get_phases(self, timeline: str, mode: str) -> List[Dict[str, Any]]:
+        """Return the phase table for a mode and timeline"""
+        return self.phase_tables.get(mode, {}).get(timeline, [])
+
+    def resolve_dependencies(self, phases: List[Dict[str, Any]]) -> List[List[str]]:
+        """Return the explicit dependency list of every phase"""
+        dependencies = []
+        for index, phase in enumerate(phases):
+            if 'depends_on' in phase:
+                dependencies.append(list(phase['depends_on']))
+            elif index > 0:
+                dependencies.append([phases[index - 1]['name']])
+            else:
+                dependencies.append([])
+        return dependencies
+
+    def compute_offsets(self, timeline: str, mode: str) -> List[int]:
+        """Compute each milestone's day offset from the project start"""
+        key = (mode, timeline)
+        if key in self._offset_cache:
+            return self._offset_cache[key]
+
+        phases = self.get_phases(timeline, mode)
+        dependencies = self.resolve_dependencies(phases)
+        index_by_name = {phase['name']: i for i, phase in enumerate(phases)}
+        offsets: List[Optional[int]] = [None] * len(phases)
+
+        def resolve(i: int, visiting: set) -> int:
+            if offsets[i] is not None:
+                return offsets[i]
+            if i in visiting:
+                raise ValueError(f"Dependency cycle at milestone '{phases[i]['name']}' ({mode}/{timeline})")
+            visiting.add(i)
+            start = 0
+            for dependency in dependencies[i]:
+                if dependency not in index_by_name:
+                    raise ValueError(f"Unknown dependency '{dependency}' for milestone '{phases[i]['name']}'")
+                start = max(start, resolve(index_by_name[dependency], visiting))
+            visiting.discard(i)
+            offsets[i] = start + phases[i]['days']
+            return offsets[i]
+
+        for i in range(len(phases)):
+            resolve(i, set())
+
+        self._offset_cache[key] = offsets
+        return offsets
+
+    def build_milestones(self, timeline: str, mode: str, target_dates: List[str]) -> List[Dict[str, Any]]:
+        """Assemble milestone dictionaries for already computed target dates"""
+        phases = self.get_phases(timeline, mode)
+        dependencies = self.resolve_dependencies(phases)
+        return [
+            {
+                "name": phase['name'],
+                "target_date": target_date,
+                "depends_on": depends_on,
+                "deliverables": list(phase['deliverables']),
+                "success_criteria": list(phase['success_criteria'])
+            }
+            for phase, depends_on, target_date in zip(phases, dependencies, target_dates)
+        ]
+
+    def schedule(self, timeline: str, mode: str, start: Optional[date] = None) -> List[Dict[str, Any]]:
+        """Generate the milestone schedule for a single project"""
+        start = start or datetime.now().date()
+        offsets = self.compute_offsets(timeline, mode)
+        target_dates = [(start + timedelta(days=offset)).strftime(DATE_FORMAT) for offset in offsets]
+        return self.build_milestones(timeline, mode, target_dates)
+
+    def schedule_many(self, requests: List[Tuple[str, str, date]]) -> List[List[Dict[str, Any]]]:
+        """Generate schedules for many (timeline, mode, start) requests at once"""
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, (timeline, mode, _) in enumerate(requests):
+            groups.setdefault((timeline, mode), []).append(index)
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in requests]
+        for (timeline, mode), indices in groups.items():
+            offsets = self.compute_offsets(timeline, mode)
+            if not offsets:
+                continue
+            starts = [requests[i][2] for i in indices]
+            if np is not None:
+                # One broadcast add produces every date of every project in the group
+                start_array = np.array([s.isoformat() for s in starts], dtype='datetime64[D]')
+                matrix = start_array[:, None] + np.array(offsets, dtype='timedelta64[D]')[None, :]
+                rows = np.datetime_as_string(matrix, unit='D').tolist()
+            else:
+                rows = [[(s + timedelta(days=offset)).isoformat() for offset in offsets] for s in starts]
+            for i, row in zip(indices, rows):
+                results[i] = self.build_milestones(timeline, mode, row)
+        return results
+
+    def shift_deadlines(self, milestone_lists: List[List[Dict[str, Any]]],
+                        from_date: date, days: int,
+                        skipped: Optional[List[Dict[str, Any]]] = None) -> int:
+        """Push every deadline on or after from_date back by a number of days.
+
+        Shifting all later deadlines by the same amount keeps every milestone
+        after its dependencies. Milestone lists are updated in place and the
+        number of moved deadlines is returned. Milestones whose target_date is
+        not a YYYY-MM-DD date are left unchanged and appended to skipped.
+        """
+        flat = []
+        current_dates = []
+        for milestone in (m for milestones in milestone_lists for m in milestones if m.get('target_date')):
+            try:
+                current_dates.append(datetime.strptime(milestone['target_date'], DATE_FORMAT).date())
+            except (TypeError, ValueError):
+                if skipped is not None:
+                    skipped.append(milestone)
+                continue
+            flat.append(milestone)
+        if not flat or days == 0:
+            return 0
+
+        if np is not None:
+            dates = np.array([d.isoformat() for d in current_dates], dtype='datetime64[D]')
+            affected = dates >= np.datetime64(from_date.isoformat(), 'D')
+            shifted = np.datetime_as_string(dates + affected * np.timedelta64(days, 'D'), unit='D').tolist()
+            moved = int(affected.sum())
+        else:
+            shifted = []
+            moved = 0
+            for current in current_dates:
+                if current >= from_date:
+                    current += timedelta(days=days)
+                    moved += 1
+                shifted.append(current.isoformat())
+
+        for milestone, new_date in zip(flat, shifted):
+            milestone['target_date'] = new_date
+        return moved
+
+
+if __name__ == "__main__":
+    scheduler = MilestoneScheduler()
+    for mode, timelines in PHASE_TABLES.items():
+        for timeline in timelines:
+            print(f"{mode}/{timeline}:")
+            for milestone in scheduler.schedule(timeline, mode):
+                print(f"  - {milestone['name']}: {milestone['target_date']}")
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Orchestration Engine - Runs a project's agent workflow as a task DAG
+Turns the workflows in master_orchestrator.md into agent tasks, runs
+independent tasks concurrently through a pluggable backend, persists task
+state so interrupted runs resume, and reports critical-path timing
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import json
+import os
+import re
+import shlex
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional
+
+from transcript_store import TranscriptStore
+
+
+STATE_DIR = Path(".cache") / "orchestration"
+STATE_VERSION = 1
+
+# Every active agent of the project
+ALL_AGENTS = "*"
+
+# Workflows from master_orchestrator.md: mode -> ordered stages.
+# A stage without "depends_on" follows the previous stage in the list.
+WORKFLOWS: Dict[str, List[Dict[str, Any]]] = {
+    "design": [
+        {"name": "Market Analysis", "agents": ["market_analyst"]},
+        {"name": "Concept", "agents": ["producer_agent", "sr_game_designer", "market_analyst"]},
+        {"name": "Systems", "agents": ["sr_game_designer", "mid_game_designer", "data_scientist"]},
+        {"name": "Visual", "agents": ["sr_game_artist", "market_analyst"], "depends_on": ["Concept"]},
+        {"name": "Documentation", "depends_on": ["Systems", "Visual"],
+         "agents": ["sr_game_designer", "mid_game_designer", "sr_game_artist", "ui_ux_agent"]},
+    ],
+    "prototype": [
+        {"name": "Market Analysis", "agents": ["market_analyst"]},
+        {"name": "Concept", "agents": ["producer_agent", "sr_game_designer"]},
+        {"name": "Prototype", "agents": ["mechanics_developer", "game_feel_developer", "ui_ux_agent"]},
+        {"name": "Playtest", "agents": ["qa_agent", "data_scientist", "sr_game_designer"]},
+    ],
+    "development": [
+        {"name": "Market Analysis", "agents": ["market_analyst"]},
+        {"name": "Pre-Production", "agents": ALL_AGENTS},
+        {"name": "Production", "agents": ALL_AGENTS},
+        {"name": "Soft Launch", "agents": ["data_scientist", "market_analyst", "qa_agent"]},
+        {"name": "Polish", "agents": ALL_AGENTS},
+        {"name": "Release", "agents": ["producer_agent", "market_analyst", "data_scientist"]},
+    ]
+}
+
+# Project phases that are not stage names start the workflow at this stage
+PHASE_STAGES = {
+    "Initialization": "Market Analysis",
+    "Design": "Concept",
+    "Development": "Production",
+    "Launch": "Release"
+}
+
+# Within a stage, an agent waits for its lead (the hierarchy in the communication matrix)
+LEADS = {
+    "mid_game_designer": "sr_game_designer",
+    "technical_artist": "sr_game_artist",
+    "game_feel_developer": "mechanics_developer"
+}
+
+# The orchestrators coordinate runs rather than taking part in them
+COORDINATORS = {"master_orchestrator", "project_orchestrator"}
+
+
+def slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def task_prompt(task: Dict[str, Any], project_name: str) -> str:
+    """Instruction an agent session is started with for a task"""
+    return f"Read agents/{task['agent']}.md and complete your {task['stage']} work for {project_name}"
+
+
+# Backends implement run(task, project_path, project_config) and return the task's output text
+class StubBackend:
+    """Local backend for tests and dry runs: waits a configured time and returns a canned result"""
+
+    def __init__(self, durations: Optional[Dict[str, float]] = None, default: float = 0.0,
+                 failures: Optional[Dict[str, int]] = None, sleep: Callable[[float], None] = time.sleep):
+        # Keys are task ids ("Stage/agent") or agent names
+        self.durations = durations or {}
+        self.default = default
+        # Number of times a task (or agent) fails before succeeding
+        self.failures = dict(failures or {})
+        self.sleep = sleep
+        self.calls: List[str] = []
+        self._lock = threading.Lock()
+
+    def run(self, task: Dict[str, Any], project_path: Path, project_config: Dict[str, Any]) -> str:
+        with self._lock:
+            self.calls.append(task['id'])
+            key = task['id'] if task['id'] in self.failures else task['agent']
+            failing = self.failures.get(key, 0) > 0
+            if failing:
+                self.failures[key] -= 1
+        self.sleep(self.durations.get(task['id'], self.durations.get(task['agent'], self.default)))
+        if failing:
+            raise RuntimeError(f"Stub failure for {task['id']}")
+        return f"{task['agent']} completed {task['stage']}"
+
+
+class CommandBackend:
+    """Runs each task as an external command, e.g. an agent CLI, in the project folder"""
+
+    def __init__(self, command: str):
+        # Placeholders: {agent}, {agent_file}, {stage}, {project}, {prompt}
+        self.command = shlex.split(command)
+
+    def run(self, task: Dict[str, Any], project_path: Path, project_config: Dict[str, Any]) -> str:
+        name = project_config.get('project', {}).get('name', project_path.name)
+        values = {
+            "agent": task['agent'],
+            "agent_file": f"agents/{task['agent']}.md",
+            "stage": task['stage'],
+            "project": name,
+            "prompt": task_prompt(task, name)
+        }
+        # Arguments are formatted after splitting so values never change the command's shape
+        result = subprocess.run([part.format(**values) for part in self.command], cwd=project_path,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"exit {result.returncode}: {result.stderr.strip()[-500:]}")
+        return result.stdout
+
+
+class OrchestrationEngine:
+    def __init__(self, project_path: Path, backend=None, jobs: Optional[int] = None,
+                 clock: Callable[[], float] = time.time):
+        self.project_path = Path(project_path)
+        self.backend = backend or StubBackend()
+        self.jobs = jobs or min(8, (os.cpu_count() or 1) + 4)
+        self.clock = clock
+        # Every session's output is kept for auditing
+        self.transcripts = TranscriptStore(self.project_path)
+        self.state: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def load_config(self) -> Dict[str, Any]:
+        with open(self.project_path / "project-config.json", 'r') as f:
+            return json.load(f)
+
+    def workflow(self, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        mode = config.get('project', {}).get('mode', 'development')
+        return WORKFLOWS.get(mode, WORKFLOWS["development"])
+
+    def start_stage(self, stages: List[Dict[str, Any]], phase: Optional[str]) -> int:
+        """Index of the stage a phase starts at (the first stage if the phase is unknown)"""
+        names = [stage['name'] for stage in stages]
+        for candidate in (phase, PHASE_STAGES.get(phase or "")):
+            if candidate in names:
+                return names.index(candidate)
+        return 0
+
+    def build_dag(self, config: Dict[str, Any], phase: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Tasks (one per stage and active agent) keyed by id, in a dependency-respecting order"""
+        active = [agent for agent in config.get('team', {}).get('active_agents', []) if agent not in COORDINATORS]
+        stages = self.workflow(config)
+        first = self.start_stage(stages, phase)
+        included = stages[first:]
+        included_names = {stage['name'] for stage in included}
+
+        tasks: Dict[str, Dict[str, Any]] = {}
+        stage_tasks: Dict[str, List[str]] = {}
+        previous = None
+        for stage in stages:
+            depends_on = stage.get('depends_on', [previous] if previous else [])
+            previous = stage['name']
+            if stage not in included:
+                continue
+            wanted = active if stage['agents'] == ALL_AGENTS else [a for a in stage['agents'] if a in active]
+            # Leads first so their dependents can point back at them
+            wanted = sorted(wanted, key=lambda agent: agent in LEADS)
+            upstream = [task_id for name in depends_on if name in included_names
+                        for task_id in stage_tasks.get(name, [])]
+            ids = []
+            for agent in wanted:
+                task_id = f"{stage['name']}/{agent}"
+                lead = LEADS.get(agent)
+                dependencies = list(upstream)
+                if lead in wanted:
+                    dependencies.append(f"{stage['name']}/{lead}")
+                tasks[task_id] = {"id": task_id, "project": self.project_path.name, "stage": stage['name'],
+                                  "agent": agent, "depends_on": dependencies}
+                ids.append(task_id)
+            # A stage with none of its agents active passes its dependencies straight through
+            stage_tasks[stage['name']] = ids or upstream
+        return tasks
+
+    def state_file(self, config: Dict[str, Any]) -> Path:
+        mode = config.get('project', {}).get('mode', 'development')
+        return self.project_path / STATE_DIR / f"{slug(mode)}.json"
+
+    def load_state(self, state_file: Path, tasks: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Saved task states; tasks that were running when a run died start over"""
+        try:
+            with open(state_file, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        saved = data.get('tasks', {}) if data.get('version') == STATE_VERSION else {}
+        states = {}
+        for task_id in tasks:
+            state = dict(saved.get(task_id, {"status": "pending", "attempts": 0}))
+            if state['status'] in ("running", "failed"):
+                state['status'] = "pending"
+            states[task_id] = state
+        return states
+
+    def save_state(self, state_file: Path, states: Dict[str, Dict[str, Any]]):
+        """Write task states atomically (called under the lock on every transition)"""
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = state_file.with_name(f"{state_file.name}.{os.getpid()}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump({"version": STATE_VERSION, "tasks": states}, f, indent=2)
+        os.replace(temp_file, state_file)
+
+    def _execute(self, task: Dict[str, Any], config: Dict[str, Any]) -> str:
+        """Run a task on the backend and keep its output; returns the output file relative to the project"""
+        started = datetime.now()
+        output = self.backend.run(task, self.project_path, config)
+        self.transcripts.append(task['agent'], config.get('project', {}).get('phase', 'unknown'), output,
+                                started=started, stage=task['stage'], task=task['id'])
+        output_file = self.project_path / STATE_DIR / "outputs" / f"{slug(task['stage'])}--{task['agent']}.md"
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        output_file.write_text(output, encoding='utf-8')
+        return output_file.relative_to(self.project_path).as_posix()
+
+    def run(self, phase: Optional[str] = None, restart: bool = False,
+            on_task: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Run every task whose dependencies are done, resuming a previous run unless restart is set"""
+        config = self.load_config()
+        phase = phase or config.get('project', {}).get('phase')
+        tasks = self.build_dag(config, phase)
+        state_file = self.state_file(config)
+        if restart and state_file.exists():
+            state_file.unlink()
+        states = self.load_state(state_file, tasks)
+        resumed = sum(1 for state in states.values() if state['status'] == "done")
+        self.save_state(state_file, states)
+
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while True:
+                for task_id, task in tasks.items():
+                    if states[task_id]['status'] == "pending" and \
+                            all(states[dependency]['status'] == "done" for dependency in task['depends_on']):
+                        with self._lock:
+                            states[task_id].update(status="running", started=self.clock(),
+                                                   attempts=states[task_id].get('attempts', 0) + 1)
+                            states[task_id].pop('error', None)
+                            self.save_state(state_file, states)
+                        running[pool.submit(self._execute, task, config)] = task_id
+                if not running:
+                    break
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task_id = running.pop(future)
+                    with self._lock:
+                        state = states[task_id]
+                        state['finished'] = self.clock()
+                        try:
+                            state.update(status="done", output=future.result())
+                        except Exception as e:
+                            state.update(status="failed", error=str(e))
+                        self.save_state(state_file, states)
+                    if on_task:
+                        on_task(tasks[task_id], dict(state))
+
+        report = self.timing(tasks, states)
+        report.update(phase=phase, resumed=resumed, state_file=state_file)
+        return report
+
+    def timing(self, tasks: Dict[str, Dict[str, Any]], states: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Status counts plus wall time, work and critical path per stage and for the whole run"""
+        durations = {task_id: max(0.0, state['finished'] - state['started'])
+                     for task_id, state in states.items()
+                     if state['status'] == "done" and 'started' in state and 'finished' in state}
+
+        def longest(task_ids: List[str]) -> List[str]:
+            """Longest chain (by duration) of done tasks through dependencies inside task_ids"""
+            allowed = set(task_ids)
+            best: Dict[str, tuple] = {}
+            for task_id in task_ids:  # tasks are in dependency order
+                if task_id not in durations:
+                    continue
+                previous = max((best[d] for d in tasks[task_id]['depends_on'] if d in allowed and d in best),
+                               key=lambda item: item[0], default=(0.0, []))
+                best[task_id] = (previous[0] + durations[task_id], previous[1] + [task_id])
+            return max(best.values(), key=lambda item: item[0], default=(0.0, []))[1]
+
+        stages = []
+        for stage in dict.fromkeys(task['stage'] for task in tasks.values()):
+            ids = [task_id for task_id, task in tasks.items() if task['stage'] == stage]
+            done = [task_id for task_id in ids if task_id in durations]
+            path = longest(ids)
+            wall = (max(states[t]['finished'] for t in done) - min(states[t]['started'] for t in done)) if done else 0.0
+            stages.append({
+                "stage": stage,
+                "tasks": len(ids),
+                "done": len(done),
+                "wall": wall,
+                "work": sum(durations[t] for t in done),
+                "critical_path": [tasks[t]['agent'] for t in path],
+                "critical_seconds": sum(durations[t] for t in path)
+            })
+
+        path = longest(list(tasks))
+        counts: Dict[str, int] = {}
+        for task_id in tasks:
+            counts[states[task_id]['status']] = counts.get(states[task_id]['status'], 0) + 1
+        return {
+            "tasks": len(tasks),
+            "status": counts,
+            "failed": [task_id for task_id in tasks if states[task_id]['status'] == "failed"],
+            "stages": stages,
+            "critical_path": path,
+            "critical_seconds": sum(durations[t] for t in path)
+        }
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Phase Gate - Automated phase transition checks
+Evaluates the declarative checks behind master_orchestrator.md's Phase
+Transition Requirements against a project tree, in parallel, reusing each
+check's cached result while its inputs are unchanged
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from handoff_store import HandoffStore
+from placeholder_scanner import PREFIX_PLACEHOLDERS, PlaceholderAutomaton, known_placeholders, placeholder_digest
+
+
+CACHE_FILE = Path(".cache") / "gate_checks.json"
+CACHE_VERSION = 1
+
+PHASE_ORDER = ["Market Analysis", "Design", "Development", "Polish", "Launch"]
+
+# Checks a project must pass to enter a phase. Types:
+#   documents     - every pattern matches at least one non-empty file
+#   placeholders  - no file matching the patterns has unfilled template placeholders
+#   config        - every dotted key of project-config.json is present and non-empty
+#   milestones    - milestones due by today are marked "status": "completed"
+#   handoff       - an approved handoff exists (optionally in a phase)
+GATES: Dict[str, List[Dict[str, Any]]] = {
+    "Design": [
+        {"id": "market-overview", "title": "Market overview written", "type": "documents",
+         "paths": ["resources/market-research/market_overview.md"]},
+        {"id": "market-research-filled", "title": "Market research has no unfilled placeholders",
+         "type": "placeholders", "paths": ["resources/market-research/*.md"]},
+        {"id": "concept", "title": "Concept and unique selling point recorded", "type": "config",
+         "keys": ["project.concept", "project.unique_selling_point"]}
+    ],
+    "Development": [
+        {"id": "gdd", "title": "Complete GDD", "type": "documents", "paths": ["documentation/design/gdd.md"]},
+        {"id": "gdd-filled", "title": "GDD has no unfilled placeholders", "type": "placeholders",
+         "paths": ["documentation/design/gdd.md"]},
+        {"id": "gdd-approved", "title": "GDD approved", "type": "handoff", "phase": "Design"},
+        {"id": "art-style", "title": "Art style defined", "type": "documents",
+         "paths": ["documentation/art/style-guides/*.md"]},
+        {"id": "technical-feasibility", "title": "Technical feasibility validated", "type": "documents",
+         "paths": ["documentation/technical/architecture/*.md"]},
+        {"id": "resource-plan", "title": "Resource plan established", "type": "config",
+         "keys": ["team.active_agents", "milestones"]},
+        {"id": "risk-assessment", "title": "Risk assessment complete", "type": "config", "keys": ["risks"]},
+        {"id": "milestones", "title": "Milestones due so far met", "type": "milestones"}
+    ],
+    "Polish": [
+        {"id": "features", "title": "All features implemented", "type": "placeholders",
+         "paths": ["documentation/design/**/*.md", "documentation/technical/**/*.md"]},
+        {"id": "qa-validation", "title": "QA validation complete", "type": "documents",
+         "paths": ["qa/test-plans/*.md", "qa/playtesting/*.md"]},
+        {"id": "qa-filled", "title": "QA documents have no unfilled placeholders", "type": "placeholders",
+         "paths": ["qa/**/*.md"]},
+        {"id": "performance", "title": "Performance targets met", "type": "documents",
+         "paths": ["documentation/technical/performance/*.md"]},
+        {"id": "content", "title": "Content complete", "type": "placeholders", "paths": ["documentation/**/*.md"]},
+        {"id": "milestones", "title": "Milestones due so far met", "type": "milestones"}
+    ],
+    "Launch": [
+        {"id": "qa-approved", "title": "QA sign-off", "type": "handoff", "phase": "Polish"},
+        {"id": "release-reports", "title": "Production reports written", "type": "documents",
+         "paths": ["documentation/production/reports/*.md"]},
+        {"id": "docs-filled", "title": "No unfilled placeholders anywhere", "type": "placeholders",
+         "paths": ["documentation/**/*.md", "resources/market-research/*.md", "qa/**/*.md"]},
+        {"id": "milestones", "title": "Milestones due so far met", "type": "milestones"}
+    ]
+}
+
+
+def next_phase(phase: str) -> Optional[str]:
+    """Phase after the given one (the first gated phase for phases outside the order)"""
+    if phase not in PHASE_ORDER:
+        return PHASE_ORDER[1]
+    index = PHASE_ORDER.index(phase)
+    return PHASE_ORDER[index + 1] if index + 1 < len(PHASE_ORDER) else None
+
+
+def config_value(config: Dict[str, Any], dotted: str) -> Any:
+    value: Any = config
+    for key in dotted.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+class PhaseGate:
+    def __init__(self, base_path: Path = Path("projects"), templates_path: Path = Path("templates"),
+                 jobs: Optional[int] = None, today: Optional[date] = None):
+        self.base_path = Path(base_path)
+        keywords = known_placeholders(Path(templates_path))
+        self.automaton = PlaceholderAutomaton(keywords, PREFIX_PLACEHOLDERS)
+        # Placeholder results are only valid for the placeholder set they were found with
+        self.placeholder_digest = placeholder_digest(keywords)
+        self.jobs = jobs or min(16, (os.cpu_count() or 1) + 4)
+        self.today = today or date.today()
+        self.handoffs = HandoffStore(self.base_path)
+
+    def files(self, project_path: Path, patterns: List[str]) -> List[Path]:
+        found = {}
+        for pattern in patterns:
+            for path in sorted(project_path.glob(pattern)):
+                if path.is_file():
+                    found.setdefault(path, None)
+        return list(found)
+
+    def inputs(self, project: str, check: Dict[str, Any], config: Dict[str, Any]) -> Any:
+        """What a check's result depends on; file contents are represented by their (mtime, size)"""
+        project_path = self.base_path / project
+        if check['type'] in ("documents", "placeholders"):
+            signatures = []
+            for path in self.files(project_path, check['paths']):
+                stat = path.stat()
+                signatures.append([path.relative_to(project_path).as_posix(), stat.st_mtime_ns, stat.st_size])
+            return [self.placeholder_digest, signatures] if check['type'] == "placeholders" else signatures
+        if check['type'] == "config":
+            return [config_value(config, key) for key in check['keys']]
+        if check['type'] == "milestones":
+            return [config.get('milestones', []), self.today.isoformat()]
+        if check['type'] == "handoff":
+            return self.handoffs.query(projects=[project], approval="approved", phase=check.get('phase'))
+        raise ValueError(f"Unknown check type '{check['type']}' in check '{check['id']}'")
+
+    def evaluate(self, project: str, check: Dict[str, Any], config: Dict[str, Any]) -> Tuple[bool, str]:
+        """Run one check: (passed, detail)"""
+        project_path = self.base_path / project
+        if check['type'] == "documents":
+            missing = [pattern for pattern in check['paths']
+                       if not any(path.stat().st_size for path in self.files(project_path, [pattern]))]
+            return not missing, f"missing {', '.join(missing)}" if missing else "present"
+        if check['type'] == "placeholders":
+            unfilled = {}
+            for path in self.files(project_path, check['paths']):
+                count = len(self.automaton.find(path.read_text(encoding='utf-8', errors='replace')))
+                if count:
+                    unfilled[path.relative_to(project_path).as_posix()] = count
+            if not unfilled:
+                return True, "all filled"
+            worst = sorted(unfilled.items(), key=lambda item: -item[1])[:3]
+            return False, (f"{sum(unfilled.values())} unfilled in {len(unfilled)} files "
+                           f"({', '.join(f'{name} x{count}' for name, count in worst)})")
+        if check['type'] == "config":
+            empty = [key for key in check['keys'] if config_value(config, key) in (None, "", [], {})]
+            return not empty, f"empty {', '.join(empty)}" if empty else "set"
+        if check['type'] == "milestones":
+            due, invalid = [], []
+            for milestone in config.get('milestones', []):
+                if not milestone.get('target_date'):
+                    continue
+                try:
+                    if date.fromisoformat(milestone['target_date']) <= self.today:
+                        due.append(milestone)
+                except (TypeError, ValueError):
+                    invalid.append(f"{milestone.get('name')} ('{milestone['target_date']}')")
+            unmet = [milestone['name'] for milestone in due if milestone.get('status') != "completed"]
+            problems = ([f"not completed: {', '.join(unmet)}"] if unmet else []) + \
+                       ([f"invalid target_date: {', '.join(invalid)}"] if invalid else [])
+            return not problems, "; ".join(problems) if problems else f"{len(due)} due, all completed"
+        if check['type'] == "handoff":
+            approved = self.inputs(project, check, config)
+            scope = f" in {check['phase']}" if check.get('phase') else ""
+            return bool(approved), (f"{len(approved)} approved handoffs{scope}" if approved
+                                    else f"no approved handoff{scope}")
+        raise ValueError(f"Unknown check type '{check['type']}' in check '{check['id']}'")
+
+    def load_cache(self, project: str) -> Dict[str, Any]:
+        try:
+            with open(self.base_path / project / CACHE_FILE, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return data.get('checks', {}) if data.get('version') == CACHE_VERSION else {}
+
+    def save_cache(self, project: str, checks: Dict[str, Any]):
+        cache_file = self.base_path / project / CACHE_FILE
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump({"version": CACHE_VERSION, "checks": checks}, f, separators=(',', ':'))
+        os.replace(temp_file, cache_file)
+
+    def _run_check(self, project: str, check: Dict[str, Any], config: Dict[str, Any],
+                   cached: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        # The check's definition is part of its key so editing GATES invalidates old results
+        key = hashlib.sha256(json.dumps([check, self.inputs(project, check, config)], sort_keys=True,
+                                        default=str).encode('utf-8')).hexdigest()
+        if cached and cached.get('input') == key:
+            return dict(cached, cached=True)
+        passed, detail = self.evaluate(project, check, config)
+        return {"id": check['id'], "title": check['title'], "passed": passed, "detail": detail,
+                "input": key, "cached": False}
+
+    def validate(self, project_names: List[str], target: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Gate report per project for entering target (default: each project's next phase)"""
+        plans = []
+        for project in project_names:
+            with open(self.base_path / project / "project-config.json", 'r') as f:
+                config = json.load(f)
+            phase = target or next_phase(config.get('project', {}).get('phase', ''))
+            if phase is not None and phase not in GATES:
+                raise ValueError(f"No gate defined for '{phase}' (gated phases: {', '.join(GATES)})")
+            plans.append((project, config, phase, self.load_cache(project)))
+
+        # Every check of every project runs on one pool
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            futures = [[pool.submit(self._run_check, project, check, config, cache.get(f"{phase}/{check['id']}"))
+                        for check in GATES.get(phase, [])] for project, config, phase, cache in plans]
+            results = [[future.result() for future in project_futures] for project_futures in futures]
+
+        reports = []
+        for (project, config, phase, cache), checks in zip(plans, results):
+            fresh = [check for check in checks if not check['cached']]
+            if fresh:
+                for check in fresh:
+                    cache[f"{phase}/{check['id']}"] = {key: value for key, value in check.items() if key != 'cached'}
+                self.save_cache(project, cache)
+            reports.append({
+                "project": project,
+                "from": config.get('project', {}).get('phase', 'unknown'),
+                "to": phase,
+                "checks": checks,
+                "passed": all(check['passed'] for check in checks),
+                "cached": len(checks) - len(fresh)
+            })
+        return reports
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Placeholder Scanner - Finds template placeholders left unfilled in project docs
+Matches every known placeholder in one pass per file with an Aho-Corasick
+automaton and reports completeness per document and per project
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from doc_index import SEARCH_FOLDERS, scan_documents
+
+
+DEFAULT_CACHE_FILE = Path(".cache") / "placeholder_scan.json"
+CACHE_VERSION = 1
+TEMPLATES_PATH = Path("templates")
+
+# Bracketed text in a template; "[text](url)" is a link and '["a", "b"]' a JSON list, not placeholders
+TEMPLATE_PLACEHOLDER = re.compile(r'\[(?!["\'])([^\[\]\n]{1,60})\](?!\()')
+# Checkboxes are task state, not missing content
+NOT_PLACEHOLDERS = {" ", "x", "X"}
+
+# Placeholders written by init_project.py into generated docs
+GENERATED_PLACEHOLDERS = [
+    "[To be researched]", "[To be assigned]", "[Premium/F2P/Subscription]", "[Details]", "[Description]",
+    "[What works]", "[Age, gender, location]", "[Interests, behaviors]", "[Why they play]", "[Level]",
+    "[Feature 1]", "[Feature 2]", "[Feature 3]", "[Strength 1]", "[Strength 2]", "[Strength 3]",
+    "[Weakness 1]", "[Weakness 2]", "[Weakness 3]", "[Opportunity 1]", "[Opportunity 2]", "[Opportunity 3]",
+    "[Insight 1]", "[Insight 2]", "[Insight 3]", "[X%]"
+]
+# Open-ended families: the keyword runs up to the closing bracket ("[To be filled by QA Agent]")
+PREFIX_PLACEHOLDERS = ["[To be ", "[TBD", "[TODO"]
+MAX_PLACEHOLDER_LENGTH = 80
+
+
+def known_placeholders(templates_path: Path = TEMPLATES_PATH) -> List[str]:
+    """Every placeholder used by the templates plus the ones generated docs contain"""
+    found = dict.fromkeys(GENERATED_PLACEHOLDERS)
+    if templates_path.exists():
+        for template in sorted(templates_path.iterdir()):
+            if template.suffix in (".md", ".json"):
+                for match in TEMPLATE_PLACEHOLDER.finditer(template.read_text(encoding='utf-8')):
+                    if match.group(1) not in NOT_PLACEHOLDERS:
+                        found.setdefault(match.group(0))
+    return list(found)
+
+
+def placeholder_digest(keywords: List[str]) -> str:
+    """Fingerprint of the placeholder set results were found with"""
+    return hashlib.sha256(json.dumps([keywords, PREFIX_PLACEHOLDERS]).encode('utf-8')).hexdigest()
+
+
+class PlaceholderAutomaton:
+    """Aho-Corasick automaton over literal placeholders and open-ended placeholder prefixes"""
+
+    def __init__(self, keywords: Iterable[str], prefixes: Iterable[str] = ()):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        # state -> [(keyword length, is prefix)]
+        self.output: List[List[Tuple[int, bool]]] = [[]]
+        for keyword in keywords:
+            self._add(keyword, False)
+        for prefix in prefixes:
+            self._add(prefix, True)
+        self._link()
+        # From the root only a keyword's first character can start a match, so skip ahead to one
+        self.start = re.compile("[" + "".join(re.escape(char) for char in self.goto[0]) + "]")
+
+    def _add(self, keyword: str, prefix: bool):
+        state = 0
+        for char in keyword:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.output[state].append((len(keyword), prefix))
+
+    def _link(self):
+        """Breadth-first failure links, merging the outputs of each state's failure state"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, target in self.goto[state].items():
+                queue.append(target)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[target] = self.goto[fallback].get(char, 0)
+                self.output[target] = self.output[target] + self.output[self.fail[target]]
+
+    def find(self, text: str) -> List[str]:
+        """Placeholders in text, in order; overlapping matches keep the longest"""
+        goto, fail, output = self.goto, self.fail, self.output
+        matches: Dict[int, str] = {}
+        state = 0
+        index = 0
+        length = len(text)
+        while index < length:
+            if state == 0:
+                start = self.start.search(text, index)
+                if start is None:
+                    break
+                index = start.start()
+            char = text[index]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword_length, prefix in output[state]:
+                begin = index - keyword_length + 1
+                end = index + 1
+                if prefix:
+                    close = text.find("]", end, begin + MAX_PLACEHOLDER_LENGTH)
+                    if close < 0 or "\n" in text[end:close]:
+                        continue
+                    end = close + 1
+                if len(matches.get(begin, "")) < end - begin:
+                    matches[begin] = text[begin:end]
+            index += 1
+        return [matches[begin] for begin in sorted(matches)]
+
+
+class PlaceholderScanner:
+    def __init__(self, base_path: Path = Path("projects"), templates_path: Path = TEMPLATES_PATH,
+                 cache_file: Optional[Path] = DEFAULT_CACHE_FILE):
+        self.base_path = Path(base_path)
+        self.keywords = known_placeholders(Path(templates_path))
+        self.automaton = PlaceholderAutomaton(self.keywords, PREFIX_PLACEHOLDERS)
+        # Cached results are only valid for the placeholder set they were scanned with
+        self.digest = placeholder_digest(self.keywords)
+        self.cache_file = Path(cache_file) if cache_file is not None else None
+        # path relative to base_path -> [mtime_ns, size, {placeholder: count}]
+        self.files: Dict[str, List[Any]] = {}
+
+    def load(self):
+        if self.cache_file is None:
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') == CACHE_VERSION and data.get('digest') == self.digest and \
+                data.get('base_path') == self.base_path.as_posix():
+            self.files = data['files']
+
+    def save(self):
+        if self.cache_file is None:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump({"version": CACHE_VERSION, "digest": self.digest, "base_path": self.base_path.as_posix(),
+                       "files": self.files}, f, separators=(',', ':'))
+        os.replace(temp_file, self.cache_file)
+
+    def scan_text(self, text: str) -> Dict[str, int]:
+        """Unfilled placeholders in a document with their counts"""
+        counts: Dict[str, int] = {}
+        for placeholder in self.automaton.find(text):
+            counts[placeholder] = counts.get(placeholder, 0) + 1
+        return counts
+
+    def update(self) -> Dict[str, int]:
+        """Rescan only documents added or changed (by mtime and size) since the last scan"""
+        self.load()
+        found, _ = scan_documents(self.base_path, SEARCH_FOLDERS)
+        scanned = 0
+        for relative, (mtime_ns, size) in found.items():
+            entry = self.files.get(relative)
+            if entry and entry[0] == mtime_ns and entry[1] == size:
+                continue
+            text = (self.base_path / relative).read_text(encoding='utf-8', errors='replace')
+            self.files[relative] = [mtime_ns, size, self.scan_text(text)]
+            scanned += 1
+        removed = [relative for relative in self.files if relative not in found]
+        for relative in removed:
+            del self.files[relative]
+        if scanned or removed:
+            self.save()
+        return {"documents": len(found), "scanned": scanned, "removed": len(removed)}
+
+    def project_report(self, project_name: str, paths: List[str]) -> Dict[str, Any]:
+        """Unfilled placeholders per document and the share of documents with none left"""
+        prefix = project_name + "/"
+        documents = []
+        for relative in sorted(paths):
+            placeholders = self.files[relative][2]
+            documents.append({
+                "path": relative[len(prefix):],
+                "unfilled": sum(placeholders.values()),
+                "placeholders": placeholders
+            })
+        complete = sum(1 for document in documents if not document["unfilled"])
+        return {
+            "project": project_name,
+            "documents": documents,
+            "complete_documents": complete,
+            "total_documents": len(documents),
+            "unfilled": sum(document["unfilled"] for document in documents),
+            "completeness": round(100.0 * complete / len(documents), 1) if documents else 100.0
+        }
+
+    def report(self, project_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Completeness of every project (or the named ones), scanning only what changed"""
+        self.update()
+        by_project: Dict[str, List[str]] = {}
+        for relative in self.files:
+            by_project.setdefault(relative.split("/", 1)[0], []).append(relative)
+        return [self.project_report(name, by_project[name]) for name in sorted(by_project)
+                if not project_names or name in project_names]
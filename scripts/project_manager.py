@@ -9,11 +9,30 @@ License: MIT
 """
 
 import os
+import argparse
 import json
 import sys
-from datetime import datetime
+import time
+from datetime import datetime, date
 from pathlib import Path
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from milestone_scheduler import MilestoneScheduler
+from agent_budget import PROFILES, AgentBudget
+from agent_limiter import AgentLimiter, LimitedBackend
+from agent_customizer import AgentCustomizer
+from agent_dedup import AgentDeduplicator
+from agent_watcher import DEFAULT_DEBOUNCE, AgentWatcher
+from context_pack import ContextPacker
+from doc_index import DocumentIndex
+from engine_upgrader import EngineUpgrader
+from handoff_store import APPROVALS, STATUSES, HandoffStore, parse_deliverable
+from orchestration_engine import CommandBackend, OrchestrationEngine, StubBackend
+from phase_gate import GATES, PhaseGate
+from placeholder_scanner import PlaceholderScanner
+from response_cache import CachedBackend, ResponseCache
+from transcript_store import TranscriptStore
+from usage_meter import DEFAULT_WINDOW_DAYS, MeteredBackend, usage_report
 
 
 class ProjectManager:
@@ -104,6 +123,16 @@ class ProjectManager:
                     if milestones:
                         current_milestone = milestones[0]
                         print(f"   Current Milestone: {current_milestone.get('name', 'unknown')}")
+                    
+                    # Only the end of the transcript index is read, however long the history
+                    recent = TranscriptStore(project_path).recent(5 if project_name else 1)
+                    if recent and project_name:
+                        print("   Recent Activity:")
+                        for session in recent:
+                            print(f"     {session['ended'].replace('T', ' ')}  {session['agent']} "
+                                  f"({session['phase']}, {session['bytes']} bytes) [{session['id']}]")
+                    elif recent:
+                        print(f"   Last Activity: {recent[0]['ended'][:10]} {recent[0]['agent']}")
                 
                 except Exception as e:
                     print(f"   Warning: Could not read project details: {e}")
@@ -116,6 +145,20 @@ class ProjectManager:
             print("  python scripts/project_manager.py resume [project-name]  # Resume work")
             print("  python scripts/project_manager.py freeze [project-name]  # Freeze project")
             print("  python scripts/project_manager.py startover [project-name]  # Start over")
+            print("  python scripts/project_manager.py shift-deadlines YYYY-MM-DD DAYS  # Shift deadlines")
+            print("  python scripts/project_manager.py upgrade-engine [project-name] --to VERSION  # Upgrade engine")
+            print("  python scripts/project_manager.py customize [project-name ...] [--jobs N] [--watch]  # Re-customize agents")
+            print("  python scripts/project_manager.py refresh [--jobs N]  # Regenerate stale agents")
+            print("  python scripts/project_manager.py dedup [--restore]  # Share identical agent guidance")
+            print("  python scripts/project_manager.py measure [project-name ...] [--budget N]  # Agent token sizes")
+            print("  python scripts/project_manager.py context-pack project-name [--phase P] [--agent A]  # Session bundle")
+            print("  python scripts/project_manager.py search \"query\" [--project P] [--folder F]  # Search project docs")
+            print("  python scripts/project_manager.py placeholders [project-name ...] [--details]  # Unfilled placeholders")
+            print("  python scripts/project_manager.py orchestrate project-name ... [--phase P] [--jobs N]  # Run agent workflows")
+            print("  python scripts/project_manager.py handoff create|list|show|update ...  # Structured agent handoffs")
+            print("  python scripts/project_manager.py transcripts project-name [--agent A] [--show ID]  # Agent sessions")
+            print("  python scripts/project_manager.py usage [project-name ...] [--by agent|phase|project]  # Token usage")
+            print("  python scripts/project_manager.py validate-gate [project-name ...] [--to PHASE]  # Phase gate checks")
     
     def resume_project(self, project_name):
         """Resume work on a specific project"""
@@ -174,6 +217,7 @@ class ProjectManager:
                 print("   claude 'Read project-config.json and give me a current status report'")
             
             print("\n💡 Note: This project uses project-specific agents in the agents/ folder")
+            print(f"⚡ Start a session with one read: python scripts/project_manager.py context-pack {project['name']}")
             
             print(f"\n✅ Project '{project['display_name']}' is now active and ready for development!")
         
@@ -274,6 +318,425 @@ class ProjectManager:
         print("\nTo restart development:")
         print("  python scripts/project_manager.py resume " + project['name'])
     
+    def shift_deadlines(self, from_date, days):
+        """Shift every project's deadlines on or after a date (e.g. a studio holiday)"""
+        try:
+            start = date.fromisoformat(from_date)
+            days = int(days)
+        except ValueError:
+            print("Usage: python scripts/project_manager.py shift-deadlines YYYY-MM-DD DAYS")
+            return 0
+        
+        configs = []
+        for project in self.list_projects():
+            config_file = self.base_path / project['name'] / "project-config.json"
+            with open(config_file, 'r') as f:
+                configs.append((config_file, json.load(f)))
+        
+        milestone_lists = [config.get('milestones', []) for _, config in configs]
+        before = [[m.get('target_date') for m in milestones] for milestones in milestone_lists]
+        skipped = []
+        moved = MilestoneScheduler().shift_deadlines(milestone_lists, start, days, skipped)
+        
+        skipped_ids = {id(milestone) for milestone in skipped}
+        for (config_file, config), milestones in zip(configs, milestone_lists):
+            for milestone in milestones:
+                if id(milestone) in skipped_ids:
+                    print(f"⚠️  {config_file.parent.name}: skipped '{milestone.get('name', 'milestone')}' "
+                          f"(invalid target_date {milestone['target_date']!r})")
+        
+        updated = 0
+        for (config_file, config), old_dates in zip(configs, before):
+            if [m.get('target_date') for m in config.get('milestones', [])] != old_dates:
+                with open(config_file, 'w') as f:
+                    json.dump(config, f, indent=2)
+                updated += 1
+        
+        print(f"📅 Shifted {moved} deadlines by {days} days across {updated} projects")
+        return moved
+    
+    def upgrade_engine(self, project_name, version):
+        """Upgrade a project's engine version in place"""
+        projects = self.list_projects()
+        project = next((p for p in projects if p['name'] == project_name or p['display_name'] == project_name), None)
+        
+        if not project:
+            print(f"Project '{project_name}' not found.")
+            return None
+        
+        report = EngineUpgrader().upgrade_project(self.base_path / project['name'], version)
+        self.print_upgrade_report(report)
+        return report
+    
+    def upgrade_engine_fleet(self, engine, version):
+        """Upgrade every project using an engine to a new version"""
+        reports = EngineUpgrader().upgrade_fleet(self.base_path, engine, version)
+        
+        if not reports:
+            print(f"No {engine} projects found.")
+        for report in reports:
+            self.print_upgrade_report(report)
+        print(f"\nUpgraded {sum(1 for r in reports if r['files'])} of {len(reports)} {engine} projects to {version}")
+        return reports
+    
+    def customize_projects(self, project_names=None, jobs=None, profile=None, shared_sections=None):
+        """Re-customize the agents of the named projects (default: all) on a worker pool"""
+        projects = self.list_projects()
+        if project_names:
+            selected = [p for p in projects if p['name'] in project_names or p['display_name'] in project_names]
+            found = {p['name'] for p in selected} | {p['display_name'] for p in selected}
+            for name in project_names:
+                if name not in found:
+                    print(f"Project '{name}' not found.")
+            projects = selected
+        
+        batch = []
+        for project in sorted(projects, key=lambda p: p['name']):
+            project_path = self.base_path / project['name']
+            config_file = project_path / "project-config.json"
+            with open(config_file, 'r') as f:
+                config = json.load(f)
+            settings = {'agent_profile': profile, 'shared_sections': shared_sections}
+            settings = {key: value for key, value in settings.items()
+                        if value is not None and config['project'].get(key) != value}
+            if settings:
+                # Settings stick, so later refreshes render the same variant
+                config['project'].update(settings)
+                with open(config_file, 'w') as f:
+                    json.dump(config, f, indent=2)
+            batch.append((project_path, config))
+        
+        if not batch:
+            print("No projects to customize.")
+            return 0
+        customizer = AgentCustomizer()
+        written = customizer.customize_many(batch, jobs=jobs)
+        print(f"🤖 Customized {written} agent files across {len(batch)} projects")
+        shared = [report for report in customizer.shared_reports.values() if report['common']]
+        if shared:
+            print(f"📎 Shared sections saved {sum(report['bytes_saved'] for report in shared)} bytes "
+                  f"across {len(shared)} projects")
+        return written
+    
+    def refresh_agents(self, jobs=None):
+        """Regenerate only the project agents whose base agent, engine config or project fields changed"""
+        report = AgentCustomizer().refresh(self.base_path, jobs=jobs)
+        if not report['written']:
+            print(f"✅ All agents up to date across {report['projects']} projects")
+        else:
+            print(f"🔄 Regenerated {report['written']} stale agent files in "
+                  f"{report['stale_projects']} of {report['projects']} projects")
+        return report
+    
+    def dedup_agents(self):
+        """Store shared agent guidance once and leave thin per-project agent headers"""
+        report = AgentDeduplicator(base_path=self.base_path).dedup()
+        print(f"🗜️  Thinned {report['thinned']} agents ({report['already_thin']} already thin, "
+              f"{report['unshared'] + report['restored']} not shared with another project, "
+              f"{report['skipped']} edited or stale left as is) over {report['blobs']} shared blobs")
+        if report['restored']:
+            print(f"   Restored {report['restored']} thin agents whose guidance is no longer shared")
+        saved = report['allocated_saved']
+        print(f"   Agent storage: {report['before']['bytes']} -> {report['after']['bytes']} bytes, "
+              f"{report['before']['allocated']} -> {report['after']['allocated']} bytes on disk "
+              f"({f'{saved} saved' if saved >= 0 else f'{-saved} more'})")
+        return report
+    
+    def measure_agents(self, project_names=None, budget=None):
+        """Print estimated prompt tokens per agent, project and phase session"""
+        budgeter = AgentBudget(self.base_path)
+        reports = budgeter.measure(project_names)
+        if not reports:
+            print("No projects to measure.")
+            return []
+        
+        for report in reports:
+            print(f"\n📏 {report['project']} ({report['profile']} profile, phase: {report['phase']})")
+            for agent, tokens in sorted(report['agents'].items(), key=lambda item: -item[1]):
+                print(f"   {agent:<28} ~{tokens:>6} tokens")
+            print(f"   {'All agents':<28} ~{report['total']:>6} tokens")
+            for phase, tokens in report['phases'].items():
+                print(f"   Session in {phase:<17} ~{tokens:>6} tokens")
+        
+        if budget is not None:
+            over = budgeter.over_budget(reports, budget)
+            for report in over:
+                print(f"⚠️  {report['project']}: ~{report['session']} tokens for a {report['phase']} session "
+                      f"exceeds the budget of {budget}")
+            if not over:
+                print(f"\n✅ Every project's current session fits in {budget} tokens")
+            return over
+        return []
+    
+    def context_pack(self, project_name, phase=None, agent_name=None):
+        """Build (or reuse) the single-file context bundle for a project session"""
+        projects = self.list_projects()
+        project = next((p for p in projects if p['name'] == project_name or p['display_name'] == project_name), None)
+        if not project:
+            print(f"Project '{project_name}' not found.")
+            return None
+        
+        project_path = self.base_path / project['name']
+        try:
+            report = ContextPacker(project_path).build(phase, agent_name)
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            return None
+        
+        state = "built" if report['status'] == "built" else "up to date"
+        print(f"📦 Context pack for {project['display_name']} ({report['phase']}, {report['agent']}): {state}, "
+              f"~{report['tokens']} tokens")
+        print(f"   {report['path']}")
+        print(f"   claude 'Read {report['path'].relative_to(project_path).as_posix()} and resume work on "
+              f"{project['display_name']}'")
+        return report
+    
+    def search_docs(self, query, project=None, folder=None, limit=10):
+        """Search every project's documentation, market research and QA notes"""
+        index = DocumentIndex(self.base_path)
+        results, report = index.timed_search(query, project=project, folder=folder, limit=limit)
+        
+        print(f"🔎 {len(results)} results for \"{query}\" ({report['documents']} documents, "
+              f"{report['indexed']} re-indexed; {report['total_ms']:.0f} ms: load {report['load_ms']:.0f}, "
+              f"{'scan' if report['walked'] else 'stat'} {report['update_ms']:.0f}, "
+              f"query {report['search_ms']:.1f})")
+        for rank, result in enumerate(results, 1):
+            print(f"\n{rank}. {result['project']} / {result['file']}  (score {result['score']:.2f})")
+            if result['snippet']:
+                print(f"   {result['snippet']}")
+        return results
+    
+    def scan_placeholders(self, project_names=None, details=False):
+        """Report template placeholders still unfilled in each project's documents"""
+        scanner = PlaceholderScanner(self.base_path)
+        started = time.perf_counter()
+        reports = scanner.report(project_names)
+        elapsed = time.perf_counter() - started
+        
+        for report in reports:
+            print(f"📝 {report['project']}: {report['completeness']}% of documents complete "
+                  f"({report['complete_documents']}/{report['total_documents']}), "
+                  f"{report['unfilled']} unfilled placeholders")
+            if details:
+                for document in report['documents']:
+                    if document['unfilled']:
+                        top = sorted(document['placeholders'].items(), key=lambda item: -item[1])[:3]
+                        print(f"   - {document['path']}: {document['unfilled']} "
+                              f"({', '.join(f'{text} x{count}' for text, count in top)})")
+        documents = sum(report['total_documents'] for report in reports)
+        print(f"\nScanned {documents} documents in {len(reports)} projects in {elapsed:.2f}s")
+        return reports
+    
+    def orchestrate(self, project_names, phase=None, jobs=None, command=None, restart=False, use_cache=True):
+        """Run projects' agent workflows from their phase as task DAGs, resuming interrupted runs"""
+        projects = self.list_projects()
+        selected = []
+        for project_name in project_names:
+            project = next((p for p in projects if p['name'] == project_name or p['display_name'] == project_name), None)
+            if not project:
+                print(f"Project '{project_name}' not found.")
+                return None
+            selected.append(project)
+        
+        # One limiter for every project so the backend's caps and rates hold fleet-wide
+        backend_name = "command" if command else "stub"
+        limiter = AgentLimiter()
+        backend = LimitedBackend(CommandBackend(command) if command else StubBackend(), limiter, backend_name)
+        # Repeated prompts are answered from the cache without waiting for the limiter
+        cache = ResponseCache()
+        backend = CachedBackend(backend, cache, bypass=not use_cache)
+        backend = MeteredBackend(backend)
+        
+        def on_task(task, state):
+            if state['status'] == "done":
+                print(f"   ✅ {task['project']} {task['id']} ({state['finished'] - state['started']:.1f}s)")
+            else:
+                print(f"   ❌ {task['project']} {task['id']}: {state['error']}")
+        
+        def run(project):
+            limiter.load_budget(project['name'], self.base_path / project['name'])
+            engine = OrchestrationEngine(self.base_path / project['name'], backend=backend, jobs=jobs)
+            return engine.run(phase=phase, restart=restart, on_task=on_task)
+        
+        print(f"🎬 Orchestrating {', '.join(project['display_name'] for project in selected)}")
+        with ThreadPoolExecutor(max_workers=len(selected)) as pool:
+            reports = list(pool.map(run, selected))
+        
+        for project, report in zip(selected, reports):
+            print(f"\n{project['display_name']}" + (f" (resumed: {report['resumed']} tasks already done)"
+                                                   if report['resumed'] else ""))
+            print(f"{'Stage':<16} {'Tasks':>7} {'Wall':>8} {'Work':>8}  Critical path")
+            for stage in report['stages']:
+                print(f"{stage['stage']:<16} {stage['done']:>3}/{stage['tasks']:<3} {stage['wall']:>7.1f}s "
+                      f"{stage['work']:>7.1f}s  {' -> '.join(stage['critical_path'])} "
+                      f"({stage['critical_seconds']:.1f}s)")
+            print(f"Critical path: {' -> '.join(report['critical_path'])} ({report['critical_seconds']:.1f}s)")
+            if report['failed']:
+                print(f"❌ {len(report['failed'])} tasks failed; run orchestrate again to retry them "
+                      f"and continue their dependents")
+            else:
+                done = report['status'].get('done', 0)
+                print(f"✅ {done}/{report['tasks']} tasks done (state: {report['state_file']})")
+        
+        metrics = limiter.metrics()
+        queue = metrics['queues'].get(backend_name, {})
+        waits = ", ".join(f"{lane} {stats['calls']} calls, mean {stats['mean']:.2f}s, max {stats['max']:.2f}s"
+                          for lane, stats in metrics['waits'].items() if stats['calls'])
+        print(f"\n🚦 {backend_name} backend: max queue depth {queue.get('max_depth', 0)}; waits: {waits or 'none'}")
+        for project, budget in metrics['budgets'].items():
+            print(f"   {project}: ~{metrics['spent'].get(project, 0)} of {budget} budgeted tokens")
+        stats = cache.stats()
+        print(f"💾 Response cache: {stats['hits']} hits, {stats['misses']} misses"
+              + (" (bypassed)" if not use_cache else ""))
+        return reports
+    
+    def create_handoff(self, project_name, from_agent, to_agent, phase=None, deliverables=None,
+                       requirements=None, notes=""):
+        """Record a structured handoff between two agents of a project"""
+        store = HandoffStore(self.base_path)
+        if project_name not in store.projects():
+            print(f"Project '{project_name}' not found.")
+            return None
+        try:
+            record = store.create(project_name, from_agent, to_agent, phase=phase,
+                                  deliverables=[parse_deliverable(text) for text in deliverables or []],
+                                  requirements=requirements, notes=notes)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return None
+        print(f"🤝 {record['id']}: {from_agent} → {to_agent} ({record['phase']}), pending producer approval")
+        print(f"   {store.handoff_path(project_name) / (record['id'] + '.json')}")
+        return record
+    
+    def list_handoffs(self, projects=None, older_than_days=None, **filters):
+        """List handoffs across projects from their indexes"""
+        rows = HandoffStore(self.base_path).query(projects=projects, older_than_days=older_than_days, **filters)
+        if not rows:
+            print("No matching handoffs.")
+            return rows
+        print(f"{'Project':<24} {'Id':<8} {'From':<22} {'To':<22} {'Phase':<16} {'Approval':<15} {'Status':<9} Created")
+        for row in rows:
+            print(f"{row['project']:<24} {row['id']:<8} {row['from_agent']:<22} {row['to_agent']:<22} "
+                  f"{row['phase']:<16} {row['approval']:<15} {row['status']:<9} {row['created'][:10]}")
+        print(f"\n{len(rows)} handoffs")
+        return rows
+    
+    def show_handoff(self, project_name, handoff_id):
+        """Print the markdown view of a handoff"""
+        store = HandoffStore(self.base_path)
+        try:
+            record = store.get(project_name, handoff_id)
+        except FileNotFoundError:
+            print(f"Handoff '{handoff_id}' not found in '{project_name}'.")
+            return None
+        print(store.render(record), end="")
+        return record
+    
+    def update_handoff(self, project_name, handoff_id, approval=None, status=None):
+        """Set a handoff's approval or status"""
+        store = HandoffStore(self.base_path)
+        try:
+            record = store.update(project_name, handoff_id, approval=approval, status=status)
+        except FileNotFoundError:
+            print(f"Handoff '{handoff_id}' not found in '{project_name}'.")
+            return None
+        except ValueError as e:
+            print(f"❌ {e}")
+            return None
+        print(f"🤝 {record['id']}: approval {record['approval']}, status {record['status']}")
+        return record
+    
+    def show_transcripts(self, project_name, agent=None, phase=None, session_id=None):
+        """List a project's agent sessions, or print one session's transcript"""
+        project_path = self.base_path / project_name
+        if not (project_path / "project-config.json").exists():
+            print(f"Project '{project_name}' not found.")
+            return None
+        store = TranscriptStore(project_path)
+        if session_id:
+            try:
+                text = store.read(session_id)
+            except KeyError as e:
+                print(f"❌ {e.args[0]}")
+                return None
+            print(text, end="" if text.endswith("\n") else "\n")
+            return text
+        sessions = store.query(agent=agent, phase=phase)
+        for session in sessions:
+            stage = session.get('meta', {}).get('stage', '')
+            print(f"{session['id']}  {session['ended'].replace('T', ' ')}  {session['agent']:<22} "
+                  f"{session['phase']:<16} {stage:<16} {session['bytes']:>8} bytes")
+        stats = store.stats()
+        print(f"\n{len(sessions)} of {stats['sessions']} sessions; {stats['bytes']} bytes stored in "
+              f"{stats['stored_bytes']}")
+        return sessions
+    
+    def show_usage(self, project_names=None, group_by="agent", days=DEFAULT_WINDOW_DAYS):
+        """Token, cost and latency report of agent invocations over a rolling window"""
+        reports = usage_report(self.base_path, project_names, group_by=group_by, days=days)
+        if not reports:
+            print(f"No agent invocations recorded in the last {days:g} days.")
+            return reports
+        print(f"{group_by.capitalize():<24} {'Calls':>6} {'Cached':>7} {'Tokens in':>10} {'Tokens out':>10} "
+              f"{'Cost':>9} {'p50':>7} {'p90':>7} {'p99':>7}")
+        for report in reports:
+            print(f"{report['group']:<24} {report['calls']:>6} {report['cache_hit_rate']:>6.0f}% "
+                  f"{report['tokens_in']:>10} {report['tokens_out']:>10} {'$' + format(report['cost'], '.2f'):>9} "
+                  f"{report['p50']:>6.2f}s {report['p90']:>6.2f}s {report['p99']:>6.2f}s")
+        total_cost = sum(report['cost'] for report in reports)
+        calls = sum(report['calls'] for report in reports)
+        print(f"\n{calls} invocations in the last {days:g} days, ${total_cost:.2f} estimated")
+        return reports
+    
+    def validate_gate(self, project_names=None, target=None, jobs=None, details=False):
+        """Check whether projects meet the requirements for entering a phase"""
+        projects = self.list_projects()
+        names = [p['name'] for p in projects]
+        for project_name in project_names or []:
+            if project_name not in names:
+                print(f"Project '{project_name}' not found.")
+                return None
+        started = time.perf_counter()
+        try:
+            reports = PhaseGate(self.base_path, jobs=jobs).validate(project_names or sorted(names), target)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return None
+        elapsed = time.perf_counter() - started
+        
+        for report in reports:
+            if report['to'] is None:
+                print(f"🏁 {report['project']}: already in {report['from']}, no later gate")
+                continue
+            passed = sum(1 for check in report['checks'] if check['passed'])
+            icon = "✅" if report['passed'] else "❌"
+            print(f"{icon} {report['project']}: {report['from']} → {report['to']}: "
+                  f"{passed}/{len(report['checks'])} checks passed")
+            for check in report['checks']:
+                if details or not check['passed']:
+                    print(f"   {'✓' if check['passed'] else '✗'} {check['title']}: {check['detail']}")
+        checks = sum(len(report['checks']) for report in reports)
+        cached = sum(report['cached'] for report in reports)
+        ready = sum(1 for report in reports if report['passed'] and report['to'])
+        print(f"\n{ready}/{len(reports)} projects ready; {checks} checks ({cached} cached) in {elapsed:.2f}s")
+        return reports
+    
+    def watch_agents(self, jobs=None, debounce=DEFAULT_DEBOUNCE):
+        """Watch base agents and engine configs and keep every project's agents up to date"""
+        # Catch up on edits made while nothing was watching
+        self.refresh_agents(jobs=jobs)
+        AgentWatcher(base_path=self.base_path, debounce=debounce, jobs=jobs).run()
+    
+    def print_upgrade_report(self, report):
+        """Print the files touched by an engine upgrade"""
+        if not report['files']:
+            print(f"⚪ {report['project']}: already on {report['engine']} {report['to']}, nothing to do")
+            return
+        print(f"⬆️  {report['project']}: {report['engine']} {report['from']} -> {report['to']} "
+              f"({len(report['files'])} files patched)")
+        for path in report['files']:
+            print(f"   - {path}")
+    
     def create_new_project(self):
         """Shortcut to create new project"""
         print("Launching project initialization...")
@@ -356,7 +819,189 @@ class ProjectManager:
 def main():
     manager = ProjectManager()
     
-    if len(sys.argv) == 1:
+    if len(sys.argv) > 1 and sys.argv[1].lower() == 'customize':
+        parser = argparse.ArgumentParser(prog="project_manager.py customize",
+                                         description="Re-customize project agents from the base agents")
+        parser.add_argument("projects", nargs="*", help="Projects to customize (default: all)")
+        parser.add_argument("--jobs", type=int, default=None, help="Worker threads (default: based on CPU count)")
+        parser.add_argument("--watch", action="store_true",
+                            help="Keep running and regenerate dependents when base agents or engine configs change")
+        parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                            help="Seconds of quiet before a burst of edits is applied (default: %(default)s)")
+        parser.add_argument("--profile", choices=PROFILES, default=None,
+                            help="Agent variant to generate and keep for the projects (default: unchanged)")
+        parser.add_argument("--shared-sections", choices=("on", "off"), default=None,
+                            help="Move sections repeated across a project's agents into agents/_common.md "
+                                 "(default: unchanged)")
+        args = parser.parse_args(sys.argv[2:])
+        if args.watch:
+            if args.projects or args.profile or args.shared_sections:
+                parser.error("--watch covers every project as configured; do not name projects or settings")
+            manager.watch_agents(jobs=args.jobs, debounce=args.debounce)
+        else:
+            shared_sections = None if args.shared_sections is None else args.shared_sections == "on"
+            manager.customize_projects(args.projects, jobs=args.jobs, profile=args.profile,
+                                       shared_sections=shared_sections)
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'measure':
+        parser = argparse.ArgumentParser(prog="project_manager.py measure",
+                                         description="Estimate the prompt tokens of project agents")
+        parser.add_argument("projects", nargs="*", help="Projects to measure (default: all)")
+        parser.add_argument("--budget", type=int, default=None,
+                            help="Token budget for a session in the current phase; exit 1 when a project exceeds it")
+        args = parser.parse_args(sys.argv[2:])
+        if manager.measure_agents(args.projects, budget=args.budget):
+            sys.exit(1)
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'refresh':
+        parser = argparse.ArgumentParser(prog="project_manager.py refresh",
+                                         description="Regenerate only stale project agents")
+        parser.add_argument("--jobs", type=int, default=None, help="Worker threads (default: based on CPU count)")
+        args = parser.parse_args(sys.argv[2:])
+        manager.refresh_agents(jobs=args.jobs)
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'dedup':
+        parser = argparse.ArgumentParser(prog="project_manager.py dedup",
+                                         description="Store agent guidance shared between projects once")
+        parser.add_argument("--restore", action="store_true", help="Write full agent files again")
+        args = parser.parse_args(sys.argv[2:])
+        if args.restore:
+            manager.customize_projects()
+            AgentDeduplicator(base_path=manager.base_path).collect_garbage()
+        else:
+            manager.dedup_agents()
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'context-pack':
+        parser = argparse.ArgumentParser(prog="project_manager.py context-pack",
+                                         description="Bundle an agent, its config slice and the phase's documents "
+                                                     "into one file for a session")
+        parser.add_argument("project", help="Project to pack")
+        parser.add_argument("--phase", default=None, help="Project phase (default: the project's current phase)")
+        parser.add_argument("--agent", default=None,
+                            help="Project agent (default: the agent resume suggests for the phase)")
+        args = parser.parse_args(sys.argv[2:])
+        if manager.context_pack(args.project, phase=args.phase, agent_name=args.agent) is None:
+            sys.exit(1)
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'search':
+        parser = argparse.ArgumentParser(prog="project_manager.py search",
+                                         description="Ranked search over project documentation, market research and QA")
+        parser.add_argument("query", nargs="+", help="Search terms")
+        parser.add_argument("--project", default=None, help="Only this project (folder name)")
+        parser.add_argument("--folder", default=None,
+                            help="Only this folder inside projects, e.g. documentation/design or qa")
+        parser.add_argument("--limit", type=int, default=10, help="Number of results (default: %(default)s)")
+        args = parser.parse_args(sys.argv[2:])
+        manager.search_docs(" ".join(args.query), project=args.project, folder=args.folder, limit=args.limit)
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'placeholders':
+        parser = argparse.ArgumentParser(prog="project_manager.py placeholders",
+                                         description="Report template placeholders left unfilled in project documents")
+        parser.add_argument("projects", nargs="*", help="Projects to scan (default: all)")
+        parser.add_argument("--details", action="store_true", help="List the unfilled placeholders of each document")
+        args = parser.parse_args(sys.argv[2:])
+        manager.scan_placeholders(args.projects, details=args.details)
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'orchestrate':
+        parser = argparse.ArgumentParser(prog="project_manager.py orchestrate",
+                                         description="Run a project's agent workflow as a task DAG, "
+                                                     "resuming an interrupted run")
+        parser.add_argument("projects", nargs="+", help="Projects to orchestrate (run together under shared limits)")
+        parser.add_argument("--phase", default=None,
+                            help="Phase or workflow stage to start from (default: the project's current phase)")
+        parser.add_argument("--jobs", type=int, default=None, help="Agent tasks run at once")
+        parser.add_argument("--command", default=None,
+                            help="Command run per task, with {agent}, {agent_file}, {stage}, {project} and {prompt} "
+                                 "placeholders (default: the local stub backend)")
+        parser.add_argument("--restart", action="store_true", help="Discard saved task state and start over")
+        parser.add_argument("--no-cache", action="store_true",
+                            help="Run every task on the backend instead of reusing cached responses")
+        args = parser.parse_args(sys.argv[2:])
+        reports = manager.orchestrate(args.projects, phase=args.phase, jobs=args.jobs, command=args.command,
+                                      restart=args.restart, use_cache=not args.no_cache)
+        if reports is None or any(report['failed'] for report in reports):
+            sys.exit(1)
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'handoff':
+        parser = argparse.ArgumentParser(prog="project_manager.py handoff",
+                                         description="Create, query and render structured agent handoffs")
+        actions = parser.add_subparsers(dest="action", required=True)
+        create = actions.add_parser("create", help="Record a handoff")
+        create.add_argument("project", help="Project (folder name)")
+        create.add_argument("--from", dest="from_agent", required=True, help="Sending agent")
+        create.add_argument("--to", dest="to_agent", required=True, help="Receiving agent")
+        create.add_argument("--phase", default=None, help="Phase (default: the project's current phase)")
+        create.add_argument("--deliverable", action="append", default=[],
+                            help="'Name: description @ location' (repeatable)")
+        create.add_argument("--requirement", action="append", default=[], help="Must-implement item (repeatable)")
+        create.add_argument("--notes", default="", help="Context for the receiving agent")
+        listing = actions.add_parser("list", help="Query handoffs across projects")
+        listing.add_argument("--project", action="append", default=None, help="Only this project (repeatable)")
+        listing.add_argument("--from", dest="from_agent", default=None, help="Sending agent")
+        listing.add_argument("--to", dest="to_agent", default=None, help="Receiving agent")
+        listing.add_argument("--phase", default=None, help="Phase")
+        listing.add_argument("--approval", default=None, choices=APPROVALS, help="Producer approval")
+        listing.add_argument("--status", default=None, choices=STATUSES, help="Handoff status")
+        listing.add_argument("--older-than", type=float, default=None, metavar="DAYS", help="Created over DAYS ago")
+        show = actions.add_parser("show", help="Render a handoff as markdown")
+        show.add_argument("project", help="Project (folder name)")
+        show.add_argument("id", help="Handoff id, e.g. HO-0001")
+        update = actions.add_parser("update", help="Set a handoff's approval or status")
+        update.add_argument("project", help="Project (folder name)")
+        update.add_argument("id", help="Handoff id, e.g. HO-0001")
+        update.add_argument("--approval", default=None, choices=APPROVALS, help="Producer approval")
+        update.add_argument("--status", default=None, choices=STATUSES, help="Handoff status")
+        args = parser.parse_args(sys.argv[2:])
+        if args.action == "create":
+            result = manager.create_handoff(args.project, args.from_agent, args.to_agent, phase=args.phase,
+                                            deliverables=args.deliverable, requirements=args.requirement,
+                                            notes=args.notes)
+        elif args.action == "list":
+            result = manager.list_handoffs(args.project, older_than_days=args.older_than, from_agent=args.from_agent,
+                                           to_agent=args.to_agent, phase=args.phase, approval=args.approval,
+                                           status=args.status)
+        elif args.action == "show":
+            result = manager.show_handoff(args.project, args.id)
+        else:
+            result = manager.update_handoff(args.project, args.id, approval=args.approval, status=args.status)
+        if result is None:
+            sys.exit(1)
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'transcripts':
+        parser = argparse.ArgumentParser(prog="project_manager.py transcripts",
+                                         description="List a project's agent sessions or print one transcript")
+        parser.add_argument("project", help="Project (folder name)")
+        parser.add_argument("--agent", default=None, help="Only this agent's sessions")
+        parser.add_argument("--phase", default=None, help="Only sessions in this phase")
+        parser.add_argument("--show", default=None, metavar="SESSION", help="Print a session, e.g. S000012")
+        args = parser.parse_args(sys.argv[2:])
+        if manager.show_transcripts(args.project, agent=args.agent, phase=args.phase, session_id=args.show) is None:
+            sys.exit(1)
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'usage':
+        parser = argparse.ArgumentParser(prog="project_manager.py usage",
+                                         description="Tokens, cost, cache hits and latency percentiles of agent "
+                                                     "invocations")
+        parser.add_argument("projects", nargs="*", help="Projects to report (default: all)")
+        parser.add_argument("--by", default="agent", choices=["agent", "phase", "project"],
+                            help="Grouping (default: %(default)s)")
+        parser.add_argument("--days", type=float, default=DEFAULT_WINDOW_DAYS,
+                            help="Rolling window in days (default: %(default)s)")
+        args = parser.parse_args(sys.argv[2:])
+        manager.show_usage(args.projects, group_by=args.by, days=args.days)
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'validate-gate':
+        parser = argparse.ArgumentParser(prog="project_manager.py validate-gate",
+                                         description="Check phase transition requirements (docs, placeholders, "
+                                                     "milestones, approvals) for projects")
+        parser.add_argument("projects", nargs="*", help="Projects to validate (default: all)")
+        parser.add_argument("--to", default=None, choices=list(GATES),
+                            help="Phase to enter (default: each project's next phase)")
+        parser.add_argument("--jobs", type=int, default=None, help="Checks run at once")
+        parser.add_argument("--details", action="store_true", help="Show passing checks too")
+        args = parser.parse_args(sys.argv[2:])
+        reports = manager.validate_gate(args.projects, target=args.to, jobs=args.jobs, details=args.details)
+        if reports is None or not all(report['passed'] for report in reports):
+            sys.exit(1)
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'upgrade-engine':
+        args = sys.argv[2:]
+        if len(args) == 3 and args[1] == '--to':
+            manager.upgrade_engine(args[0], args[2])
+        elif len(args) == 4 and args[0] == '--engine' and args[2] == '--to':
+            manager.upgrade_engine_fleet(args[1], args[3])
+        else:
+            print("Usage: python scripts/project_manager.py upgrade-engine <project-name> --to VERSION")
+            print("       python scripts/project_manager.py upgrade-engine --engine ENGINE --to VERSION")
+    elif len(sys.argv) == 1:
         # Interactive mode
         manager.main_menu()
     elif len(sys.argv) == 2:
@@ -383,9 +1028,11 @@ def main():
         else:
             print(f"Unknown command: {command}")
             print("Usage: python scripts/project_manager.py [status|resume|freeze|startover] [project-name]")
+    elif len(sys.argv) == 4 and sys.argv[1].lower() == 'shift-deadlines':
+        manager.shift_deadlines(sys.argv[2], sys.argv[3])
     else:
         print("Usage: python scripts/project_manager.py [command] [project-name]")
-        print("Commands: status, new, resume, freeze, startover, menu")
+        print("Commands: status, new, resume, freeze, startover, menu, shift-deadlines, upgrade-engine, customize, refresh, dedup, measure, context-pack, search, placeholders, orchestrate, handoff, transcripts, usage, validate-gate")
 
 
 if __name__ == "__main__":
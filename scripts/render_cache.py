@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Render Cache - Content-addressed cache of rendered agents
+Stores rendered agent templates on disk keyed by a fingerprint of their
+inputs, with size-bounded LRU eviction and hit-rate stats
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+
+from engine_registry import thaw
+
+
+# Relative to the working directory, like agents/ and engine_configs/ it renders from
+DEFAULT_CACHE_PATH = Path(".cache") / "rendered_agents"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Templates kept in memory on top of the disk cache
+MEMORY_ENTRIES = 256
+
+
+class RenderCache:
+    def __init__(self, cache_path: Path = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_path = Path(cache_path)
+        self.max_bytes = max_bytes
+        self._memory: "OrderedDict[str, List[str]]" = OrderedDict()
+        # Engine config views are shared by the registry, so hash each one once
+        self._config_digests: Dict[int, Tuple[Mapping[str, Any], str]] = {}
+        self._sizes: Optional[Dict[str, int]] = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def config_digest(self, engine_config: Mapping[str, Any]) -> str:
+        """Stable hash of an engine config"""
+        cached = self._config_digests.get(id(engine_config))
+        if cached is not None and cached[0] is engine_config:
+            return cached[1]
+        payload = json.dumps(thaw(engine_config), sort_keys=True)
+        digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        self._config_digests[id(engine_config)] = (engine_config, digest)
+        return digest
+
+    def fingerprint(self, renderer: str, base_digest: str, agent_name: str,
+                    engine_config: Mapping[str, Any], fields: Dict[str, Any]) -> str:
+        """Key for a render: renderer code, base agent text, engine config and project fields"""
+        payload = json.dumps([renderer, base_digest, agent_name, self.config_digest(engine_config), fields],
+                             sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def entry_file(self, key: str) -> Path:
+        return self.cache_path / f"{key}.json"
+
+    def _disk_sizes(self) -> Dict[str, int]:
+        """Sizes of the entries on disk, scanned once per process"""
+        if self._sizes is None:
+            self._sizes = {}
+            if self.cache_path.exists():
+                for entry in self.cache_path.glob("*.json"):
+                    self._sizes[entry.stem] = entry.stat().st_size
+            self._total_bytes = sum(self._sizes.values())
+        return self._sizes
+
+    def _remember(self, key: str, segments: List[str]):
+        self._memory[key] = segments
+        self._memory.move_to_end(key)
+        while len(self._memory) > MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Return the cached template segments for a key, or None"""
+        with self._lock:
+            segments = self._memory.get(key)
+            if segments is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return segments
+
+            entry = self.entry_file(key)
+            try:
+                with open(entry, 'r', encoding='utf-8') as f:
+                    segments = json.load(f)
+                # Touch the entry so eviction sees it as recently used
+                os.utime(entry)
+            except (FileNotFoundError, ValueError):
+                self.misses += 1
+                return None
+
+            self._remember(key, segments)
+            self.hits += 1
+            return segments
+
+    def put(self, key: str, segments: List[str]):
+        """Store template segments and evict least recently used entries over the size limit"""
+        data = json.dumps(segments).encode('utf-8')
+        with self._lock:
+            self._remember(key, segments)
+            self.cache_path.mkdir(parents=True, exist_ok=True)
+            entry = self.entry_file(key)
+            temp_file = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(temp_file, 'wb') as f:
+                f.write(data)
+            os.replace(temp_file, entry)
+
+            sizes = self._disk_sizes()
+            self._total_bytes += len(data) - sizes.get(key, 0)
+            sizes[key] = len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict(sizes)
+
+    def _evict(self, sizes: Dict[str, int]):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for key in sizes:
+            try:
+                entries.append((self.entry_file(key).stat().st_mtime_ns, key))
+            except FileNotFoundError:
+                entries.append((0, key))
+        for _, key in sorted(entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._total_bytes -= sizes.pop(key)
+            self._memory.pop(key, None)
+            try:
+                self.entry_file(key).unlink()
+            except FileNotFoundError:
+                pass
+            self.evictions += 1
+
+    def clear(self):
+        """Remove every cached render"""
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._disk_sizes()):
+                try:
+                    self.entry_file(key).unlink()
+                except FileNotFoundError:
+                    pass
+            self._sizes = {}
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit, miss and eviction counts with the hit rate"""
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = len(self._disk_sizes())
+            size = self._total_bytes
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size
+        }
+
+    def print_stats(self):
+        """Print render cache stats"""
+        stats = self.get_stats()
+        print(f"  - render cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate), {stats['entries']} entries, "
+              f"{stats['bytes']} bytes, {stats['evictions']} evicted")
+
+
+_caches: Dict[Path, RenderCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_render_cache(cache_path: Path = DEFAULT_CACHE_PATH) -> RenderCache:
+    """Process-wide render cache for a cache folder"""
+    key = Path(cache_path).resolve()
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = RenderCache(cache_path)
+        return _caches[key]
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Response Cache - Prompt-keyed cache of agent responses
+Returns the stored response when the same agent, config slice and
+instruction are run again, with TTL and size-based eviction and gzip
+compressed entries
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable, Optional
+
+from agent_common import resolve_agent
+from context_pack import ContextPacker
+from orchestration_engine import task_prompt
+
+
+DEFAULT_CACHE_PATH = Path(".cache") / "responses"
+INDEX_FILE = "index.json"
+CACHE_VERSION = 1
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+TRAILING_SPACE = re.compile(r'[ \t]+$', re.MULTILINE)
+BLANK_LINES = re.compile(r'\n{3,}')
+
+
+def normalize(text: str) -> str:
+    """Prompt text with whitespace that does not change its meaning made uniform"""
+    text = TRAILING_SPACE.sub("", text.replace("\r\n", "\n"))
+    return BLANK_LINES.sub("\n\n", text).strip() + "\n"
+
+
+def fingerprint(parts: Dict[str, Any]) -> str:
+    """Stable hash of a prompt's parts: text is normalized and JSON keys sorted"""
+    normalized = {key: normalize(value) if isinstance(value, str) else value for key, value in parts.items()}
+    return hashlib.sha256(json.dumps([CACHE_VERSION, normalized], sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, cache_path: Path = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES, clock: Callable[[], float] = time.time):
+        self.cache_path = Path(cache_path)
+        self.index_file = self.cache_path / INDEX_FILE
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        # fingerprint -> [created, last used, compressed bytes]
+        self.entries: Dict[str, list] = {}
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def entry_file(self, key: str) -> Path:
+        return self.cache_path / key[:2] / f"{key}.gz"
+
+    def load(self):
+        self.loaded = True
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.entries = data['entries']
+
+    def save(self):
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+        temp_file = self.index_file.with_name(f"{INDEX_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump({"version": CACHE_VERSION, "entries": self.entries}, f, separators=(',', ':'))
+        os.replace(temp_file, self.index_file)
+
+    def _drop(self, key: str):
+        self.entries.pop(key, None)
+        try:
+            self.entry_file(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for a fingerprint, or None when missing or expired"""
+        with self._lock:
+            if not self.loaded:
+                self.load()
+            entry = self.entries.get(key)
+            now = self.clock()
+            if entry and now - entry[0] > self.ttl:
+                self._drop(key)
+                self.save()
+                entry = None
+            if entry:
+                try:
+                    response = gzip.decompress(self.entry_file(key).read_bytes()).decode('utf-8')
+                except (FileNotFoundError, OSError, EOFError):
+                    self._drop(key)
+                    self.save()
+                    entry = None
+            if not entry:
+                self.misses += 1
+                return None
+            entry[1] = now
+            self.hits += 1
+            return response
+
+    def put(self, key: str, response: str):
+        """Store a response, then evict expired entries and the least recently used beyond max_bytes"""
+        data = gzip.compress(response.encode('utf-8'))
+        with self._lock:
+            if not self.loaded:
+                self.load()
+            entry_file = self.entry_file(key)
+            entry_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = entry_file.with_name(f"{entry_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_file.write_bytes(data)
+            os.replace(temp_file, entry_file)
+            now = self.clock()
+            self.entries[key] = [now, now, len(data)]
+
+            for stale in [k for k, entry in self.entries.items() if now - entry[0] > self.ttl]:
+                self._drop(stale)
+            total = sum(entry[2] for entry in self.entries.values())
+            for old in sorted(self.entries, key=lambda k: self.entries[k][1]):
+                if total <= self.max_bytes:
+                    break
+                total -= self.entries[old][2]
+                self._drop(old)
+            self.save()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries),
+                    "bytes": sum(entry[2] for entry in self.entries.values())}
+
+
+class CachedBackend:
+    """Sits in front of an orchestration backend and answers repeated prompts from the cache"""
+
+    def __init__(self, backend, cache: ResponseCache, bypass: bool = False):
+        self.backend = backend
+        self.cache = cache
+        # Bypass skips lookups but still stores fresh responses
+        self.bypass = bypass
+        self.local = threading.local()
+
+    def was_cached(self) -> bool:
+        """Whether this thread's last run was answered from the cache"""
+        return getattr(self.local, 'hit', False)
+
+    def prompt_parts(self, task: Dict[str, Any], project_path: Path, project_config: Dict[str, Any]) -> Dict[str, Any]:
+        """What a task's prompt is made of: backend, agent file, config slice and instruction"""
+        try:
+            agent_text = resolve_agent(project_path / "agents" / f"{task['agent']}.md")
+        except FileNotFoundError:
+            agent_text = ""
+        phase = project_config.get('project', {}).get('phase', 'Initialization')
+        name = project_config.get('project', {}).get('name', project_path.name)
+        inner = getattr(self.backend, 'backend', self.backend)
+        return {
+            "backend": getattr(inner, 'command', type(inner).__name__),
+            "agent": hashlib.sha256(normalize(agent_text).encode('utf-8')).hexdigest(),
+            "config": ContextPacker(project_path).config_slice(project_config, phase, task['agent']),
+            "instruction": task_prompt(task, name)
+        }
+
+    def run(self, task: Dict[str, Any], project_path: Path, project_config: Dict[str, Any]) -> str:
+        key = fingerprint(self.prompt_parts(task, project_path, project_config))
+        self.local.hit = False
+        if not self.bypass:
+            response = self.cache.get(key)
+            if response is not None:
+                self.local.hit = True
+                return response
+        response = self.backend.run(task, project_path, project_config)
+        self.cache.put(key, response)
+        return response
@@ -8,8 +8,13 @@ import json
 import tempfile
 import shutil
 from pathlib import Path
+import agent_customizer
 from agent_customizer import AgentCustomizer
 
+# Customizers created by the tests cache renders here instead of in the repository's .cache/
+RENDER_CACHE = tempfile.TemporaryDirectory(prefix="test-render-cache-")
+agent_customizer.DEFAULT_CACHE_PATH = Path(RENDER_CACHE.name)
+
 
 def test_engine_configs():
     """Test that all engine configurations are valid"""
@@ -253,6 +258,862 @@ def test_project_files():
     return True
 
 
+def test_engine_config_registry():
+    """Test that engine configs are parsed once and shared as immutable views"""
+    print("\nTesting Engine Config Registry...")
+    
+    import io
+    import os
+    from contextlib import redirect_stdout
+    from engine_registry import get_registry
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        configs_path = Path(temp_dir) / "engine_configs"
+        shutil.copytree("engine_configs", configs_path)
+        
+        customizer = AgentCustomizer()
+        customizer.engine_configs_path = configs_path
+        registry = customizer.engine_registry
+        
+        test_config = {
+            "project": {"name": "Registry Test", "engine": "Godot", "platform": "PC", "genre": "Action"},
+            "team": {"active_agents": ["game_feel_developer"]}
+        }
+        for i, version in enumerate(["4.4.1", "4.3", "3.5.3"] * 10):
+            test_config["project"]["engine_version"] = version
+            project_path = Path(temp_dir) / f"project-{i}"
+            project_path.mkdir()
+            with redirect_stdout(io.StringIO()):
+                customizer.customize_agents_for_project(project_path, test_config)
+        
+        if registry.parse_count != 1:
+            print(f"FAIL: Godot config parsed {registry.parse_count} times")
+            return False
+        print("PASS: Config parsed once for 30 projects")
+        
+        view = registry.resolve("Godot", "4.4.1")
+        if registry.resolve("Godot", "4.4.1") is not view:
+            print("FAIL: Resolved view not memoized")
+            return False
+        try:
+            view['version'] = "0.0"
+            print("FAIL: Resolved view is mutable")
+            return False
+        except TypeError:
+            pass
+        print("PASS: Resolved views are memoized and immutable")
+        
+        legacy = registry.resolve("Godot", "3.5.3")
+        if "Particles2D/CPUParticles2D" not in legacy['agent_specializations']['game_feel_developer']['tools']:
+            print("FAIL: Version override not applied for Godot 3.5.3")
+            return False
+        if legacy['agent_specializations']['game_feel_developer']['focus'] != view['agent_specializations']['game_feel_developer']['focus']:
+            print("FAIL: Version override replaced unrelated fields")
+            return False
+        print("PASS: Version overrides layered on base config")
+        
+        config_file = configs_path / "godot_config.json"
+        with open(config_file, 'r') as f:
+            raw = json.load(f)
+        raw['best_practices']['naming_conventions']['scenes'] = "snake_case"
+        with open(config_file, 'w') as f:
+            json.dump(raw, f)
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        if get_registry(configs_path).resolve("Godot", "4.4.1")['best_practices']['naming_conventions']['scenes'] != "snake_case":
+            print("FAIL: Registry not invalidated by mtime change")
+            return False
+        if registry.parse_count != 2:
+            print(f"FAIL: Expected one re-parse, got {registry.parse_count - 1}")
+            return False
+        print("PASS: Registry invalidated by mtime")
+    
+    return True
+
+
+def test_base_agent_cache():
+    """Test that base agents are read once and spliced without changing output"""
+    print("\nTesting Base Agent Cache...")
+    
+    import io
+    import os
+    from contextlib import redirect_stdout
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        agents_path = Path(temp_dir) / "agents"
+        shutil.copytree("agents", agents_path)
+        
+        customizer = AgentCustomizer()
+        customizer.base_agents_path = agents_path
+        cache = customizer.agent_cache
+        
+        active_agents = ["mechanics_developer", "qa_agent", "producer_agent"]
+        test_config = {
+            "project": {"name": "Cache Test", "engine": "Unity", "engine_version": "2022.3",
+                        "platform": "Mobile", "genre": "Puzzle"},
+            "team": {"active_agents": active_agents}
+        }
+        engine_config = customizer.load_engine_config("Unity", "2022.3")
+        for i in range(20):
+            project_path = Path(temp_dir) / f"project-{i}"
+            project_path.mkdir()
+            with redirect_stdout(io.StringIO()):
+                customizer.customize_agents_for_project(project_path, test_config)
+        
+        if cache.reads != len(active_agents):
+            print(f"FAIL: Base agents read {cache.reads} times for 20 projects")
+            return False
+        print("PASS: Base agents read once for 20 projects")
+        
+        for agent_name in active_agents:
+            base_content = (agents_path / f"{agent_name}.md").read_text(encoding='utf-8')
+            expected = customizer.apply_customizations(base_content, agent_name, engine_config, test_config)
+            generated = (Path(temp_dir) / "project-0" / "agents" / f"{agent_name}.md").read_text(encoding='utf-8')
+            if generated != expected:
+                print(f"FAIL: Cached render of {agent_name} differs from a fresh render")
+                return False
+        print("PASS: Cached renders match fresh renders")
+        
+        base_file = agents_path / "qa_agent.md"
+        base_file.write_text(base_file.read_text(encoding='utf-8') + "\n## Cache Marker\n", encoding='utf-8')
+        stat = base_file.stat()
+        os.utime(base_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        project_path = Path(temp_dir) / "project-edited"
+        project_path.mkdir()
+        with redirect_stdout(io.StringIO()):
+            customizer.customize_agents_for_project(project_path, test_config)
+        if "## Cache Marker" not in (project_path / "agents" / "qa_agent.md").read_text(encoding='utf-8'):
+            print("FAIL: Cache not invalidated by base agent change")
+            return False
+        if cache.reads != len(active_agents) + 1:
+            print(f"FAIL: Expected one re-read, got {cache.reads - len(active_agents)}")
+            return False
+        print("PASS: Cache invalidated by mtime")
+    
+    return True
+
+
+def test_render_cache():
+    """Test that identical agent inputs across projects are rendered once"""
+    print("\nTesting Render Cache...")
+    
+    import io
+    from contextlib import redirect_stdout
+    from render_cache import RenderCache
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        customizer = AgentCustomizer()
+        customizer.render_cache_path = Path(temp_dir) / "cache"
+        cache = customizer.render_cache
+        
+        active_agents = ["mechanics_developer", "technical_artist", "producer_agent"]
+        engine_config = customizer.load_engine_config("Godot", "4.4.1")
+        for i in range(10):
+            test_config = {
+                "project": {"name": f"Cached Game {i}", "engine": "Godot", "engine_version": "4.4.1",
+                            "platform": "PC", "genre": "Action"},
+                "team": {"active_agents": active_agents}
+            }
+            project_path = Path(temp_dir) / f"project-{i}"
+            project_path.mkdir()
+            with redirect_stdout(io.StringIO()):
+                customizer.customize_agents_for_project(project_path, test_config)
+            
+            for agent_name in active_agents:
+                base_content = (Path("agents") / f"{agent_name}.md").read_text(encoding='utf-8')
+                expected = customizer.apply_customizations(base_content, agent_name, engine_config, test_config)
+                if (project_path / "agents" / f"{agent_name}.md").read_text(encoding='utf-8') != expected:
+                    print(f"FAIL: Cached render of {agent_name} differs for {test_config['project']['name']}")
+                    return False
+        
+        stats = cache.get_stats()
+        if stats["misses"] != len(active_agents) or stats["hits"] != 9 * len(active_agents):
+            print(f"FAIL: Expected {len(active_agents)} misses, got {stats['misses']} misses and {stats['hits']} hits")
+            return False
+        print("PASS: Renders shared across projects with per-project names")
+        
+        # A fresh process only has the disk entries to go on
+        reloaded = RenderCache(customizer.render_cache_path)
+        key = next(customizer.render_cache_path.glob("*.json")).stem
+        if reloaded.get(key) is None:
+            print("FAIL: Render not persisted to disk")
+            return False
+        print("PASS: Renders persisted to disk")
+        
+        # Edits to any module taking part in rendering invalidate cached renders
+        from agent_customizer import RENDERER_MODULES, renderer_digest
+        scripts_copy = Path(temp_dir) / "scripts"
+        scripts_copy.mkdir()
+        for module in RENDERER_MODULES:
+            shutil.copy(Path(__file__).parent / module, scripts_copy / module)
+        before = renderer_digest(scripts_copy)
+        with open(scripts_copy / "agent_sections.py", 'a') as f:
+            f.write("\n")
+        if renderer_digest(scripts_copy) == before:
+            print("FAIL: Renderer digest misses agent_sections.py")
+            return False
+        print("PASS: Renderer digest covers every rendering module")
+        
+        from render_cache import DEFAULT_CACHE_PATH
+        from response_cache import DEFAULT_CACHE_PATH as RESPONSE_CACHE_PATH
+        if DEFAULT_CACHE_PATH.parent != RESPONSE_CACHE_PATH.parent or DEFAULT_CACHE_PATH.is_absolute():
+            print(f"FAIL: Default render cache at {DEFAULT_CACHE_PATH}")
+            return False
+        print("PASS: Default render cache sits in .cache/ of the working directory like the other caches")
+        
+        small = RenderCache(Path(temp_dir) / "small", max_bytes=100)
+        for i in range(5):
+            small.put(f"key-{i}", ["x" * 40])
+        if small.get("key-0") is not None or small.get("key-4") is None or small.evictions != 3:
+            print(f"FAIL: LRU eviction kept {small.get_stats()['entries']} entries")
+            return False
+        print("PASS: Least recently used renders evicted over the size limit")
+    
+    return True
+
+
+def test_customize_many():
+    """Test that parallel customization matches one-at-a-time customization"""
+    print("\nTesting Parallel Customization...")
+    
+    import io
+    from contextlib import redirect_stdout
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        customizer = AgentCustomizer()
+        customizer.render_cache_path = None
+        
+        engines = [("Godot", "4.4.1"), ("Unity", "2022.3"), ("Unreal Engine", "5.3"), ("Godot", "3.5.3")]
+        configs = []
+        for i in range(8):
+            engine, version = engines[i % len(engines)]
+            configs.append({
+                "project": {"name": f"Fleet Game {i}", "engine": engine, "engine_version": version,
+                            "platform": ["PC", "Mobile"][i % 2], "genre": "Action"},
+                "team": {"active_agents": ["mechanics_developer", "qa_agent", "ui_ux_agent", "producer_agent"]}
+            })
+        
+        outputs = {}
+        for jobs in (1, 4):
+            batch = []
+            for i, config in enumerate(configs):
+                project_path = Path(temp_dir) / f"jobs-{jobs}" / f"project-{i}"
+                project_path.mkdir(parents=True)
+                batch.append((project_path, config))
+            with redirect_stdout(io.StringIO()):
+                written = customizer.customize_many(batch, jobs=jobs)
+            if written != len(configs) * 5:
+                print(f"FAIL: Expected {len(configs) * 5} files with {jobs} jobs, got {written}")
+                return False
+            root = Path(temp_dir) / f"jobs-{jobs}"
+            outputs[jobs] = {str(path.relative_to(root)): path.read_text(encoding='utf-8')
+                             for path in sorted(root.rglob("*.md"))}
+        
+        if outputs[1] != outputs[4]:
+            print("FAIL: Parallel output differs from sequential output")
+            return False
+        print("PASS: Parallel customization output is deterministic")
+        
+        single = Path(temp_dir) / "single"
+        single.mkdir()
+        with redirect_stdout(io.StringIO()):
+            customizer.customize_agents_for_project(single, configs[0])
+        if (single / "agents" / "qa_agent.md").read_text(encoding='utf-8') != outputs[4]["project-0/agents/qa_agent.md"]:
+            print("FAIL: Batch output differs from single-project output")
+            return False
+        print("PASS: Batch output matches single-project output")
+    
+    return True
+
+
+def test_incremental_refresh():
+    """Test that refresh regenerates only agents whose inputs changed"""
+    print("\nTesting Incremental Refresh...")
+    
+    import io
+    import os
+    from contextlib import redirect_stdout
+    
+    def bump_mtime(path):
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        agents_path = Path(temp_dir) / "agents"
+        configs_path = Path(temp_dir) / "engine_configs"
+        shutil.copytree("agents", agents_path)
+        shutil.copytree("engine_configs", configs_path)
+        base_path = Path(temp_dir) / "projects"
+        
+        customizer = AgentCustomizer()
+        customizer.base_agents_path = agents_path
+        customizer.engine_configs_path = configs_path
+        customizer.render_cache_path = None
+        
+        batch = []
+        for i, (engine, agents) in enumerate([("Godot", ["qa_agent", "ui_ux_agent"]),
+                                              ("Unity", ["qa_agent"]),
+                                              ("Godot", ["ui_ux_agent"])]):
+            project_path = base_path / f"project-{i}"
+            project_path.mkdir(parents=True)
+            config = {
+                "project": {"name": f"Refresh Game {i}", "engine": engine, "engine_version": "latest",
+                            "platform": "PC", "genre": "Action", "phase": "Design"},
+                "team": {"active_agents": agents}
+            }
+            with open(project_path / "project-config.json", 'w') as f:
+                json.dump(config, f)
+            batch.append((project_path, config))
+        with redirect_stdout(io.StringIO()):
+            customizer.customize_many(batch)
+        
+        if customizer.refresh(base_path)['written'] != 0:
+            print("FAIL: Fresh projects reported stale")
+            return False
+        print("PASS: Fresh projects are up to date")
+
+        manifest_file = base_path / "project-0" / "agents" / ".manifest.json"
+        written_at = manifest_file.stat().st_mtime_ns
+        with redirect_stdout(io.StringIO()):
+            customizer.customize_many(batch)
+        if manifest_file.stat().st_mtime_ns != written_at:
+            print("FAIL: Unchanged manifest rewritten")
+            return False
+        print("PASS: Unchanged manifests are not rewritten")
+
+        qa_file = agents_path / "qa_agent.md"
+        qa_file.write_text(qa_file.read_text(encoding='utf-8') + "\nRefresh marker\n", encoding='utf-8')
+        bump_mtime(qa_file)
+        report = customizer.refresh(base_path)
+        if report['written'] != 2 or report['stale_projects'] != 2:
+            print(f"FAIL: Base agent edit regenerated {report['written']} files in {report['stale_projects']} projects")
+            return False
+        if "Refresh marker" not in (base_path / "project-1" / "agents" / "qa_agent.md").read_text(encoding='utf-8'):
+            print("FAIL: Stale agent not regenerated")
+            return False
+        print("PASS: Base agent edit regenerates only its dependents")
+        
+        config_file = configs_path / "godot_config.json"
+        with open(config_file, 'r') as f:
+            raw = json.load(f)
+        raw['best_practices']['naming_conventions']['scenes'] = "snake_case"
+        with open(config_file, 'w') as f:
+            json.dump(raw, f)
+        bump_mtime(config_file)
+        report = customizer.refresh(base_path)
+        # project-0: two agents + orchestrator, project-2: one agent + orchestrator
+        if report['written'] != 5 or report['stale_projects'] != 2:
+            print(f"FAIL: Engine config edit regenerated {report['written']} files in {report['stale_projects']} projects")
+            return False
+        print("PASS: Engine config edit regenerates only that engine's projects")
+        
+        project_config_file = base_path / "project-2" / "project-config.json"
+        with open(project_config_file, 'r') as f:
+            config = json.load(f)
+        config['project']['phase'] = "Development"
+        with open(project_config_file, 'w') as f:
+            json.dump(config, f)
+        bump_mtime(project_config_file)
+        report = customizer.refresh(base_path)
+        if report['written'] != 1:
+            print(f"FAIL: Phase change regenerated {report['written']} files")
+            return False
+        if customizer.refresh(base_path)['written'] != 0:
+            print("FAIL: Refresh is not idempotent")
+            return False
+        print("PASS: Project config edit regenerates only affected files")
+        
+        # A config rewritten without changes (e.g. by resume) is checked once, not on every refresh
+        with open(project_config_file, 'w') as f:
+            json.dump(config, f, indent=2)
+        bump_mtime(project_config_file)
+        first, second = customizer.refresh(base_path), customizer.refresh(base_path)
+        if first['written'] or first['configs_checked'] != 1 or second['configs_checked'] != 0:
+            print(f"FAIL: Touched config checked {first['configs_checked']} then {second['configs_checked']} times")
+            return False
+        print("PASS: A touched config with nothing to regenerate is checked once")
+    
+    return True
+
+
+def test_agent_watcher():
+    """Test that watch mode coalesces a burst of edits into one regeneration pass"""
+    print("\nTesting Agent Watcher...")
+    
+    import io
+    import os
+    from contextlib import redirect_stdout
+    from agent_watcher import AgentWatcher
+    
+    def touch(path, text):
+        path.write_text(path.read_text(encoding='utf-8') + text, encoding='utf-8')
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        agents_path = Path(temp_dir) / "agents"
+        shutil.copytree("agents", agents_path)
+        base_path = Path(temp_dir) / "projects"
+        
+        customizer = AgentCustomizer()
+        customizer.base_agents_path = agents_path
+        customizer.render_cache_path = None
+        
+        batch = []
+        for i, agents in enumerate([["qa_agent", "ui_ux_agent"], ["qa_agent"], ["technical_artist"]]):
+            project_path = base_path / f"project-{i}"
+            project_path.mkdir(parents=True)
+            config = {
+                "project": {"name": f"Watch Game {i}", "engine": "Godot", "engine_version": "latest",
+                            "platform": "PC", "genre": "Action"},
+                "team": {"active_agents": agents}
+            }
+            with open(project_path / "project-config.json", 'w') as f:
+                json.dump(config, f)
+            batch.append((project_path, config))
+        with redirect_stdout(io.StringIO()):
+            customizer.customize_many(batch)
+        
+        now = [0.0]
+        watcher = AgentWatcher(customizer, base_path, debounce=1.0, clock=lambda: now[0])
+        
+        touch(agents_path / "qa_agent.md", "\nFirst edit\n")
+        if watcher.step() is not None:
+            print("FAIL: Regenerated before the debounce window")
+            return False
+        now[0] = 0.5
+        touch(agents_path / "qa_agent.md", "\nSecond edit\n")
+        touch(agents_path / "ui_ux_agent.md", "\nThird edit\n")
+        if watcher.step() is not None:
+            print("FAIL: Burst not coalesced")
+            return False
+        now[0] = 1.6
+        report = watcher.step()
+        if report is None or report['written'] != 3 or report['changed'] != {"qa_agent.md": 2, "ui_ux_agent.md": 1}:
+            print(f"FAIL: Unexpected watch report {report}")
+            return False
+        qa_content = (base_path / "project-1" / "agents" / "qa_agent.md").read_text(encoding='utf-8')
+        if "Second edit" not in qa_content:
+            print("FAIL: Latest edit not propagated")
+            return False
+        if watcher.step() is not None:
+            print("FAIL: Settled edits regenerated twice")
+            return False
+        print("PASS: Burst of edits applied in one pass to dependent projects only")
+        
+        # A config that is briefly invalid mid-edit is reported and watching continues
+        configs_path = Path(temp_dir) / "engine_configs"
+        shutil.copytree("engine_configs", configs_path)
+        customizer.engine_configs_path = configs_path
+        ticks = [0.0]
+        
+        def tick():
+            ticks[0] += 1.0
+            return ticks[0]
+        
+        watcher = AgentWatcher(customizer, base_path, debounce=1.0, interval=0, clock=tick)
+        config_file = configs_path / "godot_config.json"
+        valid = config_file.read_text(encoding='utf-8')
+        touch(config_file, "{")
+        output = io.StringIO()
+        with redirect_stdout(output):
+            watcher.run(max_seconds=5)
+        if "Refresh failed" not in output.getvalue():
+            print("FAIL: Invalid config not reported")
+            return False
+        config_file.write_text(valid, encoding='utf-8')
+        touch(config_file, "")
+        output = io.StringIO()
+        with redirect_stdout(output):
+            watcher.run(max_seconds=5)
+        if "Regenerated" not in output.getvalue():
+            print("FAIL: Watching stopped after a failed refresh")
+            return False
+        print("PASS: Failed refresh reported without stopping the watch")
+    
+    return True
+
+
+def test_agent_dedup():
+    """Test that shared agent guidance is stored once behind thin per-project headers"""
+    print("\nTesting Agent Dedup...")
+    
+    import io
+    from contextlib import redirect_stdout
+    from agent_dedup import AgentDeduplicator
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base_path = Path(temp_dir) / "projects"
+        customizer = AgentCustomizer()
+        customizer.render_cache_path = None
+        
+        batch = []
+        for i in range(4):
+            project_path = base_path / f"project-{i}"
+            project_path.mkdir(parents=True)
+            config = {
+                "project": {"name": f"Dedup Game {i}", "engine": "Unity", "engine_version": "2022.3",
+                            "platform": "Mobile", "genre": ["Action", "Puzzle"][i % 2]},
+                "team": {"active_agents": ["qa_agent", "technical_artist"]}
+            }
+            with open(project_path / "project-config.json", 'w') as f:
+                json.dump(config, f)
+            batch.append((project_path, config))
+        with redirect_stdout(io.StringIO()):
+            customizer.customize_many(batch)
+        
+        edited = base_path / "project-3" / "agents" / "technical_artist.md"
+        edited.write_text(edited.read_text(encoding='utf-8') + "\nHand-written notes\n", encoding='utf-8')
+        
+        deduplicator = AgentDeduplicator(customizer, base_path)
+        report = deduplicator.dedup()
+        if report['thinned'] != 7 or report['skipped'] != 1 or report['blobs'] != 2:
+            print(f"FAIL: Unexpected dedup report {report}")
+            return False
+        if report['bytes_saved'] <= 0:
+            print("FAIL: Dedup did not save any bytes")
+            return False
+        print(f"PASS: 7 agents share 2 blobs ({report['bytes_saved']} bytes saved)")
+        
+        thin = (base_path / "project-1" / "agents" / "qa_agent.md").read_text(encoding='utf-8')
+        blob_name = thin.split(".agent_store/")[1].split("`")[0]
+        body = (deduplicator.store_path / blob_name).read_text(encoding='utf-8')
+        if "- **Project**: Dedup Game 1" not in thin or "Unity Testing Framework for Mobile" not in body:
+            print("FAIL: Thin header or shared body missing content")
+            return False
+        if "Hand-written notes" not in edited.read_text(encoding='utf-8'):
+            print("FAIL: Hand-edited agent was replaced")
+            return False
+        print("PASS: Thin headers point at shared bodies, edited agents kept")
+
+        # Token estimates count the shared body, not just the thin header
+        from agent_budget import AgentBudget, estimate_tokens
+        from agent_limiter import LimitedBackend
+        measured = AgentBudget(base_path).measure_project(base_path / "project-1")['agents']['qa_agent']
+        estimated = LimitedBackend(None, None, "stub").estimate({"agent": "qa_agent"}, base_path / "project-1")
+        if measured != estimated or measured <= estimate_tokens(body):
+            print(f"FAIL: Thin agent measured at ~{measured} tokens (limiter ~{estimated})")
+            return False
+        print(f"PASS: Thin agents measured with their shared body (~{measured} tokens)")
+        
+        if deduplicator.dedup()['already_thin'] != 7:
+            print("FAIL: Dedup is not idempotent")
+            return False
+
+        # Guidance no other project shares stays in the agent file
+        lone_path = base_path / "project-4"
+        lone_path.mkdir()
+        lone_config = {
+            "project": {"name": "Lone Game", "engine": "Unity", "engine_version": "2022.3",
+                        "platform": "Console", "genre": "Action"},
+            "team": {"active_agents": ["qa_agent"]}
+        }
+        with open(lone_path / "project-config.json", 'w') as f:
+            json.dump(lone_config, f)
+        with redirect_stdout(io.StringIO()):
+            customizer.customize_many([(lone_path, lone_config)])
+        report = deduplicator.dedup()
+        lone = (lone_path / "agents" / "qa_agent.md").read_text(encoding='utf-8')
+        if report['unshared'] != 1 or report['thinned'] != 0 or "Shared instructions" in lone:
+            print(f"FAIL: Unshared agent thinned {report}")
+            return False
+        if report['allocated_saved'] != 0:
+            print(f"FAIL: Dedup of an unshared agent changed disk usage by {report['allocated_saved']}")
+            return False
+        print("PASS: Agents whose guidance is not shared are left whole")
+
+        with redirect_stdout(io.StringIO()):
+            customizer.customize_many(batch)
+        restored = (base_path / "project-1" / "agents" / "qa_agent.md").read_text(encoding='utf-8')
+        if deduplicator.collect_garbage() != 2 or "Shared instructions" in restored:
+            print("FAIL: Restore did not write full agents and drop unused blobs")
+            return False
+        print("PASS: Re-customizing restores full agents and unused blobs are collected")
+        
+        # Upgrading the engine of a deduplicated project leaves no guidance of the old version
+        from agent_common import resolve_agent
+        from engine_upgrader import EngineUpgrader
+        deduplicator.dedup()
+        with redirect_stdout(io.StringIO()):
+            EngineUpgrader().upgrade_project(base_path / "project-1", "2023.2")
+        upgraded = resolve_agent(base_path / "project-1" / "agents" / "qa_agent.md")
+        if "Unity v2023.2" not in upgraded or "2022.3" in upgraded:
+            print("FAIL: Upgraded thin agent still carries guidance of the old version")
+            return False
+        report = deduplicator.dedup()
+        if report['skipped']:
+            print(f"FAIL: Upgraded agents no longer match their manifest {report}")
+            return False
+        print("PASS: Engine upgrade writes thin agents out in full for the new version")
+    
+    return True
+
+
+def test_shared_sections():
+    """Test that sections repeated across a project's agents move into agents/_common.md"""
+    print("\nTesting Shared Sections...")
+    
+    import io
+    import os
+    from contextlib import redirect_stdout
+    from agent_common import COMMON_FILE, SharedSections
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        agents_path = Path(temp_dir) / "agents"
+        shutil.copytree("agents", agents_path)
+        project_path = Path(temp_dir) / "projects" / "shared-game"
+        project_path.mkdir(parents=True)
+        
+        customizer = AgentCustomizer()
+        customizer.base_agents_path = agents_path
+        customizer.render_cache_path = None
+        config = {
+            "project": {"name": "Shared Game", "engine": "Unity", "engine_version": "2022.3",
+                        "platform": "PC", "genre": "Action", "mode": "development"},
+            "team": {"active_agents": ["mid_game_designer", "sr_game_designer", "qa_agent", "sr_game_artist"]}
+        }
+        with open(project_path / "project-config.json", 'w') as f:
+            json.dump(config, f)
+        with redirect_stdout(io.StringIO()):
+            customizer.customize_many([(project_path, config)])
+        project_agents = project_path / "agents"
+        full = {path.name: path.read_text(encoding='utf-8') for path in project_agents.glob("*.md")}
+        
+        config["project"]["shared_sections"] = True
+        with redirect_stdout(io.StringIO()):
+            customizer.customize_many([(project_path, config)])
+        report = customizer.shared_reports["shared-game"]
+        shared = SharedSections(project_agents)
+        common = shared.load()
+        designer = (project_agents / "mid_game_designer.md").read_text(encoding='utf-8')
+        if not common or report['bytes_saved'] <= 0 or f"See `{COMMON_FILE}` [shared:" not in designer:
+            print(f"FAIL: No shared sections extracted {report}")
+            return False
+        if any(shared.inline((project_agents / name).read_text(encoding='utf-8'), common) != content
+               for name, content in full.items()):
+            print("FAIL: Agents with shared sections do not expand to the full agents")
+            return False
+        print(f"PASS: {report['shared']} shared sections save {report['bytes_saved']} bytes")
+        
+        # A refresh renders only the edited agent but keeps the project consistent
+        qa_file = agents_path / "qa_agent.md"
+        qa_file.write_text(qa_file.read_text(encoding='utf-8') + "\nShared marker\n", encoding='utf-8')
+        stat = qa_file.stat()
+        os.utime(qa_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        customizer.refresh(project_path.parent)
+        common = shared.load()
+        qa = shared.inline((project_agents / "qa_agent.md").read_text(encoding='utf-8'), common)
+        designer = shared.inline((project_agents / "mid_game_designer.md").read_text(encoding='utf-8'), common)
+        if "Shared marker" not in qa or designer != full["mid_game_designer.md"]:
+            print("FAIL: Refresh left agents pointing at missing or changed shared sections")
+            return False
+        print("PASS: Partial refresh keeps references and _common.md in step")
+        
+        config["project"]["shared_sections"] = False
+        with redirect_stdout(io.StringIO()):
+            customizer.customize_many([(project_path, config)])
+        if shared.common_file.exists() or "[shared:" in (project_agents / "mid_game_designer.md").read_text(encoding='utf-8'):
+            print("FAIL: Turning shared sections off did not restore full agents")
+            return False
+        print("PASS: Turning shared sections off restores full agents")
+    
+    return True
+
+
+def test_agent_budget():
+    """Test compact agent profiles and prompt token measurement"""
+    print("\nTesting Agent Budget...")
+    
+    import io
+    from contextlib import redirect_stdout
+    from agent_budget import AgentBudget, estimate_tokens
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base_path = Path(temp_dir) / "projects"
+        customizer = AgentCustomizer()
+        customizer.render_cache_path = None
+        
+        batch = []
+        for profile in ["full", "compact"]:
+            project_path = base_path / f"{profile}-game"
+            project_path.mkdir(parents=True)
+            config = {
+                "project": {"name": f"{profile} game", "engine": "Unity", "engine_version": "2022.3",
+                            "platform": "PC", "genre": "Action", "mode": "development",
+                            "phase": "Market Analysis", "agent_profile": profile},
+                "team": {"active_agents": ["mechanics_developer", "market_analyst", "qa_agent"]}
+            }
+            with open(project_path / "project-config.json", 'w') as f:
+                json.dump(config, f)
+            batch.append((project_path, config))
+        with redirect_stdout(io.StringIO()):
+            customizer.customize_many(batch)
+        
+        full = (base_path / "full-game" / "agents" / "mechanics_developer.md").read_text(encoding='utf-8')
+        compact = (base_path / "compact-game" / "agents" / "mechanics_developer.md").read_text(encoding='utf-8')
+        if "### Godot 4.4.1 Expertise Areas" not in full or "### Godot 4.4.1 Expertise Areas" in compact:
+            print("FAIL: Compact profile kept another engine's section")
+            return False
+        if "```gdscript" in compact or "### Unity Best Practices" not in compact:
+            print("FAIL: Compact profile kept another engine's code or lost the project's engine guidance")
+            return False
+        if len(compact) >= len(full):
+            print("FAIL: Compact agent is not smaller")
+            return False
+        
+        with redirect_stdout(io.StringIO()):
+            customizer.customize_many(batch[1:])
+        again = (base_path / "compact-game" / "agents" / "mechanics_developer.md").read_text(encoding='utf-8')
+        if again != compact:
+            print("FAIL: Compact rendering is not deterministic")
+            return False
+        print(f"PASS: Compact mechanics_developer is {len(full) - len(compact)} bytes smaller")
+        
+        budgeter = AgentBudget(base_path)
+        reports = {report['project']: report for report in budgeter.measure()}
+        report = reports["compact-game"]
+        agents = report['agents']
+        if report['profile'] != "compact" or agents['qa_agent'] != estimate_tokens(
+                (base_path / "compact-game" / "agents" / "qa_agent.md").read_text(encoding='utf-8')):
+            print(f"FAIL: Unexpected measurement {report}")
+            return False
+        if report['session'] != agents['market_analyst'] + agents['project_orchestrator']:
+            print("FAIL: Market Analysis session should load the market analyst and orchestrator")
+            return False
+        if reports["full-game"]['total'] <= report['total']:
+            print("FAIL: Compact project does not measure smaller")
+            return False
+        
+        sessions = sorted(r['session'] for r in reports.values())
+        if (len(budgeter.over_budget(list(reports.values()), sessions[0] - 1)) != 2 or
+                budgeter.over_budget(list(reports.values()), sessions[-1])):
+            print("FAIL: Budget check flagged the wrong projects")
+            return False
+        print(f"PASS: Measured ~{report['total']} tokens, ~{report['session']} per Market Analysis session")
+    
+    return True
+
+
+def test_agent_sections():
+    """Test the agent section model used for customization"""
+    print("\nTesting Agent Sections...")
+    
+    from agent_sections import AgentDocument
+    
+    base_content = (Path("agents") / "mechanics_developer.md").read_text(encoding='utf-8')
+    document = AgentDocument.parse(base_content)
+    if document.serialize() != base_content:
+        print("FAIL: Parse/serialize round trip changed the agent")
+        return False
+    
+    text = "# Agent\n\nIntro\n\n## Role\n```gdscript\n# not a header\n```\n### Core Responsibilities\n- Build\n## Tools\n- Editor\n"
+    document = AgentDocument.parse(text)
+    if [section.title for section in document.sections] != ["Agent", "Role", "Core Responsibilities", "Tools"]:
+        print("FAIL: Headers inside code fences treated as sections")
+        return False
+    print("PASS: Sections parsed with code fences respected")
+    
+    document.insert_before("Core Responsibilities", "### Engine Notes\n- Godot\n")
+    document.replace_section("Role", "## Role\nRewritten\n")
+    expected = "# Agent\n\nIntro\n\n## Role\nRewritten\n## Tools\n- Editor\n"
+    if document.serialize() != expected:
+        print("FAIL: Replacing a section did not replace its subsections")
+        return False
+    print("PASS: Insert and replace operate on whole sections")
+    
+    customizer = AgentCustomizer()
+    config = {"project": {"name": "Section Test", "engine": "Unity", "engine_version": "2022.3",
+                          "platform": "PC", "genre": "Action"}}
+    customized = customizer.apply_customizations(base_content, "mechanics_developer",
+                                                  customizer.load_engine_config("Unity", "2022.3"), config)
+    if "\n# Mechanics Developer - Section Test\n" not in customized or "\n### Core Responsibilities\n" not in customized:
+        print("FAIL: Customization changed the level of existing headers")
+        return False
+    if customized.index("## Unity-Specific Implementation") > customized.index("### Core Responsibilities"):
+        print("FAIL: Agent-specific section not inserted before core responsibilities")
+        return False
+    print("PASS: Customizations inserted before core responsibilities")
+    
+    return True
+
+
+def test_engine_upgrade():
+    """Test that engine upgrades patch version-dependent files in place"""
+    print("\nTesting Engine Upgrade...")
+    
+    from init_project import ProjectInitializer
+    from engine_upgrader import EngineUpgrader
+    from agent_manifest import AgentManifest
+    
+    initializer = ProjectInitializer()
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project_path = Path(temp_dir) / "upgrade-test"
+        project_path.mkdir()
+        config = {
+            "project": {"name": "Upgrade Test", "engine": "Godot", "engine_version": "3.5.3",
+                        "platform": "PC", "genre": "Action", "phase": "Development"},
+            "team": {"active_agents": ["mechanics_developer", "qa_agent"]}
+        }
+        with open(project_path / "project-config.json", 'w') as f:
+            json.dump(config, f)
+        initializer.create_engine_files(project_path, "Godot", "Upgrade Test", "3.5.3")
+        AgentCustomizer().customize_agents_for_project(project_path, config)
+        
+        untouched = project_path / "agents" / "notes.md"
+        untouched.write_text("# Notes\n", encoding='utf-8')
+        
+        report = EngineUpgrader().upgrade_project(project_path, "4.4.1")
+        
+        project_godot = initializer.get_source_path(project_path, "Upgrade Test") / "project.godot"
+        if 'PackedStringArray("4.4.1", "Forward Plus")' not in project_godot.read_text():
+            print("FAIL: project.godot features not upgraded")
+            return False
+        
+        agent_content = (project_path / "agents" / "qa_agent.md").read_text(encoding='utf-8')
+        if "Godot v4.4.1" not in agent_content or "3.5.3" in agent_content:
+            print("FAIL: Agent version lines not patched")
+            return False
+        
+        if "agents/notes.md" in report['files']:
+            print("FAIL: Agent without version lines was rewritten")
+            return False
+        
+        customizer = AgentCustomizer()
+        upgraded_config = dict(config, project=dict(config['project'], engine_version="4.4.1"))
+        engine_config = customizer.load_engine_config("Godot", "4.4.1")
+        for agent_name in config['team']['active_agents']:
+            base_content = (Path("agents") / f"{agent_name}.md").read_text(encoding='utf-8')
+            fresh = customizer.apply_customizations(base_content, agent_name, engine_config, upgraded_config)
+            if (project_path / "agents" / f"{agent_name}.md").read_text(encoding='utf-8') != fresh:
+                print(f"FAIL: Upgraded {agent_name} differs from a fresh customization")
+                return False
+        
+        with open(project_path / "project-config.json", 'r') as f:
+            if json.load(f)['project']['engine_version'] != "4.4.1":
+                print("FAIL: project-config.json not updated")
+                return False
+        
+        if EngineUpgrader().upgrade_project(project_path, "4.4.1")['files']:
+            print("FAIL: Repeated upgrade should be a no-op")
+            return False
+        
+        # The manifests record the upgrade, so a refresh has nothing left to re-render
+        manifest = AgentManifest.load(project_path / "agents")
+        if any(inputs['engine_version'] != "4.4.1" for inputs in manifest.files.values()):
+            print("FAIL: Agent manifest not updated by the upgrade")
+            return False
+        refresh = AgentCustomizer().refresh(Path(temp_dir))
+        if refresh['written']:
+            print(f"FAIL: Refresh re-rendered {refresh['written']} upgraded agents")
+            return False
+    
+    print("PASS: Engine upgrade patches only version-dependent files")
+    return True
+
+
 def run_all_tests():
     """Run all engine system tests"""
     print("TESTING ENGINE-SPECIFIC SYSTEM")
@@ -263,6 +1124,17 @@ def run_all_tests():
         ("Agent Customization", test_agent_customization),
         ("Folder Structures", test_folder_structures),
         ("Project Files", test_project_files),
+        ("Engine Config Registry", test_engine_config_registry),
+        ("Agent Sections", test_agent_sections),
+        ("Base Agent Cache", test_base_agent_cache),
+        ("Render Cache", test_render_cache),
+        ("Parallel Customization", test_customize_many),
+        ("Incremental Refresh", test_incremental_refresh),
+        ("Agent Watcher", test_agent_watcher),
+        ("Agent Dedup", test_agent_dedup),
+        ("Agent Budget", test_agent_budget),
+        ("Shared Sections", test_shared_sections),
+        ("Engine Upgrade", test_engine_upgrade),
     ]
     
     passed = 0
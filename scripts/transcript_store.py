@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Transcript Store - Compressed, indexed log of agent sessions
+Appends every agent session of a project to a log that is compressed in
+chunks, with an index by agent, phase and time so any session can be read
+back without decompressing the rest
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+TRANSCRIPT_DIR = "transcripts"
+CHUNKS_FILE = "chunks.bin"
+TAIL_FILE = "tail.log"
+INDEX_FILE = "index.jsonl"
+
+# Sessions collect uncompressed in the tail until it holds this much, then are compressed as one chunk
+CHUNK_BYTES = 256 * 1024
+COMPRESSION_LEVEL = 6
+# Bytes read per step when scanning the index backwards for recent sessions
+READ_BACK_BYTES = 16 * 1024
+
+
+class TranscriptStore:
+    """Append-only per-project store: an uncompressed tail, compressed chunks and a JSON-lines index
+
+    Each index line locates a session either in the tail ("tail": [offset, size]) or in a chunk
+    ("chunk": [offset, length], "at": [offset, size] inside the decompressed chunk); when a session
+    is compressed a new line supersedes the old one.
+    """
+
+    def __init__(self, project_path: Path, chunk_bytes: int = CHUNK_BYTES):
+        self.path = Path(project_path) / TRANSCRIPT_DIR
+        self.chunk_bytes = chunk_bytes
+        # session id -> latest index entry
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Read the index and drop any chunk bytes a crash left behind without index lines"""
+        self.loaded = True
+        self.sessions = {}
+        chunks_end = 0
+        index_file = self.path / INDEX_FILE
+        try:
+            data = index_file.read_bytes()
+        except FileNotFoundError:
+            return
+        # A line cut short by a crash is cut off, so the next append starts on a line of its own
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            with open(index_file, 'r+b') as f:
+                f.truncate(complete)
+        for line in data[:complete].decode('utf-8').splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            self.sessions[entry['id']] = entry
+            if 'chunk' in entry:
+                chunks_end = max(chunks_end, entry['chunk'][0] + entry['chunk'][1])
+        chunks_file = self.path / CHUNKS_FILE
+        if chunks_file.exists() and chunks_file.stat().st_size > chunks_end:
+            with open(chunks_file, 'r+b') as f:
+                f.truncate(chunks_end)
+
+    def _write_index(self, entries: List[Dict[str, Any]]):
+        with open(self.path / INDEX_FILE, 'a', encoding='utf-8') as f:
+            f.write("".join(json.dumps(entry, separators=(',', ':')) + "\n" for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+        for entry in entries:
+            self.sessions[entry['id']] = entry
+
+    def append(self, agent: str, phase: str, text: str, started: Optional[datetime] = None,
+               ended: Optional[datetime] = None, **metadata) -> Dict[str, Any]:
+        """Add a session and return its index entry"""
+        data = text.encode('utf-8')
+        ended = ended or datetime.now()
+        with self._lock:
+            if not self.loaded:
+                self.load()
+            self.path.mkdir(parents=True, exist_ok=True)
+            with open(self.path / TAIL_FILE, 'ab') as f:
+                offset = f.tell()
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            entry = {
+                "id": f"S{len(self.sessions) + 1:06d}",
+                "agent": agent,
+                "phase": phase,
+                "started": (started or ended).isoformat(timespec='seconds'),
+                "ended": ended.isoformat(timespec='seconds'),
+                "bytes": len(data),
+                "tail": [offset, len(data)]
+            }
+            if metadata:
+                entry["meta"] = metadata
+            self._write_index([entry])
+            if offset + len(data) >= self.chunk_bytes:
+                self._seal()
+            return entry
+
+    def _seal(self):
+        """Compress the tail's sessions into one chunk, index their new location, then empty the tail"""
+        tail_file = self.path / TAIL_FILE
+        tail = tail_file.read_bytes()
+        # Sessions already sealed by a run that died before emptying the tail are skipped
+        pending = sorted((entry for entry in self.sessions.values() if 'tail' in entry),
+                         key=lambda entry: entry['tail'][0])
+        payload = b"".join(tail[entry['tail'][0]:entry['tail'][0] + entry['tail'][1]] for entry in pending)
+        chunk = zlib.compress(payload, COMPRESSION_LEVEL)
+        with open(self.path / CHUNKS_FILE, 'ab') as f:
+            chunk_offset = f.tell()
+            f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        moved = []
+        position = 0
+        for entry in pending:
+            size = entry['tail'][1]
+            located = {key: value for key, value in entry.items() if key != 'tail'}
+            located.update(chunk=[chunk_offset, len(chunk)], at=[position, size])
+            moved.append(located)
+            position += size
+        self._write_index(moved)
+        with open(tail_file, 'wb'):
+            pass
+
+    def read(self, session_id: str) -> str:
+        """A session's text, decompressing only the chunk that holds it"""
+        with self._lock:
+            if not self.loaded:
+                self.load()
+            entry = self.sessions.get(session_id)
+            if entry is None:
+                raise KeyError(f"Unknown session: {session_id}")
+            if 'tail' in entry:
+                with open(self.path / TAIL_FILE, 'rb') as f:
+                    f.seek(entry['tail'][0])
+                    return f.read(entry['tail'][1]).decode('utf-8')
+            with open(self.path / CHUNKS_FILE, 'rb') as f:
+                f.seek(entry['chunk'][0])
+                payload = zlib.decompress(f.read(entry['chunk'][1]))
+            start, size = entry['at']
+            return payload[start:start + size].decode('utf-8')
+
+    def query(self, agent: Optional[str] = None, phase: Optional[str] = None, since: Optional[str] = None,
+              until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Index entries of matching sessions in time order (since/until are ISO timestamps)"""
+        with self._lock:
+            if not self.loaded:
+                self.load()
+            return sorted((entry for entry in self.sessions.values()
+                           if (agent is None or entry['agent'] == agent)
+                           and (phase is None or entry['phase'] == phase)
+                           and (since is None or entry['ended'] >= since)
+                           and (until is None or entry['ended'] < until)),
+                          key=lambda entry: (entry['ended'], entry['id']))
+
+    def recent(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Latest sessions, newest first, read from the end of the index without loading it"""
+        try:
+            f = open(self.path / INDEX_FILE, 'rb')
+        except FileNotFoundError:
+            return []
+        seen: Dict[str, Dict[str, Any]] = {}
+        with f:
+            end = f.seek(0, os.SEEK_END)
+            buffer = b""
+            while end > 0 and len(seen) < limit:
+                start = max(0, end - READ_BACK_BYTES)
+                f.seek(start)
+                buffer = f.read(end - start) + buffer
+                end = start
+                lines = buffer.split(b"\n")
+                # Until the start of the file is reached the first piece may be a partial line
+                buffer = lines.pop(0) if start else b""
+                for line in reversed(lines):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    # Sealing rewrites entries; the newest line for an id is the one to keep
+                    seen.setdefault(entry['id'], entry)
+                if not start:
+                    break
+        return sorted(seen.values(), key=lambda entry: entry['id'], reverse=True)[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        """Session count and raw versus stored bytes"""
+        with self._lock:
+            if not self.loaded:
+                self.load()
+            stored = sum(os.path.getsize(self.path / name) for name in (CHUNKS_FILE, TAIL_FILE)
+                         if (self.path / name).exists())
+            return {"sessions": len(self.sessions),
+                    "bytes": sum(entry['bytes'] for entry in self.sessions.values()),
+                    "stored_bytes": stored}
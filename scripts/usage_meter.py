@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Usage Meter - Token, latency and cost accounting for agent invocations
+Records every invocation as a fixed-size binary record tagged by project,
+agent and phase, and reports rolling totals and latency percentiles from
+column arrays
+
+Author: Tuna Pamir (https://github.com/pamirtuna)
+Project: Game Studio Sub-Agents
+License: MIT
+"""
+
+import json
+import math
+import os
+import struct
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows locks with msvcrt instead
+    fcntl = None
+    import msvcrt
+
+from agent_budget import estimate_tokens
+from agent_common import resolve_agent
+from orchestration_engine import task_prompt
+
+
+USAGE_DIR = "usage"
+RECORDS_FILE = "records.bin"
+NAMES_FILE = "names.json"
+LOCK_FILE = "names.lock"
+
+# time, agent id, phase id, tokens in, tokens out, latency in ms, cache hit
+RECORD = struct.Struct("<dHBIIIB")
+DEFAULT_WINDOW_DAYS = 30
+PERCENTILES = (50, 90, 99)
+
+# USD per million tokens; set these to your plan's prices
+COST_PER_MILLION = {"input": 3.0, "output": 15.0}
+
+
+def percentile(values: List[float], rank: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(rank / 100.0 * len(values)) - 1)]
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on path (created if missing) across processes"""
+    with open(path, 'a+b') as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def cost(tokens_in: int, tokens_out: int) -> float:
+    return (tokens_in * COST_PER_MILLION["input"] + tokens_out * COST_PER_MILLION["output"]) / 1e6
+
+
+class UsageColumns:
+    """Records of one project as parallel arrays, one per field"""
+
+    def __init__(self):
+        self.time = array('d')
+        self.agent = array('H')
+        self.phase = array('B')
+        self.tokens_in = array('L')
+        self.tokens_out = array('L')
+        self.latency = array('L')
+        self.cached = array('B')
+
+    def add(self, record: Tuple):
+        for column, value in zip((self.time, self.agent, self.phase, self.tokens_in, self.tokens_out,
+                                  self.latency, self.cached), record):
+            column.append(value)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+
+class UsageMeter:
+    """Per-project usage log: append-only records plus the agent and phase name tables they refer to"""
+
+    def __init__(self, project_path: Path, clock: Callable[[], float] = time.time):
+        self.project_path = Path(project_path)
+        self.path = self.project_path / USAGE_DIR
+        self.clock = clock
+        self.names: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def load_names(self) -> Dict[str, List[str]]:
+        try:
+            with open(self.path / NAMES_FILE, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {"agents": [], "phases": []}
+
+    def _name_id(self, kind: str, name: str) -> int:
+        """Id of an agent or phase name, adding it to the table on first use"""
+        if name in self.names[kind]:
+            # Ids are never reassigned, so one known to this process stays valid
+            return self.names[kind].index(name)
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Another process may have added names since they were loaded; take its table before adding
+        with file_lock(self.path / LOCK_FILE):
+            self.names = self.load_names()
+            table = self.names[kind]
+            if name not in table:
+                table.append(name)
+                temp_file = self.path / f"{NAMES_FILE}.{os.getpid()}.tmp"
+                with open(temp_file, 'w') as f:
+                    json.dump(self.names, f)
+                os.replace(temp_file, self.path / NAMES_FILE)
+            return table.index(name)
+
+    def record(self, agent: str, phase: str, tokens_in: int, tokens_out: int, latency: float,
+               cached: bool = False, when: Optional[float] = None):
+        """Append one invocation (latency in seconds)"""
+        with self._lock:
+            if not self.names:
+                self.names = self.load_names()
+            data = RECORD.pack(when if when is not None else self.clock(), self._name_id("agents", agent),
+                               self._name_id("phases", phase), tokens_in, tokens_out,
+                               int(round(latency * 1000)), int(cached))
+            self.path.mkdir(parents=True, exist_ok=True)
+            with open(self.path / RECORDS_FILE, 'ab') as f:
+                f.write(data)
+
+    def columns(self, since: Optional[float] = None) -> Tuple[UsageColumns, Dict[str, List[str]]]:
+        """Records at or after since as column arrays, with the name tables"""
+        columns = UsageColumns()
+        try:
+            data = (self.path / RECORDS_FILE).read_bytes()
+        except FileNotFoundError:
+            return columns, {"agents": [], "phases": []}
+        # A record cut short by a crash is ignored
+        data = data[:len(data) - len(data) % RECORD.size]
+        for record in RECORD.iter_unpack(data):
+            if since is None or record[0] >= since:
+                columns.add(record)
+        return columns, self.load_names()
+
+
+class UsageTotals:
+    """Running totals of a group of invocations; latencies kept as a compact array for percentiles"""
+
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        # Cache hits never reach the model, so only the other calls are billed
+        self.billed_in = 0
+        self.billed_out = 0
+        self.latency = array('L')
+
+    def add(self, tokens_in: int, tokens_out: int, latency_ms: int, cached: int):
+        self.calls += 1
+        self.tokens_in += tokens_in
+        self.tokens_out += tokens_out
+        if cached:
+            self.cache_hits += 1
+        else:
+            self.billed_in += tokens_in
+            self.billed_out += tokens_out
+        self.latency.append(latency_ms)
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals, cache hit rate, cost and latency percentiles (in seconds)"""
+        latencies = sorted(self.latency)
+        summary = {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "cache_hit_rate": 100.0 * self.cache_hits / self.calls if self.calls else 0.0,
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "cost": cost(self.billed_in, self.billed_out),
+            "latency_total": sum(latencies) / 1000.0
+        }
+        for rank in PERCENTILES:
+            summary[f"p{rank}"] = percentile(latencies, rank) / 1000.0
+        return summary
+
+
+def usage_report(base_path: Path, project_names: Optional[List[str]] = None, group_by: str = "agent",
+                 days: float = DEFAULT_WINDOW_DAYS, now: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Usage of the last days across projects grouped by agent, phase or project, costliest first"""
+    base_path = Path(base_path)
+    since = (now if now is not None else time.time()) - days * 86400
+    groups: Dict[str, UsageTotals] = {}
+    if not project_names:
+        project_names = sorted(entry.name for entry in os.scandir(base_path)
+                               if entry.is_dir()) if base_path.exists() else []
+    for project in project_names:
+        columns, names = UsageMeter(base_path / project).columns(since)
+        if group_by == "project":
+            keys = [project] * len(columns)
+        elif group_by == "phase":
+            keys = [names["phases"][phase] for phase in columns.phase]
+        else:
+            keys = [names["agents"][agent] for agent in columns.agent]
+        for key, tokens_in, tokens_out, latency, cached in zip(keys, columns.tokens_in, columns.tokens_out,
+                                                               columns.latency, columns.cached):
+            if key not in groups:
+                groups[key] = UsageTotals()
+            groups[key].add(tokens_in, tokens_out, latency, cached)
+    reports = [dict(totals.summary(), group=key) for key, totals in groups.items()]
+    return sorted(reports, key=lambda report: (-report["cost"], -report["latency_total"], report["group"]))
+
+
+class MeteredBackend:
+    """Wraps an orchestration backend and records tokens, latency and cache hits of every task"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.meters: Dict[Path, UsageMeter] = {}
+        self._lock = threading.Lock()
+
+    def meter(self, project_path: Path) -> UsageMeter:
+        with self._lock:
+            if project_path not in self.meters:
+                self.meters[project_path] = UsageMeter(project_path)
+            return self.meters[project_path]
+
+    def prompt_tokens(self, task: Dict[str, Any], project_path: Path, project_config: Dict[str, Any]) -> int:
+        """Tokens sent: the resolved agent plus the task instruction"""
+        name = project_config.get('project', {}).get('name', project_path.name)
+        try:
+            agent_text = resolve_agent(project_path / "agents" / f"{task['agent']}.md")
+        except FileNotFoundError:
+            agent_text = ""
+        return estimate_tokens(agent_text) + estimate_tokens(task_prompt(task, name))
+
+    def run(self, task: Dict[str, Any], project_path: Path, project_config: Dict[str, Any]) -> str:
+        started = time.perf_counter()
+        output = self.backend.run(task, project_path, project_config)
+        latency = time.perf_counter() - started
+        cached = getattr(self.backend, 'was_cached', lambda: False)()
+        self.meter(project_path).record(task['agent'], project_config.get('project', {}).get('phase', 'unknown'),
+                                        self.prompt_tokens(task, project_path, project_config),
+                                        estimate_tokens(output), latency, cached=cached)
+        return output